@@ -0,0 +1,121 @@
+import csv
+import itertools
+import json
+import os
+import sys
+import time
+
+
+def _format(path):
+    # 'jsonl' for .jsonl/.json files, otherwise 'csv'.
+    return "jsonl" if os.path.splitext(path)[1].lower() in (".jsonl", ".json") else "csv"
+
+
+def _split_skills(skills):
+    if isinstance(skills, str):
+        return [skill.strip() for skill in skills.split(",") if skill.strip()]
+    return list(skills)
+
+
+def read_profiles(path):
+    """
+        Streams (user_id, skills) pairs from a CSV or JSONL file, one record at a time.
+
+        CSV files need a 'skills' column of comma-separated skills and may have a 'user_id'
+        column. JSONL lines are objects with 'skills' (a list or a comma-separated string) and
+        an optional 'user_id'. Records without a user_id are numbered from 1.
+    """
+    with open(path, newline="") as f:
+        if _format(path) == "jsonl":
+            records = (json.loads(line) for line in f if line.strip())
+        else:
+            records = csv.DictReader(f)
+        for number, record in enumerate(records, start=1):
+            yield record.get("user_id") or str(number), _split_skills(record.get("skills") or [])
+
+
+class RecommendationWriter:
+    """
+        Writes recommendations incrementally as CSV (one row per recommended career) or JSONL
+        (one object per user), flushing after every chunk.
+    """
+
+    def __init__(self, path):
+        self.format = _format(path)
+        self.file = open(path, "w", newline="")
+        if self.format == "csv":
+            self.writer = csv.writer(self.file)
+            self.writer.writerow(["user_id", "rank", "occupation", "code", "score"])
+
+    def write(self, user_id, valid_skills, ignored, top_careers):
+        if self.format == "csv":
+            for rank, (career, score, code) in enumerate(top_careers, start=1):
+                self.writer.writerow([user_id, rank, career, code, f"{score:.4f}"])
+        else:
+            self.file.write(json.dumps({
+                "user_id": user_id, "skills": valid_skills, "ignored": ignored,
+                "recommendations": [{"occupation": career, "code": code, "score": score}
+                                    for career, score, code in top_careers],
+            }) + "\n")
+
+    def flush(self):
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+
+def run_batch(index, soft_skills_list, input_path, output_path, num_recommendations=10, chunk_size=1024,
+              progress=sys.stderr, weights=None, job_zones=None, code_prefixes=None):
+    """
+        Scores every profile in input_path and writes the top careers for each to output_path.
+
+        Profiles are read, validated and scored chunk_size at a time (one matrix product per chunk
+        with ScoreIndex.top_k_batch), and each chunk is written before the next one is read, so
+        memory does not grow with the size of the input. Skills not in soft_skills_list are dropped,
+        the same as in main(). Results use the (occupation, score, code) tuples of recommend_careers.
+        Args:
+            index (ScoreIndex): The score index to rank against.
+            soft_skills_list (list): The valid skill names.
+            input_path (str): A CSV or JSONL file of user profiles; see read_profiles().
+            output_path (str): A .csv or .jsonl file to write.
+            num_recommendations (int): The number of careers per user.
+            chunk_size (int): The number of profiles scored at a time.
+            progress (file, optional): Where to report progress and throughput; None for silence.
+            weights (dict, optional): Skill -> importance weight, the same for every profile.
+            job_zones (int or tuple, optional): Only recommend occupations in this Job Zone or
+                        inclusive (low, high) range; see ScoreIndex.filter_rows().
+            code_prefixes (str or list, optional): Only recommend occupations with these code prefixes.
+        Returns:
+            dict: The number of profiles written, elapsed seconds and profiles per second.
+    """
+    valid = set(soft_skills_list)
+    # The filters are resolved once; every chunk then only scores the rows they keep.
+    rows = None
+    if job_zones is not None or code_prefixes is not None:
+        rows = index.filter_rows(job_zones, code_prefixes)
+    profiles = read_profiles(input_path)
+    writer = RecommendationWriter(output_path)
+    total = 0
+    start = time.perf_counter()
+    try:
+        while True:
+            chunk = list(itertools.islice(profiles, chunk_size))
+            if not chunk:
+                break
+            valid_skills = [[skill for skill in skills if skill in valid] for _, skills in chunk]
+            results = index.top_k_batch(valid_skills, k=num_recommendations, chunk_size=chunk_size, rows=rows,
+                                         weights=weights)
+            for (user_id, skills), user_skills, top_careers in zip(chunk, valid_skills, results):
+                writer.write(user_id, user_skills, [skill for skill in skills if skill not in valid], top_careers)
+            writer.flush()
+
+            total += len(chunk)
+            elapsed = time.perf_counter() - start
+            if progress is not None:
+                print(f"Scored {total} profiles ({total / elapsed:.0f} profiles/s)", file=progress)
+    finally:
+        writer.close()
+
+    elapsed = time.perf_counter() - start
+    return {"profiles": total, "seconds": elapsed, "profiles_per_second": total / elapsed if elapsed else None}
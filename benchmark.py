@@ -0,0 +1,309 @@
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+import numpy as np
+import pandas as pd
+from compact_network import CompactNetwork, memory_report
+from score_index import ScoreIndex
+from sharded import ShardedScorer
+from snapshot import load_snapshot, write_snapshot
+from skills import calculate_overall_match, create_career_network, load_and_preprocess_data, recommend_careers
+
+REAL_DATA_DIR = "data/softskills"
+HEAVY_MODULES = ("pandas", "networkx", "prettytable")
+
+# Child programs for measure_startup(); each prints the heavy modules it ended up importing.
+STARTUP_PROGRAMS = {
+    "interpreter": "",
+    "import_skills": "import skills",
+    # What `import skills` cost when pandas, networkx and prettytable were imported at the top.
+    "import_skills_eager": "import pandas, networkx, prettytable, skills",
+    "cold_start_snapshot": (
+        "from snapshot import load_snapshot\n"
+        "snapshot = load_snapshot({snapshot!r})\n"
+        "snapshot.index.rank({skills!r}, top_k=10)"
+    ),
+    "cold_start_csv": (
+        "from score_index import ScoreIndex\n"
+        "from skills import calculate_overall_match, create_career_network, load_and_preprocess_data\n"
+        "data, _ = load_and_preprocess_data({data_dir!r})\n"
+        "G = create_career_network(data)\n"
+        "calculate_overall_match(G, {skills!r}, data, index=ScoreIndex.from_data(data, G.nodes()), top_k=10)"
+    ),
+}
+
+
+def generate_dataset(out_dir, num_occupations, num_skills, coverage=0.5, occupations_per_code=1, seed=0):
+    """
+        Writes synthetic soft skill CSV files in the same layout as data/softskills.
+
+        Every skill file lists a random 'coverage' fraction of the occupations. Occupations are
+        given codes in blocks of 'occupations_per_code', so values above 1 create shared codes
+        (and therefore edges) in the career network.
+        Args:
+            out_dir (str): Directory to write '<skill>.csv' files into; created if missing.
+            num_occupations (int): The number of distinct occupations.
+            num_skills (int): The number of skill files.
+            coverage (float): Fraction of occupations listed in each skill file.
+            occupations_per_code (int): How many occupations share each code.
+            seed (int): Seed for the random generator.
+        Returns:
+            list: The generated skill names.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    rng = np.random.default_rng(seed)
+    occupation_ids = np.arange(num_occupations)
+    occupations = np.char.add("Occupation ", occupation_ids.astype(str))
+    code_numbers = occupation_ids // max(occupations_per_code, 1)
+    codes = np.char.add(np.char.add(np.char.zfill((code_numbers // 10000 % 100).astype(str), 2), "-"),
+                        np.char.add(np.char.zfill((code_numbers % 10000).astype(str), 4), ".00"))
+    job_zones = rng.integers(1, 6, size=num_occupations)
+    per_file = max(1, int(num_occupations * coverage))
+
+    skills = []
+    for s in range(num_skills):
+        skill = f"skill{s:03d}"
+        rows = np.sort(rng.choice(num_occupations, size=min(per_file, num_occupations), replace=False))
+        pd.DataFrame({
+            "Skills Covered": rng.choice([20, 25, 33, 50, 67, 75, 100], size=len(rows)),
+            "My Matches": 1,
+            "Job Zone": job_zones[rows],
+            "Code": codes[rows],
+            "Occupation": occupations[rows],
+        }).to_csv(os.path.join(out_dir, skill + ".csv"), index=False)
+        skills.append(skill)
+    return skills
+
+
+def random_queries(soft_skills_list, num_queries, max_skills=5, seed=0):
+    """
+        Returns reproducible random user skill lists drawn from soft_skills_list.
+    """
+    rng = random.Random(seed)
+    return [rng.sample(soft_skills_list, rng.randint(1, min(max_skills, len(soft_skills_list))))
+            for _ in range(num_queries)]
+
+
+def measure(func, *args, track_memory=True, **kwargs):
+    """
+        Runs func once and returns (result, stats) with wall time and, optionally, peak traced memory.
+    """
+    if track_memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    try:
+        result = func(*args, **kwargs)
+        seconds = time.perf_counter() - start
+        stats = {"seconds": seconds}
+        if track_memory:
+            stats["peak_mb"] = tracemalloc.get_traced_memory()[1] / 2**20
+    finally:
+        if track_memory:
+            tracemalloc.stop()
+    return result, stats
+
+
+def run_scenario(name, data_dir, num_queries=20, num_recommendations=10, track_memory=True, seed=0,
+                 shard_workers=()):
+    """
+        Times every pipeline stage for one data directory.
+        For every worker count in shard_workers a 'sharded_<n>' stage times the same top-k
+        queries through a ShardedScorer (pool start-up excluded) to show scaling with cores.
+        Returns:
+            dict: Scenario metadata plus a 'stages' dictionary of per-stage statistics. Per-query
+                  stages report the total time for all queries and the mean per query.
+    """
+    stages = {}
+    (data, soft_skills_list), stages["load"] = measure(load_and_preprocess_data, data_dir, track_memory=track_memory)
+    if data is None:
+        raise RuntimeError(f"Failed to load data from {data_dir}")
+    G, stages["graph"] = measure(create_career_network, data, track_memory=track_memory)
+    network, stages["compact_graph"] = measure(CompactNetwork.from_data, data, track_memory=track_memory)
+    index, stages["index"] = measure(ScoreIndex.from_data, data, G.nodes(), track_memory=track_memory)
+    with tempfile.TemporaryDirectory() as tmp:
+        snapshot_path = os.path.join(tmp, "careers.snapshot")
+        _, stages["snapshot_build"] = measure(write_snapshot, snapshot_path, data, track_memory=track_memory)
+        snapshot, stages["snapshot_load"] = measure(load_snapshot, snapshot_path, track_memory=track_memory)
+        stages["snapshot_load"]["bytes"] = os.path.getsize(snapshot_path)
+        snapshot.close()
+    queries = random_queries(soft_skills_list, num_queries, seed=seed)
+
+    def score_all():
+        return [calculate_overall_match(G, user_skills, data, index=index) for user_skills in queries]
+
+    def recommend_all():
+        return [recommend_careers(calculate_overall_match(G, user_skills, data, index=index, top_k=num_recommendations),
+                                  num_recommendations) for user_skills in queries]
+
+    def batch_all():
+        return index.top_k_batch(queries, k=num_recommendations)
+
+    for stage, func in (("score", score_all), ("recommend", recommend_all), ("batch", batch_all)):
+        _, stages[stage] = measure(func, track_memory=track_memory)
+        stages[stage]["per_query_ms"] = stages[stage]["seconds"] / max(len(queries), 1) * 1000
+
+    for workers in shard_workers:
+        with ShardedScorer(index, workers=workers) as scorer:
+            # Warm the pool so worker start-up is not timed.
+            scorer.rank(queries[0], num_recommendations)
+            stage = f"sharded_{workers}"
+            _, stages[stage] = measure(lambda: [scorer.rank(user_skills, num_recommendations) for user_skills in queries],
+                                       track_memory=False)
+            stages[stage]["per_query_ms"] = stages[stage]["seconds"] / max(len(queries), 1) * 1000
+
+    return {
+        "name": name,
+        "occupations": G.number_of_nodes(),
+        "edges": G.number_of_edges(),
+        "skills": len(soft_skills_list),
+        "rows": int(sum(len(skill_df) for skill_df in data.values())),
+        "queries": len(queries),
+        "graph_memory": memory_report(G, network),
+        "stages": stages,
+    }
+
+
+def measure_startup(data_dir, repeats=5):
+    """
+        Times short-lived processes: bare imports, and a cold start that answers one query either
+        from a snapshot (numpy only) or by parsing the CSV files and building the graph.
+
+        Each program runs 'repeats' times in a fresh interpreter and the fastest wall time is
+        kept, interpreter start-up included (see the 'interpreter' entry).
+        Returns:
+            dict: Program name -> {'seconds', 'modules'}, where 'modules' lists which of pandas,
+                  networkx and prettytable the program imported.
+    """
+    data, soft_skills_list = load_and_preprocess_data(data_dir)
+    if data is None:
+        raise RuntimeError(f"Failed to load data from {data_dir}")
+    here = os.path.dirname(os.path.abspath(__file__))
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        snapshot = os.path.join(tmp, "careers.snapshot")
+        write_snapshot(snapshot, data)
+        for name, program in STARTUP_PROGRAMS.items():
+            code = program.format(snapshot=snapshot, data_dir=os.path.abspath(data_dir), skills=soft_skills_list[:3])
+            code += f"\nimport sys\nprint(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+            best = None
+            for _ in range(repeats):
+                start = time.perf_counter()
+                output = subprocess.run([sys.executable, "-c", code], cwd=here, capture_output=True, text=True,
+                                        check=True).stdout
+                elapsed = time.perf_counter() - start
+                best = elapsed if best is None else min(best, elapsed)
+            results[name] = {"seconds": best, "modules": [m for m in output.strip().split(",") if m]}
+    return results
+
+
+def parse_size(size):
+    """
+        Parses an '<occupations>x<skills>' string such as '10000x50' (k/m suffixes allowed).
+    """
+    def number(text):
+        text = text.lower()
+        scale = {"k": 1000, "m": 1000000}.get(text[-1], 1)
+        return int(float(text[:-1] if scale != 1 else text) * scale)
+
+    occupations, _, skills = size.partition("x")
+    return number(occupations), number(skills)
+
+
+def environment():
+    """
+        Describes the machine and commit a benchmark ran on.
+    """
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {"commit": commit, "python": platform.python_version(), "numpy": np.__version__,
+            "pandas": pd.__version__, "machine": platform.machine(), "cpus": os.cpu_count(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S")}
+
+
+def compare(results, baseline):
+    """
+        Prints the time ratio (current / baseline) for every stage of scenarios present in both.
+    """
+    previous = {scenario["name"]: scenario for scenario in baseline["scenarios"]}
+    for scenario in results["scenarios"]:
+        old = previous.get(scenario["name"])
+        if old is None:
+            continue
+        for stage, stats in scenario["stages"].items():
+            if stage in old["stages"] and old["stages"][stage]["seconds"] > 0:
+                ratio = stats["seconds"] / old["stages"][stage]["seconds"]
+                print(f"{scenario['name']:>16} {stage:>10}: {ratio:6.2f}x "
+                      f"({old['stages'][stage]['seconds']:.4f}s -> {stats['seconds']:.4f}s)")
+
+
+def main(argv=None):
+    """
+        Runs the real-data scenario and the requested synthetic sizes and writes JSON results.
+    """
+    parser = argparse.ArgumentParser(description="Benchmark loading, graph building, scoring and recommendation.")
+    parser.add_argument("--sizes", nargs="*", default=["1kx14", "10kx50"],
+                        help="Synthetic sizes as <occupations>x<skills>, e.g. 1kx14 100kx50 1mx500.")
+    parser.add_argument("--coverage", type=float, default=0.5, help="Fraction of occupations in each skill file.")
+    parser.add_argument("--occupations-per-code", type=int, default=1,
+                        help="Occupations sharing each code in synthetic data (values > 1 create edges).")
+    parser.add_argument("--queries", type=int, default=20, help="Number of user queries per scenario.")
+    parser.add_argument("--real-data", default=REAL_DATA_DIR, help="Real data directory ('' to skip).")
+    parser.add_argument("--shard-workers", type=int, nargs="*", default=[],
+                        help="Also time sharded multi-process scoring with these worker counts, e.g. 1 2 4 8.")
+    parser.add_argument("--startup", action="store_true",
+                        help="Also time import and cold start (one query) in fresh processes.")
+    parser.add_argument("--startup-repeats", type=int, default=5, help="Runs per start-up program (fastest kept).")
+    parser.add_argument("--no-memory", action="store_true", help="Skip tracemalloc (faster, no peak memory).")
+    parser.add_argument("--output", default=None, help="Write JSON results to this file.")
+    parser.add_argument("--compare", default=None, help="A previous JSON result to compare against.")
+    args = parser.parse_args(argv)
+
+    results = {"environment": environment(), "scenarios": []}
+    track_memory = not args.no_memory
+    if args.real_data:
+        results["scenarios"].append(run_scenario("real", args.real_data, args.queries, track_memory=track_memory,
+                                                 shard_workers=args.shard_workers))
+    for size in args.sizes:
+        num_occupations, num_skills = parse_size(size)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            generate_dataset(tmp_dir, num_occupations, num_skills, args.coverage, args.occupations_per_code)
+            results["scenarios"].append(run_scenario(size, tmp_dir, args.queries, track_memory=track_memory,
+                                                     shard_workers=args.shard_workers))
+
+    for scenario in results["scenarios"]:
+        print(f"{scenario['name']}: {scenario['occupations']} occupations, {scenario['skills']} skills, "
+              f"{scenario['edges']} edges")
+        for stage, stats in scenario["stages"].items():
+            memory = f", peak {stats['peak_mb']:.1f} MB" if "peak_mb" in stats else ""
+            print(f"    {stage:>13}: {stats['seconds']:.4f}s{memory}")
+        graph_memory = scenario["graph_memory"]
+        print(f"    graph memory: networkx {graph_memory['networkx_bytes'] / 2**20:.1f} MB, "
+              f"compact {graph_memory['compact_bytes'] / 2**20:.1f} MB")
+
+    if args.startup:
+        results["startup"] = measure_startup(args.real_data or REAL_DATA_DIR, args.startup_repeats)
+        print("startup:")
+        for name, stats in results["startup"].items():
+            print(f"    {name:>20}: {stats['seconds']:.4f}s (loads {', '.join(stats['modules']) or 'none of them'})")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            compare(results, json.load(f))
+    return results
+
+
+if __name__ == "__main__":
+    main()
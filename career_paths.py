@@ -0,0 +1,227 @@
+import heapq
+import threading
+from collections import OrderedDict
+import numpy as np
+
+
+def scores_from_ranked(ranked_careers):
+    """
+        Returns {occupation: score} from the output of calculate_overall_match, for rank_paths().
+    """
+    return {occupation: score for occupation, (score, _) in ranked_careers}
+
+
+class CareerPaths:
+    """
+        Adjacent-career, k-hop and transition-path queries over a CompactNetwork.
+
+        Everything runs on the CSR arrays: adjacency is a slice, and breadth-first search expands a
+        whole frontier per step with numpy instead of visiting nodes one at a time. A search only
+        goes as far as the query needs: neighborhood(k) stops after k frontiers and shortest_path()
+        stops at the frontier that reaches the target. Each result holds only the occupations it
+        reached (id, hops and parent), and results are cached per query in an LRU bounded both by
+        entries and by the total number of occupations held, so repeated queries are array lookups.
+        Ties are broken by occupation id, so results are deterministic.
+        Args:
+            network (CompactNetwork): The career network, e.g. CompactNetwork.from_data(data).
+            cache_size (int): The number of search results to keep.
+            cache_nodes (int): The most occupations kept across all cached results (12 bytes each).
+    """
+
+    def __init__(self, network, cache_size=256, cache_nodes=1000000):
+        self.network = network
+        self.cache_size = cache_size
+        self.cache_nodes = cache_nodes
+        self.hits = 0
+        self.misses = 0
+        self._cache = OrderedDict()
+        self._cached_nodes = 0
+        self._lock = threading.Lock()
+
+    def _id(self, occupation):
+        try:
+            return self.network.vocab.occupation_ids[occupation]
+        except KeyError:
+            raise KeyError(f"Unknown occupation: {occupation}") from None
+
+    def _names(self, ids):
+        occupations = self.network.vocab.occupations
+        return [occupations[i] for i in ids]
+
+    def _expand(self, frontier):
+        # (neighbor, frontier node it came from) for every edge leaving the frontier.
+        indptr, indices = self.network.indptr, self.network.indices
+        starts = indptr[frontier]
+        counts = indptr[frontier + 1] - starts
+        total = int(counts.sum())
+        if not total:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+        offsets = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+        return indices[np.repeat(starts, counts) + offsets].astype(np.int64), np.repeat(frontier, counts)
+
+    def search(self, sources, max_hops=None, target=None):
+        """
+            Multi-source breadth-first search from one or more occupation ids, stopping after
+            max_hops frontiers or once 'target' is reached.
+            Returns:
+                tuple: int32 arrays 'ids' (every occupation reached, sorted), 'distance' (hops to the
+                    nearest source) and 'parent' (previous occupation on a shortest path, -1 for
+                    sources), aligned with 'ids'. The arrays are shared with the cache and must not
+                    be modified.
+        """
+        key = (tuple(sorted(set(int(source) for source in sources))), max_hops, target)
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return self._cache[key]
+            self.misses += 1
+
+        seen = np.zeros(self.network.number_of_nodes(), dtype=bool)
+        frontier = np.array(key[0], dtype=np.int64)
+        seen[frontier] = True
+        ids, parents, distances = [frontier], [np.full(len(frontier), -1)], [np.zeros(len(frontier))]
+        hops = 0
+        while len(frontier) and (max_hops is None or hops < max_hops) and (target is None or not seen[target]):
+            hops += 1
+            reached, came_from = self._expand(frontier)
+            new = ~seen[reached]
+            # The first edge reaching each new node wins; frontier and CSR order are both sorted by id.
+            reached, first = np.unique(reached[new], return_index=True)
+            seen[reached] = True
+            ids.append(reached)
+            parents.append(came_from[new][first])
+            distances.append(np.full(len(reached), hops))
+            frontier = reached
+
+        ids, distances, parents = (np.concatenate(arrays) for arrays in (ids, distances, parents))
+        order = np.argsort(ids, kind='stable')
+        result = tuple(array[order].astype(np.int32) for array in (ids, distances, parents))
+        with self._lock:
+            if self.cache_size > 0 and len(ids) <= self.cache_nodes and key not in self._cache:
+                self._cache[key] = result
+                self._cached_nodes += len(ids)
+                while len(self._cache) > self.cache_size or self._cached_nodes > self.cache_nodes:
+                    self._cached_nodes -= len(self._cache.popitem(last=False)[1][0])
+        return result
+
+    def bfs(self, sources):
+        """
+            Full multi-source breadth-first search from one or more occupation ids.
+            Returns:
+                tuple: int32 arrays over every occupation: 'distance' (hops to the nearest source,
+                    -1 if unreachable) and 'parent' (previous occupation on a shortest path, -1 for
+                    sources and unreachable).
+        """
+        ids, distances, parents = self.search(sources)
+        n = self.network.number_of_nodes()
+        distance = np.full(n, -1, dtype=np.int32)
+        parent = np.full(n, -1, dtype=np.int32)
+        distance[ids] = distances
+        parent[ids] = parents
+        return distance, parent
+
+    def adjacent(self, occupation):
+        """
+            Returns the occupations directly connected to 'occupation' (sharing a Code).
+        """
+        return self._names(self.network.neighbor_ids(self._id(occupation)).tolist())
+
+    def neighborhood(self, occupations, k=2):
+        """
+            Returns the occupations within k hops of any of 'occupations' (the occupations themselves
+            excluded), as (occupation, hops) pairs sorted by hops and then id. Passing a user's top
+            matches gives the careers reachable from any of them.
+        """
+        if isinstance(occupations, str):
+            occupations = [occupations]
+        ids, distance, _ = self.search([self._id(occupation) for occupation in occupations], max_hops=k)
+        found = distance > 0
+        ids, distance = ids[found], distance[found]
+        order = np.argsort(distance, kind='stable')
+        return list(zip(self._names(ids[order].tolist()), distance[order].tolist()))
+
+    def _path_to(self, parent_of, target_id):
+        # Follows parent_of(id) back to a source (-1) and returns the path source first.
+        path = [target_id]
+        while parent_of(path[-1]) >= 0:
+            path.append(parent_of(path[-1]))
+        return self._names(reversed(path))
+
+    def shortest_path(self, source, target):
+        """
+            Returns the fewest-hop transition path from 'source' (an occupation or a list of them)
+            to 'target', both ends included, or None if no path exists.
+        """
+        sources = [source] if isinstance(source, str) else source
+        target_id = self._id(target)
+        ids, _, parents = self.search([self._id(occupation) for occupation in sources], target=target_id)
+
+        def parent_of(i):
+            return int(parents[np.searchsorted(ids, i)])
+
+        position = np.searchsorted(ids, target_id)
+        if position == len(ids) or ids[position] != target_id:
+            return None
+        return self._path_to(parent_of, target_id)
+
+    def rank_paths(self, sources, scores, targets=None, gap_weight=1.0, max_hops=None, limit=None):
+        """
+            Ranks transition paths from a user's current or best-matching occupations.
+
+            Each step u -> v costs 1 + gap_weight * max(0, scores[v] - scores[u]), so a path is
+            cheaper when the user's match climbs gradually instead of jumping; with gap_weight=0
+            this is the plain hop count. Costs are minimized with Dijkstra over the CSR arrays,
+            from all sources at once.
+            Args:
+                sources (list): Starting occupations.
+                scores (dict): Occupation -> match score, e.g. scores_from_ranked(ranked_careers).
+                            Missing occupations score 0.
+                targets (list, optional): Occupations to rank paths to; defaults to every reachable one.
+                gap_weight (float): How much each unit of score gap adds to a step.
+                max_hops (int, optional): Only return targets whose cheapest path has at most this many steps.
+                limit (int, optional): Return at most this many paths.
+            Returns:
+                list: (target, path, cost) tuples, cheapest first; sources themselves are not included.
+        """
+        vocab = self.network.vocab
+        n = self.network.number_of_nodes()
+        score = np.zeros(n, dtype=np.float64)
+        for occupation, value in scores.items():
+            if occupation in vocab.occupation_ids:
+                score[vocab.occupation_ids[occupation]] = value
+
+        source_ids = sorted(set(self._id(occupation) for occupation in sources))
+        cost = np.full(n, np.inf)
+        hops = np.zeros(n, dtype=np.int32)
+        parent = np.full(n, -1, dtype=np.int32)
+        cost[source_ids] = 0.0
+        heap = [(0.0, i) for i in source_ids]
+        indptr, indices = self.network.indptr, self.network.indices
+        while heap:
+            c, u = heapq.heappop(heap)
+            if c > cost[u]:
+                continue
+            neighbors = indices[indptr[u]:indptr[u + 1]]
+            step = c + 1.0 + gap_weight * np.maximum(score[neighbors] - score[u], 0.0)
+            better = step < cost[neighbors]
+            for v, new_cost in zip(neighbors[better].tolist(), step[better].tolist()):
+                cost[v], hops[v], parent[v] = new_cost, hops[u] + 1, u
+                heapq.heappush(heap, (new_cost, v))
+
+        reachable = np.isfinite(cost) & (parent >= 0)
+        if max_hops is not None:
+            reachable &= hops <= max_hops
+        if targets is None:
+            target_ids = np.flatnonzero(reachable)
+        else:
+            target_ids = np.array([self._id(occupation) for occupation in targets], dtype=np.int64)
+            target_ids = target_ids[reachable[target_ids]]
+        target_ids = target_ids[np.argsort(cost[target_ids], kind='stable')][:limit]
+        return [(vocab.occupations[i], self._path_to(lambda j: int(parent[j]), i), float(cost[i]))
+                for i in target_ids.tolist()]
+
+    def stats(self):
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "size": len(self._cache),
+                    "maxsize": self.cache_size, "nodes": self._cached_nodes, "max_nodes": self.cache_nodes}
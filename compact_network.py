@@ -0,0 +1,210 @@
+import sys
+import numpy as np
+
+
+def shared_code_pairs(skill_df, node_ids):
+    """
+        Returns every pair of rows in one skill's DataFrame that share a Code, as encoded edge keys.
+
+        Rows are sorted by Code; a row at position p of a group ending at e pairs with rows p+1..e-1,
+        which np.repeat expands without a Python loop. Rows with no Code or an unknown occupation
+        are skipped, matching groupby('Code') and the node check of the original double loop.
+        Args:
+            skill_df (pd.DataFrame): A skill DataFrame with 'Occupation' and 'Code' columns.
+            node_ids (dict): Maps each occupation to its integer node id.
+        Returns:
+            np.ndarray: One int64 key per pair, smaller_id * len(node_ids) + larger_id.
+    """
+    import pandas as pd
+
+    ids = np.array([node_ids.get(occupation, -1) for occupation in skill_df['Occupation'].tolist()], dtype=np.int64)
+    codes, _ = pd.factorize(skill_df['Code'])
+    keep = (codes >= 0) & (ids >= 0)
+    ids, codes = ids[keep], codes[keep]
+
+    if not len(codes):
+        return np.empty(0, dtype=np.int64)
+
+    order = np.argsort(codes, kind='stable')
+    ids, codes = ids[order], codes[order]
+    # Exclusive end of each row's code group.
+    group_starts = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]])
+    group_ends = np.r_[group_starts[1:], len(codes)]
+    row_ends = np.repeat(group_ends, group_ends - group_starts)
+
+    positions = np.arange(len(codes))
+    partner_counts = row_ends - positions - 1
+    first = np.repeat(positions, partner_counts)
+    # For each row, 1, 2, ... counting up to its partner count.
+    offsets = np.arange(len(first)) - np.repeat(np.cumsum(partner_counts) - partner_counts, partner_counts) + 1
+    a, b = ids[first], ids[first + offsets]
+    return np.minimum(a, b) * len(node_ids) + np.maximum(a, b)
+
+
+class Vocabulary:
+    """
+        Dense integer ids for occupations, codes and skills, shared by the compact structures.
+
+        Each name is stored once; everything else refers to it by position.
+    """
+
+    def __init__(self, occupations, codes, skills):
+        self.occupations = list(occupations)
+        self.codes = list(codes)
+        self.skills = list(skills)
+        self.occupation_ids = {name: i for i, name in enumerate(self.occupations)}
+        self.code_ids = {name: i for i, name in enumerate(self.codes)}
+        self.skill_ids = {name: i for i, name in enumerate(self.skills)}
+
+    @classmethod
+    def from_data(cls, data):
+        """
+            Collects every occupation, code and skill in 'data', in order of first appearance.
+        """
+        occupations = {}
+        codes = {}
+        for skill_df in data.values():
+            occupations.update(dict.fromkeys(skill_df['Occupation'].tolist()))
+            codes.update(dict.fromkeys(skill_df['Code'].dropna().tolist()))
+        return cls(occupations, codes, data)
+
+
+class CompactNetwork:
+    """
+        The career network as flat integer arrays instead of a networkx graph of strings.
+
+        Attributes:
+            vocab (Vocabulary): Names for every id.
+            occupation_code (np.ndarray): int32 code id per occupation (first listing), -1 if none.
+            skill_bits (np.ndarray): uint8 bitset per occupation, bit j set if skill j lists it
+                        (packed with np.packbits, shape occupations x ceil(skills / 8)).
+            indptr, indices (np.ndarray): CSR adjacency; the neighbors of occupation i are
+                        indices[indptr[i]:indptr[i + 1]], sorted. Both directions are stored.
+    """
+
+    def __init__(self, vocab, occupation_code, skill_bits, indptr, indices):
+        self.vocab = vocab
+        self.occupation_code = occupation_code
+        self.skill_bits = skill_bits
+        self.indptr = indptr
+        self.indices = indices
+
+    @classmethod
+    def from_data(cls, data, vocab=None):
+        """
+            Builds the compact network from the dictionary returned by load_and_preprocess_data,
+            with the same nodes, edges and skill membership as create_career_network.
+        """
+        vocab = vocab or Vocabulary.from_data(data)
+        n = len(vocab.occupations)
+        membership = np.zeros((n, len(vocab.skills)), dtype=bool)
+        occupation_code = np.full(n, -1, dtype=np.int32)
+        edge_keys = [np.empty(0, dtype=np.int64)]
+
+        for skill, skill_df in data.items():
+            ids = np.array([vocab.occupation_ids[occupation] for occupation in skill_df['Occupation'].tolist()],
+                           dtype=np.int64)
+            membership[ids, vocab.skill_ids[skill]] = True
+            codes = np.array([vocab.code_ids.get(code, -1) for code in skill_df['Code'].tolist()], dtype=np.int32)
+            # Keep the first code seen for each occupation.
+            unset = occupation_code[ids] < 0
+            first_rows = np.unique(ids[unset], return_index=True)[1]
+            occupation_code[ids[unset][first_rows]] = codes[unset][first_rows]
+            edge_keys.append(shared_code_pairs(skill_df, vocab.occupation_ids))
+
+        edges = np.unique(np.concatenate(edge_keys))
+        indptr, indices = cls._csr(edges // max(n, 1), edges % max(n, 1), n)
+        return cls(vocab, occupation_code, np.packbits(membership, axis=1), indptr, indices)
+
+    @staticmethod
+    def _csr(a, b, n):
+        # Symmetric CSR from undirected (a, b) pairs; a self-loop is stored once.
+        loops = a == b
+        rows = np.concatenate([a, b[~loops]])
+        cols = np.concatenate([b, a[~loops]])
+        order = np.lexsort((cols, rows))
+        indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=n), out=indptr[1:])
+        return indptr, cols[order].astype(np.int32)
+
+    def number_of_nodes(self):
+        return len(self.vocab.occupations)
+
+    def number_of_edges(self):
+        loops = int(np.sum(self.indices == np.repeat(np.arange(self.number_of_nodes()), np.diff(self.indptr))))
+        return (len(self.indices) - loops) // 2 + loops
+
+    def neighbor_ids(self, occupation_id):
+        """
+            Returns the neighbor ids of an occupation id as a view into the CSR arrays.
+        """
+        return self.indices[self.indptr[occupation_id]:self.indptr[occupation_id + 1]]
+
+    def neighbors(self, occupation):
+        return [self.vocab.occupations[i] for i in self.neighbor_ids(self.vocab.occupation_ids[occupation])]
+
+    def skill_ids_of(self, occupation_id):
+        """
+            Returns the skill ids listing an occupation id, in skill order.
+        """
+        bits = np.unpackbits(self.skill_bits[occupation_id], count=len(self.vocab.skills))
+        return np.flatnonzero(bits)
+
+    def skills_of(self, occupation):
+        return [self.vocab.skills[j] for j in self.skill_ids_of(self.vocab.occupation_ids[occupation])]
+
+    def to_networkx(self):
+        """
+            Returns the equivalent nx.Graph, with a 'skills' list on every node, for callers that need one.
+        """
+        import networkx as nx
+
+        G = nx.Graph()
+        occupations = self.vocab.occupations
+        membership = np.unpackbits(self.skill_bits, axis=1, count=len(self.vocab.skills)).astype(bool)
+        skills = np.array(self.vocab.skills, dtype=object)
+        G.add_nodes_from((occupation, {'skills': list(skills[membership[i]])}) for i, occupation in enumerate(occupations))
+        rows = np.repeat(np.arange(len(occupations)), np.diff(self.indptr))
+        upper = rows <= self.indices
+        G.add_edges_from(zip([occupations[i] for i in rows[upper].tolist()],
+                             [occupations[j] for j in self.indices[upper].tolist()]))
+        return G
+
+    def nbytes(self):
+        """
+            Bytes used by the arrays plus the vocabulary strings (each stored once).
+        """
+        arrays = self.occupation_code.nbytes + self.skill_bits.nbytes + self.indptr.nbytes + self.indices.nbytes
+        names = self.vocab.occupations + self.vocab.codes + self.vocab.skills
+        return arrays + sum(sys.getsizeof(name) for name in names)
+
+
+def _deep_sizeof(obj, seen):
+    # sys.getsizeof over containers and their contents, counting each object once.
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(_deep_sizeof(key, seen) + _deep_sizeof(value, seen) for key, value in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(_deep_sizeof(item, seen) for item in obj)
+    return size
+
+
+def memory_report(G, network):
+    """
+        Compares the memory held by an nx.Graph from create_career_network and a CompactNetwork.
+        Returns:
+            dict: Byte counts for both representations and their ratio.
+    """
+    seen = set()
+    graph_bytes = _deep_sizeof(G._adj, seen) + _deep_sizeof(G._node, seen)
+    compact_bytes = network.nbytes()
+    return {
+        "nodes": network.number_of_nodes(),
+        "edges": network.number_of_edges(),
+        "networkx_bytes": graph_bytes,
+        "compact_bytes": compact_bytes,
+        "ratio": graph_bytes / compact_bytes if compact_bytes else None,
+    }
@@ -0,0 +1,198 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from contextlib import contextmanager
+import numpy as np
+import pandas as pd
+
+try:
+    import fcntl
+except ImportError:  # Windows: the manifest lock then only covers threads of one process.
+    fcntl = None
+
+# Bump when the on-disk layout changes so old caches are rebuilt instead of misread.
+CACHE_VERSION = 1
+MANIFEST_NAME = "manifest.json"
+LOCK_NAME = "manifest.lock"
+
+
+def file_digest(filepath, chunk_size=1 << 20):
+    """
+        Returns the sha256 hex digest of a file's contents.
+    """
+    digest = hashlib.sha256()
+    with open(filepath, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class SkillFileCache:
+    """
+        On-disk cache of preprocessed skill DataFrames, one uncompressed .npz (one array per column)
+        per source file, plus a JSON manifest keyed on the source path.
+
+        An entry is reused when the source file's size and mtime are unchanged. If only the mtime
+        changed, the content hash decides, so touching a file does not force a reparse. Every
+        load is recorded in 'hits' or 'misses' (source file paths) so callers can report on it.
+        One cache directory may be shared by threads and by processes: files are written under
+        unique temporary names and renamed into place, and manifest updates are merged with the
+        manifest on disk under a file lock, so concurrent writers do not lose each other's entries.
+        Args:
+            cache_dir (str): Directory holding the manifest and cached arrays; created if missing.
+            rebuild (bool): If True, ignore existing entries and reparse every file.
+    """
+
+    def __init__(self, cache_dir, rebuild=False):
+        self.cache_dir = cache_dir
+        self.rebuild = rebuild
+        self.hits = []
+        self.misses = []
+        self.lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+        self.manifest = self._read_manifest()
+
+    def _manifest_path(self):
+        return os.path.join(self.cache_dir, MANIFEST_NAME)
+
+    def _read_manifest(self):
+        try:
+            with open(self._manifest_path()) as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if manifest.get("version") != CACHE_VERSION:
+            return {}
+        return manifest.get("files", {})
+
+    @contextmanager
+    def _manifest_lock(self):
+        # Serializes manifest read-modify-write across threads and, where flock exists, processes.
+        with self.lock, open(os.path.join(self.cache_dir, LOCK_NAME), "a") as f:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+
+    def _replace(self, path, write):
+        # Writes through write(file) to a unique temporary file in the cache and renames it over path.
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                write(f)
+            os.replace(tmp_path, path)
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+
+    def _update_manifest(self, key, entry):
+        # Merges one entry into the latest manifest on disk, so other writers' entries are kept.
+        with self._manifest_lock():
+            manifest = self._read_manifest()
+            manifest[key] = entry
+            self.manifest = manifest
+            payload = json.dumps({"version": CACHE_VERSION, "files": manifest}, indent=1, sort_keys=True)
+            self._replace(self._manifest_path(), lambda f: f.write(payload.encode()))
+
+    def _entry_name(self, key):
+        stem = os.path.splitext(os.path.basename(key.split("|")[0]))[0]
+        return f"{stem}-{hashlib.sha1(key.encode()).hexdigest()[:12]}.npz"
+
+    def _lookup(self, key, path, stat):
+        # Returns the manifest entry if it still describes the file on disk, else None.
+        entry = self.manifest.get(key)
+        if entry is None or self.rebuild:
+            return None
+        if not os.path.exists(os.path.join(self.cache_dir, entry["entry"])):
+            return None
+        if entry["size"] == stat.st_size and entry["mtime_ns"] == stat.st_mtime_ns:
+            return entry
+        if entry["size"] == stat.st_size and entry["sha256"] == file_digest(path):
+            entry = dict(entry, mtime_ns=stat.st_mtime_ns)
+            self._update_manifest(key, entry)
+            return entry
+        return None
+
+    def load(self, filepath, parse, variant=None):
+        """
+            Returns the preprocessed DataFrame for a file, from the cache when it is current.
+            Args:
+                filepath (str): Path of the source CSV file.
+                parse (callable): Called as parse(filepath) on a miss; must return a DataFrame.
+                variant (str, optional): Distinguishes different preprocessing of the same file
+                            (e.g. a column selection), which are cached separately.
+            Returns:
+                pd.DataFrame: The preprocessed DataFrame.
+        """
+        path = os.path.abspath(filepath)
+        key = f"{path}|{variant}" if variant else path
+        stat = os.stat(path)
+        entry = self._lookup(key, path, stat)
+        if entry is not None:
+            try:
+                df = self._read_frame(os.path.join(self.cache_dir, entry["entry"]), entry["columns"])
+            except (OSError, ValueError, KeyError):
+                df = None
+            if df is not None:
+                with self.lock:
+                    self.hits.append(filepath)
+                return df
+
+        df = parse(filepath)
+        name = self._entry_name(key)
+        columns = self._write_frame(os.path.join(self.cache_dir, name), df)
+        digest = file_digest(path)
+        with self.lock:
+            self.misses.append(filepath)
+        self._update_manifest(key, {
+            "entry": name,
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "sha256": digest,
+            "columns": columns,
+        })
+        return df
+
+    def report(self):
+        """
+            Returns a summary of the loads done through this cache as a dictionary.
+        """
+        return {"hits": len(self.hits), "misses": len(self.misses),
+                "missed_files": [os.path.basename(path) for path in self.misses]}
+
+    def _write_frame(self, path, df):
+        # Numeric columns are stored as-is, anything else as a unicode array plus a null mask.
+        arrays = {}
+        columns = []
+        for i, column in enumerate(df.columns):
+            values = df[column].to_numpy()
+            if values.dtype.kind in "biuf":
+                arrays[f"c{i}"] = values
+                columns.append({"name": column, "kind": "numeric"})
+            else:
+                nulls = pd.isna(values)
+                arrays[f"c{i}"] = np.where(nulls, "", values).astype(str)
+                arrays[f"n{i}"] = nulls
+                columns.append({"name": column, "kind": "text"})
+        self._replace(path, lambda f: np.savez(f, **arrays))
+        return columns
+
+    @staticmethod
+    def _read_frame(path, columns):
+        frame = {}
+        with np.load(path, allow_pickle=False) as arrays:
+            for i, column in enumerate(columns):
+                values = arrays[f"c{i}"]
+                if column["kind"] == "text":
+                    values = values.astype(object)
+                    values[arrays[f"n{i}"]] = np.nan
+                frame[column["name"]] = values
+        return pd.DataFrame(frame)
@@ -0,0 +1,211 @@
+import os
+import threading
+from collections import Counter
+import networkx as nx
+from compact_network import shared_code_pairs
+from loader import read_skill_file
+from score_index import ScoreIndex
+
+
+def _read_full_skill_file(filepath):
+    # The same cleaning as load_and_preprocess_data: every column, float64 scores.
+    return read_skill_file(filepath, columns=None, compact=False)
+
+
+class IncrementalNetwork:
+    """
+        The career network and score index kept up to date one skill DataFrame at a time.
+
+        Every skill remembers which occupations it lists and which shared-code edges it
+        contributes. Edges carry a reference count of the skills contributing them, so an edge
+        shared by two skills survives when one of them is removed. Nodes are reference counted
+        the same way. After any sequence of updates, G has the same nodes, edges and 'skills'
+        attributes as create_career_network(data) would build from scratch.
+        Args:
+            data (dict, optional): Initial skill name -> DataFrame, as from load_and_preprocess_data.
+    """
+
+    def __init__(self, data=None):
+        self.data = {}
+        self.G = nx.Graph()
+        self.index = ScoreIndex.from_data({})
+        self.generation = 0
+        self._skill_occupations = {}
+        self._skill_edges = {}
+        self._edge_refs = Counter()
+        self._node_refs = Counter()
+        self._lock = threading.RLock()
+        for skill, skill_df in (data or {}).items():
+            self.set_skill(skill, skill_df)
+
+    @staticmethod
+    def _edges_of(skill_df, node_ids):
+        # The skill's shared-code edges as (smaller, larger) name tuples, so they do not depend on the
+        # current node order and an occupation listed twice under one Code keeps its self-loop.
+        nodes = list(node_ids)
+        n = len(nodes)
+        edges = set()
+        for key in set(shared_code_pairs(skill_df, node_ids).tolist()):
+            a, b = nodes[key // n], nodes[key % n]
+            edges.add((a, b) if a <= b else (b, a))
+        return edges
+
+    def set_skill(self, skill, skill_df):
+        """
+            Adds a skill's DataFrame, or replaces the current one, patching only what it touches:
+            its occupations' 'skills' attributes, the edges from its Code groups and its index column.
+        """
+        with self._lock:
+            old_occupations = self._skill_occupations.get(skill, set())
+            new_occupations = list(dict.fromkeys(skill_df['Occupation'].tolist()))
+
+            for occupation in new_occupations:
+                if occupation not in old_occupations:
+                    if self._node_refs[occupation] == 0:
+                        self.G.add_node(occupation)
+                    self._node_refs[occupation] += 1
+
+            node_ids = {occupation: i for i, occupation in enumerate(self.G.nodes())}
+            new_edges = self._edges_of(skill_df, node_ids)
+            old_edges = self._skill_edges.get(skill, set())
+            for edge in new_edges - old_edges:
+                if self._edge_refs[edge] == 0:
+                    self.G.add_edge(*edge)
+                self._edge_refs[edge] += 1
+            self._release_edges(old_edges - new_edges)
+
+            self.data[skill] = skill_df
+            self._skill_edges[skill] = new_edges
+            self._skill_occupations[skill] = set(new_occupations)
+            removed = self._release_nodes(old_occupations - set(new_occupations))
+            self._refresh_skills(old_occupations | set(new_occupations))
+
+            self.index.set_column(skill, skill_df)
+            self.index.remove_rows(removed)
+            self.generation += 1
+
+    def remove_skill(self, skill):
+        """
+            Removes a skill and everything only it contributed.
+        """
+        with self._lock:
+            if skill not in self.data:
+                raise KeyError(skill)
+            del self.data[skill]
+            self._release_edges(self._skill_edges.pop(skill))
+            occupations = self._skill_occupations.pop(skill)
+            removed = self._release_nodes(occupations)
+            self._refresh_skills(occupations - set(removed))
+
+            self.index.remove_column(skill)
+            self.index.remove_rows(removed)
+            self.generation += 1
+
+    def _release_edges(self, edges):
+        for edge in edges:
+            self._edge_refs[edge] -= 1
+            if self._edge_refs[edge] == 0:
+                del self._edge_refs[edge]
+                if self.G.has_edge(*edge):
+                    self.G.remove_edge(*edge)
+
+    def _release_nodes(self, occupations):
+        # Drops nodes no skill lists any more; returns them.
+        removed = []
+        for occupation in occupations:
+            self._node_refs[occupation] -= 1
+            if self._node_refs[occupation] == 0:
+                del self._node_refs[occupation]
+                self.G.remove_node(occupation)
+                removed.append(occupation)
+        return removed
+
+    def _refresh_skills(self, occupations):
+        # Rebuilds the 'skills' attribute, in data order, for the given occupations only.
+        for occupation in occupations:
+            if occupation in self.G:
+                self.G.nodes[occupation]['skills'] = [skill for skill in self.data
+                                                      if occupation in self._skill_occupations[skill]]
+
+    @property
+    def soft_skills_list(self):
+        return list(self.data)
+
+    def apply_file(self, filepath, parse=_read_full_skill_file):
+        """
+            Re-reads one skill CSV file and applies it; a missing file removes the skill.
+            Returns the skill name.
+        """
+        skill = os.path.basename(filepath)[:-4]
+        if os.path.exists(filepath):
+            self.set_skill(skill, parse(filepath))
+        elif skill in self.data:
+            self.remove_skill(skill)
+        return skill
+
+
+class DirectoryWatcher:
+    """
+        Polls a skill directory and applies added, changed and deleted CSV files to an
+        IncrementalNetwork. Uses only os.stat, so it needs no extra dependencies.
+
+        A file that fails to parse is reported and skipped; it is retried when it changes again.
+        Args:
+            data_dir (str): The directory containing the CSV files.
+            network (IncrementalNetwork): The network to update.
+            interval (float): Seconds between polls.
+            on_change (callable, optional): Called with the skill name after each applied change.
+    """
+
+    def __init__(self, data_dir, network, interval=1.0, on_change=None, parse=_read_full_skill_file):
+        self.data_dir = data_dir
+        self.network = network
+        self.interval = interval
+        self.on_change = on_change
+        self.parse = parse
+        self._seen = self._scan()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _scan(self):
+        seen = {}
+        for filename in os.listdir(self.data_dir):
+            if filename.endswith(".csv"):
+                stat = os.stat(os.path.join(self.data_dir, filename))
+                seen[filename] = (stat.st_size, stat.st_mtime_ns)
+        return seen
+
+    def poll(self):
+        """
+            Checks the directory once and applies every change. Returns the changed skill names.
+        """
+        current = self._scan()
+        changed = [filename for filename, stat in current.items() if self._seen.get(filename) != stat]
+        changed += [filename for filename in self._seen if filename not in current]
+        applied = []
+        for filename in changed:
+            try:
+                applied.append(self.network.apply_file(os.path.join(self.data_dir, filename), self.parse))
+            except Exception as e:
+                print(f"Error loading data from {os.path.join(self.data_dir, filename)}: {e}")
+                continue
+            if self.on_change is not None:
+                self.on_change(applied[-1])
+        self._seen = current
+        return applied
+
+    def start(self):
+        """
+            Starts polling in a daemon thread.
+        """
+        def run():
+            while not self._stop.wait(self.interval):
+                self.poll()
+
+        self._thread = threading.Thread(target=run, name="skill-directory-watcher", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
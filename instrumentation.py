@@ -0,0 +1,231 @@
+import cProfile
+import functools
+import io
+import json
+import pstats
+import threading
+import time
+import tracemalloc
+from collections import deque
+import numpy as np
+
+QUANTILES = (0.5, 0.95, 0.99)
+
+
+class _NullStage:
+    # Shared no-op context manager returned while instrumentation is disabled.
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NULL_STAGE = _NullStage()
+
+
+class _Stage:
+    def __init__(self, registry, name):
+        self.registry = registry
+        self.name = name
+
+    def __enter__(self):
+        memory = self.registry.track_memory and tracemalloc.is_tracing()
+        if memory:
+            current, peak = tracemalloc.get_traced_memory()
+            # The enclosing stage keeps the peak seen so far, since reset_peak() clears it.
+            stack = self.registry._memory_stack()
+            if stack:
+                stack[-1][1] = max(stack[-1][1], peak)
+            stack.append([current, current])
+            tracemalloc.reset_peak()
+        self.memory = memory
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        seconds = time.perf_counter() - self.start
+        memory = None
+        if self.memory:
+            stack = self.registry._memory_stack()
+            start, peak = stack.pop()
+            peak = max(peak, tracemalloc.get_traced_memory()[1])
+            if stack:
+                stack[-1][1] = max(stack[-1][1], peak)
+            tracemalloc.reset_peak()
+            memory = peak - start
+        self.registry.record(self.name, seconds, memory, error=exc_info[0] is not None)
+        return False
+
+
+class StageStats:
+    """
+        Counters for one stage plus a window of its most recent durations.
+    """
+
+    def __init__(self, window):
+        self.calls = 0
+        self.errors = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        self.peak_memory = None
+        self.durations = deque(maxlen=window)
+
+    def snapshot(self):
+        snapshot = {"calls": self.calls, "errors": self.errors, "total_s": self.total_seconds,
+                    "mean_ms": self.total_seconds / self.calls * 1000 if self.calls else None,
+                    "max_ms": self.max_seconds * 1000, "peak_memory_bytes": self.peak_memory}
+        if self.durations:
+            durations = np.array(self.durations, dtype=np.float64) * 1000
+            for q, value in zip(QUANTILES, np.quantile(durations, QUANTILES)):
+                snapshot[f"p{round(q * 100)}_ms"] = float(value)
+        return snapshot
+
+
+class Instrumentation:
+    """
+        Per-stage wall time, call counts, peak memory and latency percentiles.
+
+        Wrap code in 'with instrumentation.stage("name"):' or decorate a function with
+        @instrumentation.timed("name"). While disabled (the default) stage() returns a shared
+        no-op object and timed() functions only check one attribute, so leaving the hooks in
+        place costs next to nothing.
+        Peak memory is recorded with tracemalloc when track_memory is on. It is the highest traced
+        allocation above the level at the start of the stage, nested stages included. tracemalloc
+        slows allocations down considerably, so only turn it on when memory numbers are wanted.
+        Args:
+            window (int): The number of recent durations per stage kept for percentiles.
+    """
+
+    def __init__(self, window=10000):
+        self.window = window
+        self.enabled = False
+        self.track_memory = False
+        self.stages = {}
+        self._started_tracing = False
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def enable(self, track_memory=False):
+        """
+            Starts recording. With track_memory, tracemalloc is started if it is not running.
+        """
+        self.track_memory = track_memory
+        if track_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+        self.track_memory = False
+
+    def reset(self):
+        with self._lock:
+            self.stages = {}
+
+    def _memory_stack(self):
+        if not hasattr(self._local, "memory"):
+            self._local.memory = []
+        return self._local.memory
+
+    def stage(self, name):
+        """
+            Returns a context manager that records the time spent in its block under 'name'.
+        """
+        if not self.enabled:
+            return _NULL_STAGE
+        return _Stage(self, name)
+
+    def timed(self, name):
+        """
+            Decorator recording every call of the function as the stage 'name'.
+        """
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                with _Stage(self, name):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def record(self, name, seconds, memory=None, error=False):
+        """
+            Adds one measurement for a stage.
+        """
+        with self._lock:
+            stats = self.stages.get(name)
+            if stats is None:
+                stats = self.stages[name] = StageStats(self.window)
+            stats.calls += 1
+            stats.errors += int(error)
+            stats.total_seconds += seconds
+            stats.max_seconds = max(stats.max_seconds, seconds)
+            stats.durations.append(seconds)
+            if memory is not None:
+                stats.peak_memory = max(stats.peak_memory or 0, memory)
+
+    def snapshot(self):
+        """
+            Returns every stage's statistics as a JSON-ready dictionary keyed by stage name.
+        """
+        with self._lock:
+            return {name: stats.snapshot() for name, stats in self.stages.items()}
+
+    def to_json(self, indent=2):
+        return json.dumps(self.snapshot(), indent=indent)
+
+    def to_prometheus(self, prefix="career_navigator"):
+        """
+            Returns the statistics in the Prometheus text exposition format: a summary of stage
+            durations in seconds (p50/p95/p99, sum and count), plus error and peak memory gauges.
+        """
+        lines = [f"# HELP {prefix}_stage_seconds Wall time per call of each stage.",
+                 f"# TYPE {prefix}_stage_seconds summary"]
+        with self._lock:
+            stages = sorted(self.stages.items())
+            quantiles = {name: np.quantile(np.array(stats.durations, dtype=np.float64), QUANTILES)
+                         for name, stats in stages if stats.durations}
+        for name, stats in stages:
+            for q, value in zip(QUANTILES, quantiles.get(name, ())):
+                lines.append(f'{prefix}_stage_seconds{{stage="{name}",quantile="{q}"}} {value:.9g}')
+            lines.append(f'{prefix}_stage_seconds_sum{{stage="{name}"}} {stats.total_seconds:.9g}')
+            lines.append(f'{prefix}_stage_seconds_count{{stage="{name}"}} {stats.calls}')
+        lines += [f"# HELP {prefix}_stage_errors_total Calls of each stage that raised.",
+                  f"# TYPE {prefix}_stage_errors_total counter"]
+        lines += [f'{prefix}_stage_errors_total{{stage="{name}"}} {stats.errors}' for name, stats in stages]
+        memory = [(name, stats.peak_memory) for name, stats in stages if stats.peak_memory is not None]
+        if memory:
+            lines += [f"# HELP {prefix}_stage_peak_memory_bytes Highest traced allocation during each stage.",
+                      f"# TYPE {prefix}_stage_peak_memory_bytes gauge"]
+            lines += [f'{prefix}_stage_peak_memory_bytes{{stage="{name}"}} {peak}' for name, peak in memory]
+        return "\n".join(lines) + "\n"
+
+    def dump(self, path):
+        """
+            Writes the statistics to path, in Prometheus text format for .prom/.txt files and JSON otherwise.
+        """
+        with open(path, "w") as f:
+            f.write(self.to_prometheus() if path.endswith((".prom", ".txt")) else self.to_json())
+
+
+def profile(func, *args, sort="cumulative", limit=25, **kwargs):
+    """
+        Runs func(*args, **kwargs) once under cProfile.
+        Returns:
+            tuple: The function's result and the formatted profile (the 'limit' slowest entries by 'sort').
+    """
+    profiler = cProfile.Profile()
+    result = profiler.runcall(func, *args, **kwargs)
+    out = io.StringIO()
+    pstats.Stats(profiler, stream=out).sort_stats(sort).print_stats(limit)
+    return result, out.getvalue()
+
+
+# The process-wide instance used by skills.py, server.py and benchmark.py.
+instrumentation = Instrumentation()
@@ -0,0 +1,167 @@
+import os
+import threading
+from collections.abc import Mapping
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import numpy as np
+import pandas as pd
+
+# The columns the rest of the pipeline reads; 'My Matches' and the like are skipped.
+# 'Job Zone' feeds the Job Zone filter of ScoreIndex.filter_rows().
+SCORING_COLUMNS = ("Skills Covered", "Job Zone", "Code", "Occupation")
+# Columns of SCORING_COLUMNS read only when the file has them.
+OPTIONAL_COLUMNS = ("Job Zone",)
+
+
+def read_skill_file(filepath, columns=SCORING_COLUMNS, compact=True):
+    """
+        Reads one skill CSV file, keeping only 'columns', and cleans 'Skills Covered' to a fraction.
+
+        With compact=True 'Occupation' and 'Code' become categoricals and 'Skills Covered' is
+        stored as float32, which is plenty for whole-percent values and halves the score memory.
+        Args:
+            filepath (str): The path of the CSV file.
+            columns (tuple): The columns to read, or None for all of them. Columns in
+                        OPTIONAL_COLUMNS are skipped if the file does not have them.
+            compact (bool): Use compact dtypes.
+        Returns:
+            pd.DataFrame: The cleaned DataFrame.
+    """
+    dtype = {"Occupation": "category", "Code": "category"} if compact else None
+    # A callable usecols lets optional columns be absent; required ones are checked below.
+    usecols = (lambda name: name in columns) if columns else None
+    df = pd.read_csv(filepath, usecols=usecols, dtype=dtype)
+    missing = [column for column in columns or () if column not in df and column not in OPTIONAL_COLUMNS]
+    if missing:
+        raise ValueError(f"Usecols do not match columns, columns expected but not found: {missing}")
+
+    # Clean the Skills Covered, and convert it to a numeric
+    skills_covered = df['Skills Covered']
+    if skills_covered.dtype == object:
+        skills_covered = skills_covered.astype(str).str.replace('%', '', regex=False)
+    df['Skills Covered'] = skills_covered.astype(np.float32 if compact else float) / 100
+    if compact and 'Job Zone' in df and not df['Job Zone'].isna().any():
+        df['Job Zone'] = df['Job Zone'].astype(np.int8)
+    return df
+
+
+def _variant(columns, compact):
+    # Names a column selection/dtype combination for SkillFileCache.
+    return f"{','.join(columns) if columns else '*'};{'compact' if compact else 'full'}"
+
+
+def _load_one(filepath, columns, compact, cache):
+    if cache is None:
+        return read_skill_file(filepath, columns, compact)
+    df = cache.load(filepath, lambda path: read_skill_file(path, columns, compact), variant=_variant(columns, compact))
+    if compact:
+        # Cached text columns come back as plain objects.
+        for column in ("Occupation", "Code"):
+            if column in df and df[column].dtype != "category":
+                df[column] = df[column].astype("category")
+    return df
+
+
+def _skill_files(data_dir):
+    # (skill name, path) for every CSV file, in listing order.
+    return [(filename[:-4], os.path.join(data_dir, filename)) for filename in os.listdir(data_dir)
+            if filename.endswith(".csv")]
+
+
+class LazySkillData(Mapping):
+    """
+        A read-only dict of skill name -> DataFrame that parses each file the first time it is read.
+
+        Membership tests and iteration over the skill names never parse anything, so a query that
+        only touches three skills only pays for three files. Files that fail to parse are reported
+        once, recorded in 'errors' and then behave as missing skills.
+    """
+
+    def __init__(self, files, columns=SCORING_COLUMNS, compact=True, cache=None):
+        self.files = dict(files)
+        self.columns = columns
+        self.compact = compact
+        self.cache = cache
+        self.errors = {}
+        self._frames = {}
+        self._lock = threading.Lock()
+
+    def __getitem__(self, skill):
+        if skill in self._frames:
+            return self._frames[skill]
+        if skill not in self.files:
+            raise KeyError(skill)
+        with self._lock:
+            if skill not in self._frames:
+                try:
+                    self._frames[skill] = _load_one(self.files[skill], self.columns, self.compact, self.cache)
+                except Exception as e:
+                    print(f"Error loading data from {self.files[skill]}: {e}")
+                    self.errors[skill] = str(e)
+                    del self.files[skill]
+                    raise KeyError(skill) from e
+        return self._frames[skill]
+
+    def __contains__(self, skill):
+        return skill in self.files
+
+    def __iter__(self):
+        return iter(list(self.files))
+
+    def __len__(self):
+        return len(self.files)
+
+    def loaded(self):
+        """
+            Returns the names of the skills parsed so far.
+        """
+        return list(self._frames)
+
+
+def load_skill_directory(data_dir, workers=None, use_processes=False, columns=SCORING_COLUMNS, compact=True,
+                         lazy=False, cache=None):
+    """
+        Loads the skill CSV files of a directory concurrently, or lazily on first use.
+
+        Unlike load_and_preprocess_data, a file that fails to parse does not fail the whole load:
+        the error is printed and recorded, and the remaining skills are returned.
+        Args:
+            data_dir (str): The path to the directory containing the CSV files.
+            workers (int, optional): Pool size; defaults to the executor's own default.
+            use_processes (bool): Parse in a process pool instead of a thread pool.
+            columns (tuple): The columns to read, or None for all of them.
+            compact (bool): Use categorical Occupation/Code and float32 Skills Covered.
+            lazy (bool): Return a LazySkillData that parses each file on first access.
+            cache (SkillFileCache, optional): An on-disk cache of preprocessed files (thread pool only).
+        Returns:
+            tuple: A tuple containing:
+                - data (dict or LazySkillData): Skill name -> DataFrame. None if data_dir does not exist.
+                - soft_skills_list (list): The skill names that loaded (all of them in lazy mode).
+                - errors (dict): Skill name -> error message for files that failed.
+    """
+    try:
+        files = _skill_files(data_dir)
+    except FileNotFoundError:
+        print(f"Error: Directory not found: {data_dir}")
+        return None, None, {}
+
+    if lazy:
+        data = LazySkillData(files, columns, compact, cache)
+        return data, list(data), data.errors
+
+    if use_processes:
+        executor = ProcessPoolExecutor(max_workers=workers)
+        futures = [executor.submit(read_skill_file, path, columns, compact) for _, path in files]
+    else:
+        executor = ThreadPoolExecutor(max_workers=workers)
+        futures = [executor.submit(_load_one, path, columns, compact, cache) for _, path in files]
+
+    data = {}
+    errors = {}
+    with executor:
+        for (skill_name, path), future in zip(files, futures):
+            try:
+                data[skill_name] = future.result()
+            except Exception as e:
+                print(f"Error loading data from {path}: {e}")
+                errors[skill_name] = str(e)
+    return data, list(data), errors
@@ -0,0 +1,269 @@
+import argparse
+import os
+import posixpath
+import time
+import zipfile
+import xml.etree.ElementTree as ET
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import pandas as pd
+from data_cache import SkillFileCache
+
+MAIN_NS = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+REL_NS = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+PACKAGE_REL_NS = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+
+OCCUPATION_FILE = "OccupationData.xlsx"
+SKILLS_FILE = "Skills.xlsx"
+TECHNOLOGY_FILE = "TechnologySkills.xlsx"
+
+# The columns kept from each workbook; everything else is skipped while streaming.
+OCCUPATION_COLUMNS = ("O*NET-SOC Code", "Title")
+SKILLS_COLUMNS = ("O*NET-SOC Code", "Element ID", "Scale ID", "Data Value")
+TECHNOLOGY_COLUMNS = ("O*NET-SOC Code", "Commodity Code", "Commodity Title")
+
+# How each Skills.xlsx scale maps onto a 0-1 'Skills Covered' fraction.
+SCALE_RANGES = {"IM": (1.0, 5.0), "LV": (0.0, 7.0)}
+
+
+def _column_index(ref):
+    # 'AB12' -> 27
+    index = 0
+    for char in ref:
+        if not char.isalpha():
+            break
+        index = index * 26 + ord(char.upper()) - 64
+    return index - 1
+
+
+def _shared_strings(archive):
+    if "xl/sharedStrings.xml" not in archive.namelist():
+        return []
+    strings = []
+    with archive.open("xl/sharedStrings.xml") as f:
+        for _, element in ET.iterparse(f):
+            if element.tag == MAIN_NS + "si":
+                # Rich text splits a string over several <t> runs.
+                strings.append("".join(text.text or "" for text in element.iter(MAIN_NS + "t")))
+                element.clear()
+    return strings
+
+
+def _sheet_path(archive, sheet=None):
+    # The worksheet part for a sheet name, or the first sheet if None.
+    workbook = ET.fromstring(archive.read("xl/workbook.xml"))
+    sheets = workbook.find(MAIN_NS + "sheets")
+    chosen = None
+    for element in sheets:
+        if sheet is None or element.get("name") == sheet:
+            chosen = element.get(REL_NS + "id")
+            break
+    if chosen is None:
+        raise KeyError(f"No sheet named {sheet!r}")
+    rels = ET.fromstring(archive.read("xl/_rels/workbook.xml.rels"))
+    for rel in rels.iter(PACKAGE_REL_NS + "Relationship"):
+        if rel.get("Id") == chosen:
+            target = rel.get("Target")
+            return target.lstrip("/") if target.startswith("/") else posixpath.normpath(posixpath.join("xl", target))
+    raise KeyError(f"Sheet {sheet!r} has no worksheet part")
+
+
+def iter_xlsx_rows(path, sheet=None):
+    """
+        Streams the rows of one sheet of an .xlsx workbook without loading it.
+
+        The worksheet XML is read with iterparse and every row is cleared once yielded, so memory
+        does not grow with the sheet. Only the shared string table is held in memory. Uses only the
+        standard library (zipfile and ElementTree), so no Excel package is needed.
+        Args:
+            path (str): The workbook.
+            sheet (str, optional): The sheet name; defaults to the first sheet.
+        Yields:
+            list: The cell values of a row (str, float, or None for empty cells), header row first.
+    """
+    with zipfile.ZipFile(path) as archive:
+        strings = _shared_strings(archive)
+        with archive.open(_sheet_path(archive, sheet)) as f:
+            for _, element in ET.iterparse(f):
+                if element.tag != MAIN_NS + "row":
+                    continue
+                row = []
+                for cell in element.iter(MAIN_NS + "c"):
+                    ref = cell.get("r")
+                    if ref:
+                        row.extend([None] * (_column_index(ref) - len(row)))
+                    kind = cell.get("t")
+                    if kind == "inlineStr":
+                        value = "".join(text.text or "" for text in cell.iter(MAIN_NS + "t"))
+                    else:
+                        raw = cell.findtext(MAIN_NS + "v")
+                        if raw is None:
+                            value = None
+                        elif kind == "s":
+                            value = strings[int(raw)]
+                        elif kind in ("str", "e"):
+                            value = raw
+                        elif kind == "b":
+                            value = raw == "1"
+                        else:
+                            value = float(raw)
+                    row.append(value)
+                yield row
+                element.clear()
+
+
+def read_xlsx(path, columns=None, sheet=None):
+    """
+        Reads one sheet into a DataFrame, keeping only 'columns' (all if None) while streaming.
+        The first row is the header.
+    """
+    rows = iter_xlsx_rows(path, sheet)
+    header = next(rows, [])
+    wanted = [i for i, name in enumerate(header) if columns is None or name in columns]
+    values = {header[i]: [] for i in wanted}
+    for row in rows:
+        for i in wanted:
+            values[header[i]].append(row[i] if i < len(row) else None)
+    missing = set(columns or ()) - set(values)
+    if missing:
+        raise KeyError(f"{path} has no column(s) {sorted(missing)}")
+    return pd.DataFrame(values)
+
+
+def _read_occupations(path):
+    return read_xlsx(path, OCCUPATION_COLUMNS)
+
+
+def _read_skills(path):
+    return read_xlsx(path, SKILLS_COLUMNS)
+
+
+def _read_technology(path):
+    df = read_xlsx(path, TECHNOLOGY_COLUMNS)
+    # Commodity codes are numeric cells; key them as text like every other id.
+    df["Commodity Code"] = df["Commodity Code"].map(lambda code: None if code is None else str(int(code)))
+    return df.drop_duplicates(subset=["O*NET-SOC Code", "Commodity Code"])
+
+
+def _parse_sheets(jobs, cache, workers, use_processes):
+    # Parses (path, parse) jobs concurrently; threads go through the cache and hand misses to the pool.
+    pool = ProcessPoolExecutor(max_workers=workers) if use_processes else None
+
+    def parse(path, reader):
+        if pool is None:
+            return reader(path)
+        return pool.submit(reader, path).result()
+
+    def load(path, reader):
+        if cache is None:
+            return parse(path, reader)
+        return cache.load(path, lambda filepath: parse(filepath, reader), variant=f"onet:{reader.__name__}")
+
+    try:
+        with ThreadPoolExecutor(max_workers=len(jobs) or 1) as threads:
+            futures = [threads.submit(load, path, reader) for path, reader in jobs]
+            return [future.result() for future in futures]
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+
+def read_skill_names(filepath):
+    """
+        Returns {Element ID: Element Name} from skills-list.csv.
+    """
+    df = pd.read_csv(filepath, dtype=str)
+    return dict(zip(df["Element ID"], df["Element Name"]))
+
+
+def ingest_onet(docs_dir="docs/data", skills_list="skills-list.csv", cache=None, workers=None, use_processes=True,
+                scale="IM", technology=True):
+    """
+        Converts the O*NET workbooks into the skill dictionary the matcher scores against.
+
+        OccupationData.xlsx gives the occupation titles, Skills.xlsx one rating per occupation and
+        skill, and TechnologySkills.xlsx the technologies each occupation uses. Every workbook is
+        streamed in its own process (they are independent sheets) and, with a cache, stored in the
+        columnar cache after the first run so later runs do not touch Excel at all.
+        Args:
+            docs_dir (str): The directory holding the three workbooks.
+            skills_list (str, optional): skills-list.csv, for Element ID -> name.
+            cache (SkillFileCache, optional): The on-disk cache to keep parsed sheets in.
+            workers (int, optional): Process pool size.
+            use_processes (bool): Parse in a process pool; False parses in threads.
+            scale (str): The Skills.xlsx scale used as 'Skills Covered': 'IM' (importance, 1-5)
+                        or 'LV' (level, 0-7), rescaled to 0-1.
+            technology (bool): Also add one skill per technology commodity, covered 1.0 by every
+                        occupation that lists it.
+        Returns:
+            tuple: A tuple containing:
+                - data (dict): Skill key -> DataFrame with 'Occupation', 'Code' and 'Skills Covered'
+                            columns, like load_and_preprocess_data. Skills are keyed by Element ID and
+                            technologies by Commodity Code.
+                - skill_names (dict): Skill key -> Element Name or Commodity Title.
+    """
+    if scale not in SCALE_RANGES:
+        raise ValueError(f"Unknown scale {scale!r}, expected one of {sorted(SCALE_RANGES)}")
+    jobs = [(os.path.join(docs_dir, OCCUPATION_FILE), _read_occupations),
+            (os.path.join(docs_dir, SKILLS_FILE), _read_skills)]
+    if technology:
+        jobs.append((os.path.join(docs_dir, TECHNOLOGY_FILE), _read_technology))
+    frames = _parse_sheets(jobs, cache, workers, use_processes)
+    occupations, skills = frames[0], frames[1]
+    titles = dict(zip(occupations["O*NET-SOC Code"], occupations["Title"]))
+
+    skill_names = read_skill_names(skills_list) if skills_list and os.path.exists(skills_list) else {}
+    low, high = SCALE_RANGES[scale]
+    skills = skills[skills["Scale ID"] == scale]
+    covered = ((skills["Data Value"].astype(float) - low) / (high - low)).clip(0.0, 1.0)
+    long_form = [pd.DataFrame({"Skill": skills["Element ID"], "Code": skills["O*NET-SOC Code"], "Skills Covered": covered})]
+    for element_id in skills["Element ID"].unique():
+        skill_names.setdefault(element_id, element_id)
+
+    if technology:
+        tech = frames[2]
+        long_form.append(pd.DataFrame({"Skill": tech["Commodity Code"], "Code": tech["O*NET-SOC Code"],
+                                       "Skills Covered": 1.0}))
+        skill_names.update(zip(tech["Commodity Code"], tech["Commodity Title"]))
+
+    long_form = pd.concat(long_form, ignore_index=True)
+    # Codes missing from OccupationData keep the code as their title.
+    long_form["Occupation"] = long_form["Code"].map(titles).fillna(long_form["Code"])
+    data = {skill: group[["Occupation", "Code", "Skills Covered"]].reset_index(drop=True)
+            for skill, group in long_form.groupby("Skill", sort=False)}
+    return data, {skill: skill_names[skill] for skill in data}
+
+
+def main(argv=None):
+    """
+        Ingests the O*NET workbooks and reports what was loaded, optionally writing a snapshot.
+    """
+    parser = argparse.ArgumentParser(description="Convert the O*NET Excel workbooks for the career matcher.")
+    parser.add_argument("--docs-dir", default="docs/data", help="Directory containing the O*NET workbooks.")
+    parser.add_argument("--skills-list", default="skills-list.csv", help="CSV file of Element IDs and names.")
+    parser.add_argument("--cache-dir", default=".skills_cache", help="Directory for the parsed sheet cache.")
+    parser.add_argument("--workers", type=int, default=None, help="Number of parsing processes.")
+    parser.add_argument("--scale", choices=sorted(SCALE_RANGES), default="IM",
+                        help="Skills.xlsx scale to score with: IM (importance) or LV (level).")
+    parser.add_argument("--no-technology", action="store_true", help="Leave out TechnologySkills.xlsx.")
+    parser.add_argument("--snapshot", default=None, help="Also write a snapshot of the result to this file.")
+    args = parser.parse_args(argv)
+
+    cache = SkillFileCache(args.cache_dir) if args.cache_dir else None
+    start = time.perf_counter()
+    data, skill_names = ingest_onet(args.docs_dir, args.skills_list, cache=cache, workers=args.workers,
+                                    scale=args.scale, technology=not args.no_technology)
+    occupations = set()
+    for skill_df in data.values():
+        occupations.update(skill_df["Code"].tolist())
+    print(f"Ingested {len(data)} skills over {len(occupations)} occupations in {time.perf_counter() - start:.2f}s")
+    if cache is not None:
+        report = cache.report()
+        print(f"Cache: {report['hits']} hits, {report['misses']} misses")
+    if args.snapshot:
+        from snapshot import write_snapshot
+        write_snapshot(args.snapshot, data)
+        print(f"Wrote {args.snapshot}")
+
+
+if __name__ == "__main__":
+    main()
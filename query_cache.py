@@ -0,0 +1,105 @@
+import itertools
+import threading
+from collections import OrderedDict
+
+
+def normalize_skills(user_skills, valid_skills=None):
+    """
+        Returns the order-insensitive form of a skill list: the skills sorted, duplicates kept,
+        since calculate_overall_match counts a repeated skill once per mention.
+        Skills not in valid_skills are dropped when valid_skills is given.
+    """
+    if valid_skills is not None:
+        valid_skills = set(valid_skills)
+        user_skills = [skill for skill in user_skills if skill in valid_skills]
+    return tuple(sorted(user_skills))
+
+
+class QueryCache:
+    """
+        Bounded LRU cache of recommendation results keyed on (normalized skills, num_recommendations).
+
+        Results are computed from the normalized skill list, so 'listening, social' and
+        'social, listening' share one entry. 'generation' is called on every lookup; when the
+        value it returns changes (e.g. because the data was reloaded) the cache empties itself
+        before answering, so stale results are never served.
+        Args:
+            compute (callable): Called as compute(skills, num_recommendations) on a miss, where
+                        skills is a normalized tuple.
+            maxsize (int): The maximum number of cached results; least recently used go first.
+            generation (callable, optional): Returns a token identifying the current data.
+    """
+
+    def __init__(self, compute, maxsize=1024, generation=None):
+        self.compute = compute
+        self.maxsize = maxsize
+        self.generation = generation or (lambda: None)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._generation = self.generation()
+        self._lock = threading.Lock()
+
+    def _check_generation(self):
+        current = self.generation()
+        if current != self._generation:
+            self._entries.clear()
+            self._generation = current
+
+    def get(self, user_skills, num_recommendations=10):
+        """
+            Returns the cached result for a skill list, computing and storing it on a miss.
+        """
+        key = (normalize_skills(user_skills), num_recommendations)
+        with self._lock:
+            self._check_generation()
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+            generation = self._generation
+
+        # Compute outside the lock so concurrent misses for different keys do not serialize.
+        result = self.compute(key[0], num_recommendations)
+        with self._lock:
+            self._check_generation()
+            if self._generation == generation and self.maxsize > 0:
+                self._entries[key] = result
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+                    self.evictions += 1
+        return result
+
+    def warm(self, skills, max_size, num_recommendations=10):
+        """
+            Precomputes every combination of up to max_size skills from 'skills'.
+            Returns the number of combinations computed.
+        """
+        computed = 0
+        for size in range(1, max_size + 1):
+            for combination in itertools.combinations(sorted(set(skills)), size):
+                key = (combination, num_recommendations)
+                with self._lock:
+                    self._check_generation()
+                    cached = key in self._entries
+                if not cached:
+                    self.get(combination, num_recommendations)
+                    computed += 1
+        return computed
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """
+            Returns the hit/miss/eviction counters and current size as a dictionary.
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions,
+                    "size": len(self._entries), "maxsize": self.maxsize,
+                    "hit_rate": self.hits / lookups if lookups else None}
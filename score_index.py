@@ -0,0 +1,452 @@
+import itertools
+import numpy as np
+
+
+def _union(row_sets):
+    # Sorted union of sorted row arrays.
+    if not row_sets:
+        return np.empty(0, dtype=np.int64)
+    return np.unique(np.concatenate(row_sets))
+
+
+def _group_rows(keys, valid):
+    # {key: sorted rows with that key} over the rows where 'valid' is set.
+    rows = np.flatnonzero(valid)
+    keys = keys[rows]
+    order = np.argsort(keys, kind='stable')
+    rows, keys = rows[order], keys[order]
+    starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]]) if len(keys) else np.empty(0, dtype=np.int64)
+    ends = np.r_[starts[1:], len(keys)]
+    return {keys[start].item(): rows[start:end] for start, end in zip(starts.tolist(), ends.tolist())}
+
+
+def top_k_rows(scores, k=None):
+    """
+        Returns the positions of the k highest scores, best first.
+
+        Ties keep their original order, so the result is always the first k entries of a stable
+        descending sort. np.partition finds the k-th best score in O(n); only entries at least
+        that good are then sorted. With k=None every position is returned in sorted order.
+    """
+    n = len(scores)
+    if k is None or k >= n:
+        return np.argsort(-scores, kind='stable')
+    if k <= 0:
+        return np.empty(0, dtype=np.int64)
+    negated = -scores
+    kth = np.partition(negated, k - 1)[k - 1]
+    # Keep every entry tied with the k-th score so the stable sort can pick among them by position.
+    candidates = np.flatnonzero(negated <= kth)
+    return candidates[np.argsort(negated[candidates], kind='stable')[:k]]
+
+
+class ScoreIndex:
+    """
+        Dense occupation x skill view of the loaded soft skills data.
+
+        Each row is an occupation and each column is a soft skill. The 'scores' matrix holds the
+        Skills Covered value of the first row for that occupation in the skill's DataFrame (0 where
+        the occupation is not listed), and 'code_ids' holds the matching Code as an index into
+        'codes' (-1 where the occupation is not listed). 'code' is the aligned per-occupation code
+        vector, taken from the first skill that lists the occupation, and 'job_zone' the occupation's
+        Job Zone from the first skill file that gives one (-1 if none does). 'zone_ids' holds the
+        Job Zone per skill column, like 'code_ids', so 'job_zone' can be recomputed when a column
+        is replaced or removed; it is None for an index loaded with a precomputed 'job_zone'.
+        Built once with ScoreIndex.from_data() so scoring is a column select instead of
+        DataFrame filtering per occupation.
+    """
+
+    def __init__(self, occupations, skills, scores, code_ids, codes, code=None, job_zone=None, zone_ids=None):
+        self.occupations = list(occupations)
+        self.skills = list(skills)
+        self.scores = scores
+        self.code_ids = code_ids
+        self.codes = list(codes)
+        self.occupation_rows = {occupation: row for row, occupation in enumerate(self.occupations)}
+        self.skill_columns = {skill: column for column, skill in enumerate(self.skills)}
+        self.code_lookup = {code: i for i, code in enumerate(self.codes)}
+        self.zone_ids = zone_ids
+        self.job_zone = np.full(len(self.occupations), -1, dtype=np.int8) if job_zone is None else job_zone
+        if code is None:
+            self._refresh_code()
+        else:
+            # A precomputed code vector, e.g. from a snapshot.
+            self.code = code
+            self._row_sets = {}
+
+    def _refresh_code(self):
+        # First known code and Job Zone for every occupation, following the skill column order.
+        # The cached filter row sets depend on them, so they are dropped too.
+        self._row_sets = {}
+        self.code = np.full(len(self.occupations), -1, dtype=np.int32)
+        for column in range(len(self.skills)):
+            missing = self.code < 0
+            self.code[missing] = self.code_ids[missing, column]
+        if self.zone_ids is not None:
+            self.job_zone = np.full(len(self.occupations), -1, dtype=np.int8)
+            for column in range(len(self.skills)):
+                missing = self.job_zone < 0
+                self.job_zone[missing] = self.zone_ids[missing, column]
+
+    @classmethod
+    def from_data(cls, data, occupations=None):
+        """
+            Builds the index from the dictionary returned by load_and_preprocess_data.
+            Args:
+                data (dict): A dictionary where keys are skill names and values are pandas DataFrames,
+                            containing 'Occupation', 'Code', and 'Skills Covered' columns.
+                occupations (iterable, optional): Row order for the index, e.g. G.nodes(). Defaults to
+                            every occupation in 'data' in order of first appearance.
+            Returns:
+                ScoreIndex: The populated index.
+        """
+        skills = list(data)
+        if occupations is None:
+            occupations = {}
+            for skill_df in data.values():
+                occupations.update(dict.fromkeys(skill_df['Occupation'].tolist()))
+        occupations = list(occupations)
+
+        index = cls(occupations, skills, np.zeros((len(occupations), len(skills)), dtype=np.float64),
+                    np.full((len(occupations), len(skills)), -1, dtype=np.int32), [],
+                    zone_ids=np.full((len(occupations), len(skills)), -1, dtype=np.int8))
+        for column, skill in enumerate(skills):
+            index._fill_column(column, data[skill])
+        index._refresh_code()
+        return index
+
+    def _fill_column(self, column, skill_df):
+        # Only the first row of an occupation counts, the same as .iloc[0] on a filtered frame.
+        skill_df = skill_df.drop_duplicates(subset='Occupation', keep='first')
+        rows = self.rows_for(skill_df['Occupation'].tolist())
+        known = rows >= 0
+        rows = rows[known]
+        covered = skill_df['Skills Covered'].to_numpy()
+        if covered.dtype == np.float32:
+            # Compact frames hold float32 fractions; rounding drops the float32 error so they score
+            # exactly like the float64 values of load_and_preprocess_data (e.g. 0.11, not 0.11000000437).
+            covered = np.round(covered.astype(np.float64), 6)
+        self.scores[rows, column] = covered.astype(np.float64)[known]
+
+        skill_codes = skill_df['Code'].tolist()
+        ids = np.empty(len(skill_codes), dtype=np.int32)
+        for i, code in enumerate(skill_codes):
+            if code not in self.code_lookup:
+                self.code_lookup[code] = len(self.codes)
+                self.codes.append(code)
+            ids[i] = self.code_lookup[code]
+        self.code_ids[rows, column] = ids[known]
+
+        if 'Job Zone' in skill_df and self.zone_ids is not None:
+            # _refresh_code() then takes the first skill file giving an occupation's Job Zone.
+            zones = skill_df['Job Zone'].to_numpy(dtype=np.float64, na_value=np.nan)[known]
+            self.zone_ids[rows, column] = np.where(np.isnan(zones), -1, zones)
+
+    def set_column(self, skill, skill_df):
+        """
+            Adds or replaces one skill's column in place, appending rows for occupations the index
+            does not know yet. Other columns are left untouched.
+        """
+        new_occupations = [occupation for occupation in dict.fromkeys(skill_df['Occupation'].tolist())
+                           if occupation not in self.occupation_rows]
+        if new_occupations:
+            for occupation in new_occupations:
+                self.occupation_rows[occupation] = len(self.occupations)
+                self.occupations.append(occupation)
+            extra = len(new_occupations)
+            self.scores = np.vstack([self.scores, np.zeros((extra, len(self.skills)), dtype=self.scores.dtype)])
+            self.job_zone = np.concatenate([self.job_zone, np.full(extra, -1, dtype=np.int8)])
+            self.code_ids = np.vstack([self.code_ids, np.full((extra, len(self.skills)), -1, dtype=np.int32)])
+            if self.zone_ids is not None:
+                self.zone_ids = np.vstack([self.zone_ids, np.full((extra, len(self.skills)), -1, dtype=np.int8)])
+
+        if skill in self.skill_columns:
+            column = self.skill_columns[skill]
+            self.scores[:, column] = 0
+            self.code_ids[:, column] = -1
+            if self.zone_ids is not None:
+                self.zone_ids[:, column] = -1
+        else:
+            column = len(self.skills)
+            self.skill_columns[skill] = column
+            self.skills.append(skill)
+            self.scores = np.hstack([self.scores, np.zeros((len(self.occupations), 1), dtype=self.scores.dtype)])
+            self.code_ids = np.hstack([self.code_ids, np.full((len(self.occupations), 1), -1, dtype=np.int32)])
+            if self.zone_ids is not None:
+                self.zone_ids = np.hstack([self.zone_ids, np.full((len(self.occupations), 1), -1, dtype=np.int8)])
+
+        self._fill_column(column, skill_df)
+        self._refresh_code()
+
+    def remove_column(self, skill):
+        """
+            Removes one skill's column; rows are kept (see remove_rows()).
+        """
+        column = self.skill_columns.pop(skill)
+        del self.skills[column]
+        self.scores = np.delete(self.scores, column, axis=1)
+        self.code_ids = np.delete(self.code_ids, column, axis=1)
+        if self.zone_ids is not None:
+            self.zone_ids = np.delete(self.zone_ids, column, axis=1)
+        self.skill_columns = {name: i for i, name in enumerate(self.skills)}
+        self._refresh_code()
+
+    def remove_rows(self, occupations):
+        """
+            Removes the rows of occupations that no skill lists any more.
+        """
+        drop = self.rows_for(occupations)
+        drop = drop[drop >= 0]
+        if not len(drop):
+            return
+        keep = np.setdiff1d(np.arange(len(self.occupations)), drop)
+        self.occupations = [self.occupations[row] for row in keep.tolist()]
+        self.scores = self.scores[keep]
+        self.code_ids = self.code_ids[keep]
+        self.job_zone = self.job_zone[keep]
+        if self.zone_ids is not None:
+            self.zone_ids = self.zone_ids[keep]
+        self.occupation_rows = {occupation: row for row, occupation in enumerate(self.occupations)}
+        self._refresh_code()
+
+    def rows_for(self, occupations):
+        """
+            Maps occupation names to index rows, using -1 for occupations the index does not know.
+        """
+        return np.array([self.occupation_rows.get(occupation, -1) for occupation in occupations], dtype=np.int64)
+
+    def columns_for(self, user_skills):
+        """
+            Maps user skills to index columns in the order given, dropping unknown skills.
+            Duplicated skills are kept so they are weighted the same way as in the per-row loop.
+        """
+        return [self.skill_columns[skill] for skill in user_skills if skill in self.skill_columns]
+
+    def check_weights(self, weights):
+        """
+            Raises ValueError if a weight is negative or names a skill the index does not have, so
+            a misspelled skill is reported instead of silently weighing nothing.
+        """
+        if any(weight < 0 for weight in weights.values()):
+            raise ValueError("Skill weights must not be negative")
+        unknown = [skill for skill in weights if skill not in self.skill_columns]
+        if unknown:
+            raise ValueError(f"Unknown skill(s) in weights: {', '.join(map(str, unknown))}")
+
+    def match(self, user_skills, rows=None, weights=None):
+        """
+            Scores occupations against a list of user skills.
+            Args:
+                user_skills (list): A list of soft skills provided by the user.
+                rows (np.ndarray, optional): Index rows to score, -1 for an unknown occupation.
+                            Defaults to every row of the index.
+                weights (dict, optional): Skill -> importance weight (default 1 for skills not listed).
+                            The score becomes the weighted average; skills weighted 0 are ignored.
+                            See check_weights().
+            Returns:
+                tuple: A tuple containing:
+                    - scores (np.ndarray): The average Skills Covered value per row (0 for a missing skill).
+                    - code_ids (np.ndarray): The code of the first user skill listing the occupation,
+                                as an index into 'codes', or -1 if none does.
+        """
+        if rows is None:
+            rows = np.arange(len(self.occupations))
+        known = rows >= 0
+        safe_rows = np.where(known, rows, 0)
+        if weights is None:
+            columns = self.columns_for(user_skills)
+            column_weights = None
+        else:
+            self.check_weights(weights)
+            weighted = [(self.skill_columns[skill], float(weights.get(skill, 1.0))) for skill in user_skills
+                        if skill in self.skill_columns and weights.get(skill, 1.0) != 0]
+            columns = [column for column, _ in weighted]
+            column_weights = [weight for _, weight in weighted]
+
+        scores = np.zeros(len(rows), dtype=np.float64)
+        code_ids = np.full(len(rows), -1, dtype=np.int32)
+        if not columns or not len(self.occupations):
+            return scores, code_ids
+
+        # Add the columns one at a time, in user order, so the sums match sum() over the per-occupation list.
+        for i, column in enumerate(columns):
+            values = np.where(known, self.scores[safe_rows, column], 0.0)
+            scores += values if column_weights is None else column_weights[i] * values
+            missing = code_ids < 0
+            code_ids[missing] = np.where(known, self.code_ids[safe_rows, column], -1)[missing]
+        scores /= len(columns) if column_weights is None else sum(column_weights)
+        return scores, code_ids
+
+    def rank(self, user_skills, occupations=None, top_k=None, weights=None, job_zones=None, code_prefixes=None):
+        """
+            Ranks occupations for a user, best first; the scoring behind calculate_overall_match.
+
+            Only the index arrays are used, so callers holding an index (e.g. from a snapshot) can
+            score without pandas or networkx.
+            Args:
+                user_skills (list): A list of soft skills provided by the user.
+                occupations (list, optional): The occupations to rank, in tie-breaking order;
+                            defaults to every row of the index. Unknown occupations score 0.
+                top_k (int, optional): Only return the top_k best occupations.
+                weights (dict, optional): Skill -> importance weight; see match().
+                job_zones (int or tuple, optional): See filter_rows().
+                code_prefixes (str or list, optional): See filter_rows().
+            Returns:
+                list: (occupation, (score, code)) tuples, the format of calculate_overall_match.
+        """
+        if occupations is None:
+            occupations = self.occupations
+        # No name lookups when ranking the index's own occupations.
+        rows = np.arange(len(occupations)) if occupations == self.occupations else self.rows_for(occupations)
+        if job_zones is not None or code_prefixes is not None:
+            allowed = np.zeros(len(self.occupations), dtype=bool)
+            allowed[self.filter_rows(job_zones, code_prefixes)] = True
+            positions = np.flatnonzero((rows >= 0) & allowed[np.where(rows >= 0, rows, 0)])
+            occupations = [occupations[i] for i in positions.tolist()]
+            rows = rows[positions]
+        scores, code_ids = self.match(user_skills, rows, weights)
+
+        # Ties keep 'occupations' order, the same as sorted(..., reverse=True), with or without top_k.
+        order = top_k_rows(scores, top_k)
+        return [(occupations[i], (float(scores[i]), self.code_value(code_ids[i]))) for i in order.tolist()]
+
+    def filter_rows(self, job_zones=None, code_prefixes=None):
+        """
+            Returns the rows whose Job Zone and code pass the filters, for scoring only those rows.
+
+            Row sets per Job Zone and per SOC major group (the first three characters of the code,
+            e.g. '47-') are built on first use and cached, so a filter is a union and intersection
+            of precomputed arrays rather than a scan of every occupation. Longer prefixes such as
+            '29-11' only scan their major group. Occupations with no Job Zone or code are excluded
+            by the corresponding filter.
+            Args:
+                job_zones (int or tuple, optional): A Job Zone, or an inclusive (low, high) range.
+                code_prefixes (str or list, optional): One or more code prefixes.
+            Returns:
+                np.ndarray: The sorted int64 rows; every row when both filters are None.
+        """
+        rows = None
+        if job_zones is not None:
+            low, high = (job_zones, job_zones) if np.isscalar(job_zones) else job_zones
+            zones = self._cached_groups("job_zone")
+            rows = _union([zone_rows for zone, zone_rows in zones.items() if low <= zone <= high])
+        if code_prefixes is not None:
+            if isinstance(code_prefixes, str):
+                code_prefixes = [code_prefixes]
+            prefix_rows = _union([self._prefix_rows(prefix) for prefix in code_prefixes])
+            rows = prefix_rows if rows is None else np.intersect1d(rows, prefix_rows, assume_unique=True)
+        return np.arange(len(self.occupations)) if rows is None else rows
+
+    def _cached_groups(self, kind):
+        # {Job Zone: rows} or {major group: rows}, built once per index state.
+        if kind not in self._row_sets:
+            if kind == "job_zone":
+                self._row_sets[kind] = _group_rows(self.job_zone, self.job_zone >= 0)
+            else:
+                major_ids = {}
+                code_major = np.array([major_ids.setdefault(str(code)[:3], len(major_ids)) for code in self.codes]
+                                      + [-1], dtype=np.int64)
+                # code == -1 picks the trailing -1 entry.
+                groups = _group_rows(code_major[self.code], self.code >= 0)
+                names = {i: major for major, i in major_ids.items()}
+                self._row_sets[kind] = {names[i]: rows for i, rows in groups.items()}
+        return self._row_sets[kind]
+
+    def _prefix_rows(self, prefix):
+        key = ("prefix", prefix)
+        if key not in self._row_sets:
+            majors = self._cached_groups("major_group")
+            candidates = _union([rows for major, rows in majors.items()
+                                 if major.startswith(prefix) or prefix.startswith(major)])
+            if len(prefix) > 3:
+                matching = np.array([str(code).startswith(prefix) for code in self.codes], dtype=bool)
+                candidates = candidates[matching[self.code[candidates]]]
+            self._row_sets[key] = candidates
+        return self._row_sets[key]
+
+    def code_value(self, code_id):
+        """
+            Returns the code for a code id, or None for -1.
+        """
+        return self.codes[code_id] if code_id >= 0 else None
+
+    def profile_matrix(self, profiles):
+        """
+            Converts user skill profiles to a profiles x skills count matrix.
+            Args:
+                profiles: Either a list of skill lists or an np.ndarray of shape (profiles, skills)
+                            whose columns follow self.skills (e.g. a 0/1 matrix).
+            Returns:
+                np.ndarray: A float64 matrix of how often each profile lists each skill.
+        """
+        if isinstance(profiles, np.ndarray) or (len(profiles) and not isinstance(profiles[0], (list, tuple, set))):
+            matrix = np.asarray(profiles, dtype=np.float64)
+            if matrix.ndim != 2 or matrix.shape[1] != len(self.skills):
+                raise ValueError(f"Expected a (profiles, {len(self.skills)}) matrix, got shape {matrix.shape}")
+            return matrix
+        matrix = np.zeros((len(profiles), len(self.skills)), dtype=np.float64)
+        for i, user_skills in enumerate(profiles):
+            for column in self.columns_for(user_skills):
+                matrix[i, column] += 1
+        return matrix
+
+    def iter_top_k(self, profiles, k=10, chunk_size=1024, rows=None, weights=None):
+        """
+            Yields the top-k careers for each of many user skill profiles, in input order.
+
+            Profiles are scored chunk_size at a time with one matrix product against the score
+            matrix, so memory stays at chunk_size x occupations floats however many profiles
+            there are. 'profiles' may be any iterable of skill lists or rows of a 0/1 matrix.
+            Scores match calculate_overall_match up to floating point rounding.
+            Args:
+                profiles (iterable): User skill lists, or np.ndarray rows whose columns follow self.skills.
+                k (int): The number of careers to return per profile.
+                chunk_size (int): The number of profiles scored per matrix product.
+                rows (np.ndarray, optional): Only rank these rows, e.g. from filter_rows(); only
+                            they are multiplied, so narrow filters are proportionally cheaper.
+                weights (dict, optional): Skill -> importance weight applied to every profile; see match().
+            Yields:
+                list: Tuples of (occupation, score, code) for one profile, best first.
+        """
+        profiles = iter(profiles)
+        matrix = self.scores if rows is None else self.scores[rows]
+        column_weights = None
+        if weights is not None:
+            self.check_weights(weights)
+            column_weights = np.ones(len(self.skills), dtype=np.float64)
+            for skill, weight in weights.items():
+                column_weights[self.skill_columns[skill]] = weight
+        while True:
+            chunk = list(itertools.islice(profiles, chunk_size))
+            if not chunk:
+                return
+            counts = self.profile_matrix(chunk)
+            if column_weights is not None:
+                counts = counts * column_weights
+            totals = counts.sum(axis=1)
+            scores = counts @ matrix.T
+            np.divide(scores, totals[:, None], out=scores, where=totals[:, None] > 0)
+            for i, profile in enumerate(chunk):
+                if isinstance(profile, (list, tuple, set)):
+                    columns = self.columns_for(profile)
+                    if column_weights is not None:
+                        columns = [column for column in columns if column_weights[column] != 0]
+                else:
+                    columns = np.flatnonzero(counts[i]).tolist()
+                best = top_k_rows(scores[i], k)
+                yield [(self.occupations[row], float(score), self._first_code(row, columns))
+                       for row, score in zip((best if rows is None else rows[best]).tolist(), scores[i, best].tolist())]
+
+    def top_k_batch(self, profiles, k=10, chunk_size=1024, rows=None, weights=None):
+        """
+            Returns the top-k careers for every profile as a list; see iter_top_k().
+        """
+        return list(self.iter_top_k(profiles, k=k, chunk_size=chunk_size, rows=rows, weights=weights))
+
+    def _first_code(self, row, columns):
+        # The code of the first skill, in profile order, that lists the occupation.
+        for column in columns:
+            code_id = self.code_ids[row, column]
+            if code_id >= 0:
+                return self.codes[code_id]
+        return None
@@ -0,0 +1,342 @@
+import argparse
+import asyncio
+import json
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from data_cache import SkillFileCache
+from instrumentation import instrumentation
+from query_cache import QueryCache
+from score_index import ScoreIndex
+from skills import calculate_overall_match, create_career_network, load_and_preprocess_data, recommend_careers
+
+MAX_BODY_BYTES = 1 << 20
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+           413: "Payload Too Large", 500: "Internal Server Error"}
+
+
+class ServiceState:
+    """
+        One consistent version of the service's data, network, index and generation. It is never
+        modified after construction; reload() builds a new one and swaps it in with one assignment.
+    """
+
+    def __init__(self, data, soft_skills_list, G, index, generation):
+        self.data = data
+        self.soft_skills_list = list(soft_skills_list)
+        self.G = G
+        self.index = index
+        self.generation = generation
+
+
+class RecommendationService:
+    """
+        Holds the loaded data, career network and score index so every request reuses them.
+
+        Results are memoized per sorted skill list (duplicates kept) in a QueryCache, which is emptied
+        automatically whenever reload() swaps in new data. Requests read the current
+        ServiceState once, so a request running during a reload uses either the old or the new
+        data, never a mix of the two.
+        Args:
+            data (dict): The skill DataFrames returned by load_and_preprocess_data.
+            soft_skills_list (list): The skill names returned by load_and_preprocess_data.
+            cache_size (int): The number of results to memoize (0 disables the cache).
+    """
+
+    def __init__(self, data, soft_skills_list, cache_size=1024):
+        self.state = None
+        self._reload_lock = threading.Lock()
+        self.reload(data, soft_skills_list)
+        self.cache = QueryCache(self._compute, maxsize=cache_size, generation=lambda: self.state.generation)
+
+    @property
+    def data(self):
+        return self.state.data
+
+    @property
+    def soft_skills_list(self):
+        return self.state.soft_skills_list
+
+    @property
+    def G(self):
+        return self.state.G
+
+    @property
+    def index(self):
+        return self.state.index
+
+    @property
+    def generation(self):
+        return self.state.generation
+
+    @classmethod
+    def from_directory(cls, data_dir, cache_dir=None, cache_size=1024):
+        """
+            Loads the CSV files in data_dir (through the cache when cache_dir is given).
+        """
+        cache = SkillFileCache(cache_dir) if cache_dir else None
+        data, soft_skills_list = load_and_preprocess_data(data_dir, cache=cache)
+        if data is None:
+            raise RuntimeError(f"Failed to load data from {data_dir}")
+        return cls(data, soft_skills_list, cache_size=cache_size)
+
+    def reload(self, data, soft_skills_list):
+        """
+            Replaces the data and rebuilds the network and index; cached results are dropped.
+        """
+        G = create_career_network(data)
+        index = ScoreIndex.from_data(data, occupations=G.nodes())
+        with self._reload_lock:
+            generation = self.state.generation + 1 if self.state is not None else 1
+            self.state = ServiceState(data, soft_skills_list, G, index, generation)
+
+    def _compute(self, user_skills, num_recommendations):
+        state = self.state
+        ranked_careers = calculate_overall_match(state.G, list(user_skills), state.data, index=state.index,
+                                                 top_k=num_recommendations)
+        return recommend_careers(ranked_careers, num_recommendations)
+
+    def warm(self, max_size, num_recommendations=10):
+        """
+            Precomputes the results for every combination of up to max_size skills.
+        """
+        return self.cache.warm(self.soft_skills_list, max_size, num_recommendations)
+
+    def recommend(self, user_skills, num_recommendations=10):
+        """
+            Returns the recommendations for one request as a JSON-ready dictionary.
+            Unknown skills are dropped, the same way main() validates its input, and the rest
+            are looked up in sorted order, so a repeated skill counts once per mention as it does in
+            calculate_overall_match.
+        """
+        soft_skills_list = self.state.soft_skills_list
+        valid_skills = [skill for skill in user_skills if skill in soft_skills_list]
+        top_careers = self.cache.get(valid_skills, num_recommendations)
+        return {
+            "skills": valid_skills,
+            "ignored": [skill for skill in user_skills if skill not in soft_skills_list],
+            "recommendations": [{"occupation": career, "code": code, "score": score}
+                                for career, score, code in top_careers],
+        }
+
+
+class LatencyMetrics:
+    """
+        Request counters plus a window of the most recent scoring latencies.
+    """
+
+    def __init__(self, window=10000):
+        self.started = time.time()
+        self.requests = 0
+        self.errors = 0
+        self.in_flight = 0
+        self.latencies = deque(maxlen=window)
+        self.lock = threading.Lock()
+
+    def record(self, seconds=None, error=False):
+        # seconds=None counts a request that was never scored (e.g. a malformed body) without
+        # adding a latency sample, so rejected requests do not drag the percentiles down.
+        with self.lock:
+            self.requests += 1
+            self.errors += int(error)
+            if seconds is not None:
+                self.latencies.append(seconds)
+
+    def snapshot(self):
+        with self.lock:
+            latencies = np.array(self.latencies, dtype=np.float64) * 1000
+            snapshot = {"uptime_s": round(time.time() - self.started, 3), "requests": self.requests,
+                        "errors": self.errors, "in_flight": self.in_flight}
+        if len(latencies):
+            p50, p95, p99 = np.percentile(latencies, [50, 95, 99])
+            snapshot["latency_ms"] = {"mean": float(latencies.mean()), "p50": float(p50), "p95": float(p95),
+                                      "p99": float(p99), "max": float(latencies.max()), "window": len(latencies)}
+        return snapshot
+
+
+class RecommendationServer:
+    """
+        A small asyncio HTTP/1.1 server answering JSON recommendation requests.
+
+        Routes:
+            GET  /health     - readiness and catalog size.
+            GET  /metrics    - request counts and scoring latency percentiles, plus per-stage
+                               timings when instrumentation is enabled.
+            GET  /metrics/prometheus - the per-stage timings in Prometheus text format.
+            POST /recommend  - body {"skills": [...], "num_recommendations": 10}.
+        Scoring runs in a thread pool so slow requests do not block the event loop.
+        Args:
+            service (RecommendationService): The preloaded data to answer from.
+            workers (int): The number of scoring threads.
+    """
+
+    def __init__(self, service, workers=4):
+        self.service = service
+        self.metrics = LatencyMetrics()
+        self.executor = ThreadPoolExecutor(max_workers=workers)
+        self.server = None
+
+    async def start(self, host="127.0.0.1", port=8000, unix_path=None):
+        """
+            Starts listening on a TCP port (0 picks a free one) or a Unix socket path.
+            Returns the bound port, or the socket path.
+        """
+        if unix_path:
+            self.server = await asyncio.start_unix_server(self._handle_connection, path=unix_path)
+            return unix_path
+        self.server = await asyncio.start_server(self._handle_connection, host, port)
+        return self.server.sockets[0].getsockname()[1]
+
+    async def close(self):
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+        self.executor.shutdown(wait=False)
+
+    async def _handle_connection(self, reader, writer):
+        try:
+            while True:
+                request = await self._read_request(reader)
+                if request is None:
+                    break
+                method, path, headers, body = request
+                status, payload = await self._dispatch(method, path, body)
+                keep_alive = headers.get("connection", "").lower() != "close"
+                self._write_response(writer, status, payload, keep_alive)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except ValueError as e:
+            self._write_response(writer, 413 if "too large" in str(e) else 400, {"error": str(e)}, False)
+        finally:
+            writer.close()
+
+    async def _read_request(self, reader):
+        request_line = await reader.readline()
+        if not request_line.strip():
+            return None
+        try:
+            method, path, _ = request_line.decode("latin-1").split(" ", 2)
+        except ValueError:
+            raise ValueError("Malformed request line")
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        length = int(headers.get("content-length", 0) or 0)
+        if length > MAX_BODY_BYTES:
+            raise ValueError("Request body too large")
+        body = await reader.readexactly(length) if length else b""
+        return method.upper(), path.split("?", 1)[0], headers, body
+
+    async def _dispatch(self, method, path, body):
+        if path == "/health":
+            return 200, {"status": "ok", "occupations": len(self.service.index.occupations),
+                         "skills": self.service.soft_skills_list}
+        if path == "/metrics":
+            metrics = dict(self.metrics.snapshot(), query_cache=self.service.cache.stats())
+            if instrumentation.enabled:
+                metrics["stages"] = instrumentation.snapshot()
+            return 200, metrics
+        if path == "/metrics/prometheus":
+            return 200, instrumentation.to_prometheus()
+        if path != "/recommend":
+            return 404, {"error": f"Unknown path {path}"}
+        if method != "POST":
+            return 405, {"error": "Use POST for /recommend"}
+
+        try:
+            request = json.loads(body or b"{}")
+            user_skills = request["skills"]
+            num_recommendations = int(request.get("num_recommendations", 10))
+            if isinstance(user_skills, str):
+                user_skills = [skill.strip() for skill in user_skills.split(",")]
+            if not isinstance(user_skills, list) or not all(isinstance(skill, str) for skill in user_skills):
+                raise TypeError("'skills' must be a list of strings")
+            if num_recommendations < 1:
+                raise ValueError("'num_recommendations' must be at least 1")
+        except (ValueError, KeyError, TypeError, AttributeError) as e:
+            self.metrics.record(error=True)
+            return 400, {"error": f"Expected a JSON body with a 'skills' list: {e}"}
+
+        loop = asyncio.get_running_loop()
+        start = time.perf_counter()
+        self.metrics.in_flight += 1
+        try:
+            result = await loop.run_in_executor(self.executor, self.service.recommend, user_skills,
+                                                num_recommendations)
+        except Exception as e:
+            self.metrics.record(time.perf_counter() - start, error=True)
+            return 500, {"error": str(e)}
+        finally:
+            self.metrics.in_flight -= 1
+        self.metrics.record(time.perf_counter() - start)
+        return 200, result
+
+    @staticmethod
+    def _write_response(writer, status, payload, keep_alive):
+        # Strings are sent as plain text, everything else as JSON.
+        if isinstance(payload, str):
+            body, content_type = payload.encode(), "text/plain; version=0.0.4"
+        else:
+            body, content_type = json.dumps(payload).encode(), "application/json"
+        head = (f"HTTP/1.1 {status} {REASONS[status]}\r\n"
+                f"Content-Type: {content_type}\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+        writer.write(head.encode("latin-1") + body)
+
+
+async def serve(service, host, port, unix_path=None, workers=4):
+    """
+        Runs a RecommendationServer until cancelled.
+    """
+    server = RecommendationServer(service, workers=workers)
+    bound = await server.start(host, port, unix_path)
+    print(f"Serving {len(service.index.occupations)} occupations on {bound}")
+    try:
+        await server.server.serve_forever()
+    finally:
+        await server.close()
+
+
+def main(argv=None):
+    """
+        Loads the data once and serves recommendations until interrupted.
+    """
+    parser = argparse.ArgumentParser(description="Serve career recommendations over HTTP.")
+    parser.add_argument("--data-dir", default="data/softskills", help="Directory containing the soft skill CSV files.")
+    parser.add_argument("--cache-dir", default=None, help="Directory for the preprocessed data cache.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--unix", default=None, help="Listen on this Unix socket path instead of TCP.")
+    parser.add_argument("--workers", type=int, default=4, help="Number of scoring threads.")
+    parser.add_argument("--query-cache-size", type=int, default=1024,
+                        help="Number of recommendation results to memoize (0 disables).")
+    parser.add_argument("--warm", type=int, default=0,
+                        help="Precompute every skill combination up to this size at startup.")
+    parser.add_argument("--instrument", action="store_true",
+                        help="Record per-stage timings and report them under /metrics.")
+    args = parser.parse_args(argv)
+
+    if args.instrument:
+        instrumentation.enable()
+
+    service = RecommendationService.from_directory(args.data_dir, args.cache_dir, args.query_cache_size)
+    if args.warm:
+        print(f"Warmed {service.warm(args.warm)} skill combinations")
+    try:
+        asyncio.run(serve(service, args.host, args.port, args.unix, args.workers))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
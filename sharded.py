@@ -0,0 +1,106 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+import numpy as np
+from score_index import top_k_rows
+
+# Score matrix views attached in each worker process by _attach().
+_worker_arrays = {}
+
+
+def _share(array):
+    # Copies an array into a new shared memory block; returns (block, descriptor for workers).
+    block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+    np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[...] = array
+    return block, (block.name, array.shape, array.dtype.str)
+
+
+def _attach(descriptors):
+    # Worker initializer: map the shared blocks without copying them.
+    for key, (name, shape, dtype) in descriptors.items():
+        # Pool workers share the parent's resource tracker, so attaching does not add a second owner.
+        block = shared_memory.SharedMemory(name=name)
+        _worker_arrays[key] = (block, np.ndarray(shape, dtype=np.dtype(dtype), buffer=block.buf))
+
+
+def _score_shard(lo, hi, columns, k):
+    # Scores rows lo:hi exactly like ScoreIndex.match and returns the shard's local top-k.
+    scores_matrix = _worker_arrays["scores"][1]
+    code_matrix = _worker_arrays["code_ids"][1]
+    scores = np.zeros(hi - lo, dtype=np.float64)
+    code_ids = np.full(hi - lo, -1, dtype=np.int32)
+    for column in columns:
+        scores += scores_matrix[lo:hi, column]
+        missing = code_ids < 0
+        code_ids[missing] = code_matrix[lo:hi, column][missing]
+    if columns:
+        scores /= len(columns)
+    best = top_k_rows(scores, k)
+    return best + lo, scores[best], code_ids[best]
+
+
+class ShardedScorer:
+    """
+        Scores one query across a process pool, each worker handling a contiguous shard of occupations.
+
+        The score and code matrices are copied once into shared memory and mapped by every worker,
+        so tasks only carry the skill columns and shard bounds. Each shard returns its local top-k
+        and the parent merges them. Shards are contiguous and merged in order with a stable sort,
+        so results, ties included, are identical to calculate_overall_match with the same index.
+        Args:
+            index (ScoreIndex): The index to score against (e.g. built with occupations=G.nodes()).
+            workers (int, optional): Number of worker processes; defaults to os.cpu_count().
+            shards (int, optional): Number of shards; defaults to one per worker.
+    """
+
+    def __init__(self, index, workers=None, shards=None):
+        self.index = index
+        self.workers = workers or os.cpu_count() or 1
+        n = len(index.occupations)
+        bounds = np.linspace(0, n, min(shards or self.workers, max(n, 1)) + 1).astype(int)
+        self.shards = [(int(lo), int(hi)) for lo, hi in zip(bounds[:-1], bounds[1:]) if hi > lo]
+
+        self._blocks = []
+        descriptors = {}
+        for key, array in (("scores", index.scores), ("code_ids", index.code_ids)):
+            block, descriptors[key] = _share(np.ascontiguousarray(array))
+            self._blocks.append(block)
+        self.pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_attach, initargs=(descriptors,))
+
+    def match(self, user_skills, top_k=None):
+        """
+            Returns the top_k (all if None) rows as (rows, scores, code_ids) arrays, best first.
+        """
+        columns = self.index.columns_for(user_skills)
+        k = len(self.index.occupations) if top_k is None else top_k
+        futures = [self.pool.submit(_score_shard, lo, hi, columns, k) for lo, hi in self.shards]
+        parts = [future.result() for future in futures]
+        if not parts:
+            return np.empty(0, dtype=np.int64), np.empty(0), np.empty(0, dtype=np.int32)
+        rows, scores, code_ids = (np.concatenate(arrays) for arrays in zip(*parts))
+        best = top_k_rows(scores, top_k)
+        return rows[best], scores[best], code_ids[best]
+
+    def rank(self, user_skills, top_k=None):
+        """
+            Returns the ranked careers in the format of calculate_overall_match.
+        """
+        rows, scores, code_ids = self.match(user_skills, top_k)
+        return [(self.index.occupations[row], (float(score), self.index.code_value(code_id)))
+                for row, score, code_id in zip(rows.tolist(), scores.tolist(), code_ids.tolist())]
+
+    def close(self):
+        """
+            Stops the workers and releases the shared memory.
+        """
+        self.pool.shutdown()
+        for block in self._blocks:
+            block.close()
+            block.unlink()
+        self._blocks = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,187 @@
+import numpy as np
+from score_index import top_k_rows
+
+METRICS = ("cosine", "l2")
+
+
+class SimilarityIndex:
+    """
+        Nearest-occupation search over skill profiles: each occupation is the vector of its
+        Skills Covered values across the skill columns of a ScoreIndex.
+
+        Exact search scores every occupation with one matrix-vector product. Approximate search
+        first partitions the occupations with k-means (build_partitions()) and then only scores the
+        n_probe partitions whose centroids are closest to the query, an inverted-file layout. Raising
+        n_probe trades latency for recall; n_probe equal to the number of partitions is exact.
+        For cosine the vectors are normalized up front, so cosine ranking is L2 ranking on the
+        unit sphere and the same partitions serve both. Cosine is undefined for an all-zero
+        vector, so occupations with no skills are never returned and an all-zero query (e.g. no
+        known skills) returns nothing.
+        Args:
+            occupations (list): The occupation of every row.
+            skills (list): The skill of every column.
+            vectors (np.ndarray): occupations x skills matrix of Skills Covered values.
+            metric (str): 'cosine' (higher is more similar) or 'l2' (lower is more similar).
+    """
+
+    def __init__(self, occupations, skills, vectors, metric="cosine"):
+        if metric not in METRICS:
+            raise ValueError(f"Unknown metric {metric!r}, expected one of {METRICS}")
+        self.occupations = list(occupations)
+        self.skills = list(skills)
+        self.occupation_rows = {occupation: row for row, occupation in enumerate(self.occupations)}
+        self.skill_columns = {skill: column for column, skill in enumerate(self.skills)}
+        self.metric = metric
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if metric == "cosine":
+            vectors = self._normalize(vectors)
+        self.vectors = np.ascontiguousarray(vectors)
+        self.squared_norms = np.einsum('ij,ij->i', self.vectors, self.vectors)
+        self.centroids = None
+        self.list_offsets = None
+        self.list_rows = None
+
+    @classmethod
+    def from_score_index(cls, index, metric="cosine"):
+        """
+            Builds the index from a ScoreIndex's score matrix.
+        """
+        return cls(index.occupations, index.skills, index.scores, metric=metric)
+
+    @staticmethod
+    def _normalize(vectors):
+        norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+        return np.divide(vectors, norms, out=np.zeros_like(vectors), where=norms > 0)
+
+    def user_vector(self, user_skills, weights=None):
+        """
+            Returns the query vector for a user: 1 (or the skill's weight) for every listed skill.
+            Unknown skills are ignored.
+        """
+        vector = np.zeros(len(self.skills), dtype=np.float32)
+        for skill in user_skills:
+            if skill in self.skill_columns:
+                vector[self.skill_columns[skill]] = 1.0 if weights is None else weights.get(skill, 1.0)
+        return vector
+
+    def _distances(self, rows, query):
+        # Squared L2 distance from the query to 'rows' (all rows if None); lower is closer.
+        vectors = self.vectors if rows is None else self.vectors[rows]
+        norms = self.squared_norms if rows is None else self.squared_norms[rows]
+        return norms - 2 * (vectors @ query) + query @ query
+
+    def build_partitions(self, n_lists=None, iterations=10, sample_size=100000, seed=0, chunk_size=65536):
+        """
+            Clusters the occupations with k-means into n_lists partitions for approximate search.
+            Centroids are trained on at most sample_size rows and every row is then assigned in
+            chunks, so memory stays bounded for large catalogs.
+            Args:
+                n_lists (int, optional): The number of partitions; defaults to sqrt(occupations).
+                iterations (int): k-means iterations.
+                sample_size (int): Rows used to train the centroids.
+                seed (int): Seed for the sample and the initial centroids.
+            Returns:
+                SimilarityIndex: self, for chaining.
+        """
+        n = len(self.occupations)
+        n_lists = max(1, min(n_lists or int(np.sqrt(n)), n))
+        rng = np.random.default_rng(seed)
+        sample = self.vectors[rng.choice(n, size=min(n, sample_size), replace=False)] if n else self.vectors
+        centroids = sample[rng.choice(len(sample), size=n_lists, replace=False)].copy() if n else sample[:0]
+        for _ in range(iterations):
+            assignment = self._assign(sample, centroids, chunk_size)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assignment, sample)
+            counts = np.bincount(assignment, minlength=n_lists)
+            # Empty clusters keep their previous centroid.
+            filled = counts > 0
+            centroids[filled] = sums[filled] / counts[filled, None]
+
+        assignment = self._assign(self.vectors, centroids, chunk_size)
+        self.centroids = centroids
+        self.list_rows = np.argsort(assignment, kind='stable')
+        self.list_offsets = np.zeros(n_lists + 1, dtype=np.int64)
+        np.cumsum(np.bincount(assignment, minlength=n_lists), out=self.list_offsets[1:])
+        return self
+
+    @staticmethod
+    def _assign(vectors, centroids, chunk_size):
+        # Nearest centroid of every vector, computed chunk_size rows at a time.
+        centroid_norms = np.einsum('ij,ij->i', centroids, centroids)
+        assignment = np.empty(len(vectors), dtype=np.int64)
+        for start in range(0, len(vectors), chunk_size):
+            chunk = vectors[start:start + chunk_size]
+            assignment[start:start + chunk_size] = np.argmin(centroid_norms - 2 * (chunk @ centroids.T), axis=1)
+        return assignment
+
+    def _candidates(self, query, n_probe):
+        # Rows of the n_probe partitions closest to the query, in row order.
+        centroid_distances = np.einsum('ij,ij->i', self.centroids, self.centroids) - 2 * (self.centroids @ query)
+        probes = top_k_rows(-centroid_distances, n_probe)
+        rows = np.concatenate([self.list_rows[self.list_offsets[p]:self.list_offsets[p + 1]] for p in probes.tolist()]
+                              + [np.empty(0, dtype=np.int64)])
+        return np.sort(rows)
+
+    def search(self, query, k=10, n_probe=None, exclude=None):
+        """
+            Returns the k rows nearest to a query vector.
+            Args:
+                query (np.ndarray): A vector with one value per skill column.
+                k (int): The number of results.
+                n_probe (int, optional): Approximate search over this many partitions (needs
+                            build_partitions()); None searches every occupation exactly.
+                exclude (int, optional): A row to leave out, e.g. the query occupation itself.
+            Returns:
+                tuple: (rows, scores) arrays, best first. Scores are cosine similarities for
+                    'cosine' and Euclidean distances for 'l2'. Ties keep row order.
+        """
+        query = np.asarray(query, dtype=np.float32)
+        if self.metric == "cosine":
+            if not np.any(query):
+                return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64)
+            query = self._normalize(query)
+        if n_probe is None or self.centroids is None:
+            rows = None
+        else:
+            rows = self._candidates(query, n_probe)
+        distances = self._distances(rows, query)
+        if self.metric == "cosine":
+            # Zero rows stay zero after normalization; they have no direction to compare.
+            norms = self.squared_norms if rows is None else self.squared_norms[rows]
+            distances[norms == 0] = np.inf
+        if exclude is not None:
+            distances[(np.arange(len(self.occupations)) if rows is None else rows) == exclude] = np.inf
+        best = top_k_rows(-distances, k)
+        best = best[np.isfinite(distances[best])]
+        distances = np.maximum(distances[best], 0.0)
+        rows = best if rows is None else rows[best]
+        # On unit vectors |a - b|^2 = 2 - 2 cos(a, b).
+        scores = 1.0 - distances / 2 if self.metric == "cosine" else np.sqrt(distances)
+        return rows, scores.astype(np.float64)
+
+    def similar_to_user(self, user_skills, k=10, n_probe=None, weights=None):
+        """
+            Returns the k occupations whose skill profile is closest to the user's skills,
+            as (occupation, score) pairs.
+        """
+        rows, scores = self.search(self.user_vector(user_skills, weights), k, n_probe)
+        return [(self.occupations[row], score) for row, score in zip(rows.tolist(), scores.tolist())]
+
+    def similar_to_occupation(self, occupation, k=10, n_probe=None):
+        """
+            Returns the k occupations with the skill profile closest to 'occupation' (excluding
+            itself), as (occupation, score) pairs.
+        """
+        row = self.occupation_rows[occupation]
+        rows, scores = self.search(self.vectors[row], k, n_probe, exclude=row)
+        return [(self.occupations[r], score) for r, score in zip(rows.tolist(), scores.tolist())]
+
+    def recall(self, queries, k=10, n_probe=1):
+        """
+            Returns the mean fraction of the exact top k that approximate search with n_probe finds,
+            for tuning n_probe.
+        """
+        expected = max(min(k, len(self.occupations)), 1)
+        found = [len(np.intersect1d(self.search(query, k)[0], self.search(query, k, n_probe)[0])) / expected
+                 for query in queries]
+        return float(np.mean(found)) if found else None
@@ -1,14 +1,36 @@
-import pandas as pd
-import networkx as nx
+import numpy as np
 import os
-from prettytable import PrettyTable
+import argparse
+import functools
+from batch import run_batch
+from instrumentation import instrumentation, profile
+from score_index import ScoreIndex
 
-def load_and_preprocess_data(data_dir):
+# pandas, networkx and prettytable are imported inside the functions that use them, so
+# `import skills` and scoring against a snapshot's ScoreIndex never load them.
+
+def _read_skill_csv(filepath):
+    """
+        Reads one skill CSV file and cleans the 'Skills Covered' column to be a numeric fraction.
+    """
+    import pandas as pd
+
+    df = pd.read_csv(filepath)
+
+    # Clean the Skills Covered, and convert it to a numeric
+    df['Skills Covered'] = df['Skills Covered'].astype(str).str.replace('%', '', regex=False).astype(float) / 100
+    return df
+
+@instrumentation.timed("load")
+def load_and_preprocess_data(data_dir, cache=None):
     """
         Loads and preprocesses CSV files from a specified directory, extracting skill names
         and cleaning the 'Skills Covered' column to be a numeric representation.
         Args:
             data_dir (str): The path to the directory containing the CSV files.
+            cache (SkillFileCache, optional): An on-disk cache of preprocessed files. Files whose
+                        size/mtime (or content hash) are unchanged are read from the cache instead of
+                        being parsed; its 'hits' and 'misses' record what happened to each file.
         Returns:
             tuple: A tuple containing:
                 - data (dict): A dictionary where keys are skill names (extracted from filenames)
@@ -22,22 +44,24 @@ def load_and_preprocess_data(data_dir):
     data = {}
     soft_skills_list = []
     try:
-        for filename in os.listdir(data_dir):
+        filenames = os.listdir(data_dir)
+    except FileNotFoundError:
+        print(f"Error: Directory not found: {data_dir}")
+        return None, None
+    try:
+        for filename in filenames:
             if filename.endswith(".csv"):
                 # Remove ".csv" to get skill name
                 # The skill name is the filename without the extension
                 #[dmega]
                 skill_name = filename[:-4]
                 filepath = os.path.join(data_dir, filename)
-                df = pd.read_csv(filepath)
-
-                # Clean the Skills Covered, and convert it to a numeric
-                df['Skills Covered'] = df['Skills Covered'].astype(str).str.replace('%', '', regex=False).astype(float) / 100
+                if cache is not None:
+                    df = cache.load(filepath, _read_skill_csv)
+                else:
+                    df = _read_skill_csv(filepath)
                 data[skill_name] = df
                 soft_skills_list.append(skill_name)
-    except FileNotFoundError:
-        print(f"Error: Directory not found: {data_dir}")
-        return None, None
     except Exception as e:
         print(f"Error loading data from {data_dir}: {e}")
         return None, None
@@ -47,6 +71,7 @@ def load_and_preprocess_data(data_dir):
     # [dmega]
     return data, soft_skills_list
 
+@instrumentation.timed("graph")
 def create_career_network(data):
     """
         Creates a career network graph linking occupations based on shared codes.
@@ -64,6 +89,9 @@ def create_career_network(data):
         [dmega]
     """
 
+    import networkx as nx
+    from compact_network import shared_code_pairs
+
     # Creates a career network graph, linking Occupations based on shared skills.
     G = nx.Graph()
 
@@ -80,24 +108,21 @@ def create_career_network(data):
         G.add_node(occupation)
 
     # 2. Add edges between Occupations sharing a Code
-    #    This is the core logic for creating the network structure.  It iterates through all
-    #    skills and connects occupations that share a code, creating an edge between them.
-    # [dmega] Remove the loop in line 105.
-    # In the second loop after that (line 113) add an if before line 116 that checks if  G.nodes[occupation]['skills'] is already initialized and if not, set it to empty list.
-    # [kdnelso7]
+    #    Within each skill, every pair of rows with the same Code becomes an edge. The pairs are
+    #    generated as integer node id arrays (a self-join on Code done with numpy) instead of a
+    #    double loop per code group; pairs from all skills are then deduplicated and bulk-added.
+    nodes = list(G.nodes())
+    node_ids = {occupation: i for i, occupation in enumerate(nodes)}
+    edge_keys = [np.empty(0, dtype=np.int64)]
     for skill, skill_df in data.items():
-        # Group by Code within the same skill to find occupations sharing a code
-        code_groups = skill_df.groupby('Code')['Occupation'].apply(list)
-        for code, occupations in code_groups.items():
-            # Create edges between all pairs of occupations sharing this code
-            for i in range(len(occupations)):
-                for j in range(i + 1, len(occupations)):
-                    occ1 = occupations[i]
-                    occ2 = occupations[j]
-                    if occ1 in G.nodes() and occ2 in G.nodes():
-                        if not G.has_edge(occ1, occ2):
-                            G.add_edge(occ1, occ2)
+        edge_keys.append(shared_code_pairs(skill_df, node_ids))
+
+    # Each undirected edge is encoded as smaller_id * n + larger_id, so np.unique dedupes them.
+    edges = np.unique(np.concatenate(edge_keys))
+    n = max(len(nodes), 1)
+    G.add_edges_from(zip([nodes[a] for a in (edges // n).tolist()], [nodes[b] for b in (edges % n).tolist()]))
 
+    for skill, skill_df in data.items():
         # Populate the 'skills' attribute for each occupation (AFTER creating edges)
         #Append each skill to the dataframe.
         for occupation in skill_df['Occupation'].unique():
@@ -108,67 +133,72 @@ def create_career_network(data):
 
     return G
 
-def calculate_overall_match(G, user_skills, data):
+@instrumentation.timed("score")
+def calculate_overall_match(G, user_skills, data, index=None, top_k=None, weights=None, job_zones=None,
+                            code_prefixes=None):
     """
         Calculates overall match scores for each occupation based on user-provided skills and Skills Covered values.
 
-        This function iterates through each occupation in the graph, calculates a weighted score
-        based on the user's selected skills and the corresponding Skills Covered values,
-        and then ranks the occupations based on these scores.
+        This function scores each occupation in the graph with a weighted score based on the
+        user's selected skills and the corresponding Skills Covered values, read from a dense
+        occupation x skill ScoreIndex, and then ranks the occupations based on these scores.
         Args:
             G (nx.Graph): The career network graph.
             user_skills (list): A list of soft skills provided by the user.
             data (dict): A dictionary where keys are skill names and values are pandas DataFrames,
                         containing 'Occupation', 'Code', and 'Skills Covered' columns.
+            index (ScoreIndex, optional): A prebuilt score index for 'data'. Build it once with
+                        ScoreIndex.from_data() and reuse it across queries; if omitted one is built here
+                        from the user's skills only.
+            top_k (int, optional): Only return the top_k best occupations. They are picked with a
+                        partial selection instead of sorting every occupation. The full ranked list
+                        is only built when top_k is None (the default).
+            weights (dict, optional): Skill -> importance weight; the score becomes the weighted
+                        average of the user's skills. Skills not listed weigh 1. Raises ValueError
+                        for a negative weight or a skill that is not in 'data'.
+            job_zones (int or tuple, optional): Only rank occupations in this Job Zone, or inclusive
+                        (low, high) range of Job Zones.
+            code_prefixes (str or list, optional): Only rank occupations whose code starts with one
+                        of these prefixes, e.g. '47-' for a SOC major group.
+                        Filters are applied before scoring, from row sets the index keeps per Job Zone
+                        and per major group, so narrow queries only score the occupations they keep.
+                        Without 'index', a filter builds the index from every skill in 'data'.
         Returns:
             list: A list of tuples, where each tuple contains:
                 - occupation (str): The name of the occupation.
                 - (average_weighted_score, code_value) (tuple):
                     - average_weighted_score (float): The calculated average weighted score for the occupation.
                     - code_value (str): The code associated with the occupation (taken from the first matching skill).
-            The list is sorted in descending order based on the average weighted score.
+            The list is sorted in descending order based on the average weighted score, and holds
+            at most 'top_k' elements when 'top_k' is given. Occupations removed by a filter are left out.
         [kdnelso7]
     """
 
-    # {occupation: (weighted score, code)}
-    occupation_scores = {}
-
-    # Collect relevant Skills Covered values, considering only user-specified skills:
-    # Iterates through each user-provided skill and, if the occupation is associated with that skill
-    # in the loaded data, retrieves the Skills Covered value. If the occupation does not have
-    # a Skills Covered value for a given skill, a default value of 0 is used to handle missing data.
-    # [kdnelso7]
-    for occupation in G.nodes():
-        skill_values = []
-        code_value = None
-
-        # Iterate through each skill provided by the user to find the Skills Covered value for the current occupation.
-        # [kdnelso7]
-        for skill in user_skills:
-            if skill in data:
-                #Get the skill data frame
-                skill_df = data[skill]
-                if occupation in skill_df['Occupation'].values:
-                    skill_row = skill_df[skill_df['Occupation'] == occupation].iloc[0]
-                    skills_covered = skill_row['Skills Covered']
-                    skill_values.append(skills_covered)
-                    code = skill_row['Code']
-                    if code_value is None:
-                        code_value = code
-                else:
-                    skill_values.append(0)
-
-        # Calculate the average score for the occupation based on the user-provided skills.
-        # If no Skills Covered values are found, the average is set to 0.
-        # [kdnelso7]
-        average_weighted_score = sum(skill_values) / len(skill_values) if skill_values else 0
-        occupation_scores[occupation] = (average_weighted_score, code_value)
-
-    # Sort the occupations based on the average weighted score in descending order.
-    ranked_careers = sorted(occupation_scores.items(), key=lambda item: item[1][0], reverse=True)
+    if index is None and (job_zones is not None or code_prefixes is not None):
+        # An occupation's Job Zone and code may come from any skill file, so filtering needs all of
+        # them, the same as a prebuilt index would have.
+        index = ScoreIndex.from_data(data, occupations=G.nodes())
+    elif index is None:
+        # Only the user's skills are needed, so lazily loaded data only parses those files.
+        user_data = {skill: data.get(skill) for skill in dict.fromkeys(user_skills)}
+        index = ScoreIndex.from_data({skill: skill_df for skill, skill_df in user_data.items() if skill_df is not None},
+                                     occupations=G.nodes())
+        if weights is not None:
+            # This index only has the user's skills; check the weights against every skill instead.
+            unknown = [skill for skill in weights if skill not in data]
+            if unknown:
+                raise ValueError(f"Unknown skill(s) in weights: {', '.join(map(str, unknown))}")
+            weights = {skill: weight for skill, weight in weights.items() if skill in index.skill_columns}
+
+    # Score every occupation in the graph with one column select per user skill:
+    # Occupations missing from a skill's data count as 0, and the code comes from the
+    # first user skill that lists the occupation. Ties keep graph order.
+    ranked_careers = index.rank(user_skills, list(G.nodes()), top_k=top_k, weights=weights,
+                                job_zones=job_zones, code_prefixes=code_prefixes)
 
     return ranked_careers
 
+@instrumentation.timed("recommend")
 def recommend_careers(ranked_careers, num_recommendations=10):
     """
         Recommends the top N careers from a ranked list, based on their overall match scores.
@@ -201,7 +231,82 @@ def recommend_careers(ranked_careers, num_recommendations=10):
         top_careers.append((career, score, code))
     return top_careers
 
-def main():
+def _job_zones(value):
+    # '3' -> 3, '2-4' -> (2, 4)
+    try:
+        if "-" in value:
+            low, high = value.split("-", 1)
+            return int(low), int(high)
+        return int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid Job Zone {value!r}, expected e.g. 3 or 2-4") from None
+
+def _weight(value):
+    # 'Coordination=2' -> ('Coordination', 2.0)
+    skill, _, weight = value.rpartition("=")
+    try:
+        weight = float(weight)
+    except ValueError:
+        weight = None
+    if not skill.strip() or weight is None or not 0 <= weight < float("inf"):
+        raise argparse.ArgumentTypeError(f"invalid weight {value!r}, expected SKILL=WEIGHT with a finite WEIGHT >= 0")
+    return skill.strip(), weight
+
+def _positive_int(value):
+    # '10' -> 10; counts such as --chunk-size must be at least 1
+    try:
+        number = int(value)
+    except ValueError:
+        number = 0
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"invalid count {value!r}, expected an integer >= 1")
+    return number
+
+def parse_args(argv=None):
+    """
+        Parses the command line options for main().
+    """
+    parser = argparse.ArgumentParser(description="Recommend careers from your soft skills.")
+    parser.add_argument("--data-dir", default="data/softskills",
+                        help="Directory containing the soft skill CSV files.")
+    parser.add_argument("--cache-dir", default=None,
+                        help="Directory for the preprocessed data cache (disabled if not given).")
+    parser.add_argument("--rebuild-cache", action="store_true",
+                        help="Reparse every CSV file and rewrite the cache.")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Parse the CSV files concurrently with this many threads, reading only the "
+                             "scoring columns with compact dtypes and skipping files that fail to parse.")
+    parser.add_argument("--num-recommendations", type=_positive_int, default=10,
+                        help="Number of careers to recommend.")
+    parser.add_argument("--job-zone", type=_job_zones, default=None, metavar="ZONE",
+                        help="Only recommend careers in this Job Zone, or range of Job Zones such as 2-4.")
+    parser.add_argument("--code-prefix", action="append", default=None, metavar="PREFIX",
+                        help="Only recommend careers whose code starts with PREFIX, e.g. 29- or 15-12 "
+                             "(may be repeated).")
+    parser.add_argument("--weight", action="append", type=_weight, default=[], metavar="SKILL=WEIGHT",
+                        help="Weigh a skill in the average match score (default 1; may be repeated).")
+    parser.add_argument("--batch", metavar="INPUT", default=None,
+                        help="Score every profile in a CSV (user_id, skills) or JSONL file instead of prompting.")
+    parser.add_argument("--output", default=None,
+                        help="Batch mode: .csv or .jsonl file to write recommendations to.")
+    parser.add_argument("--chunk-size", type=_positive_int, default=1024,
+                        help="Batch mode: number of profiles scored at a time.")
+    parser.add_argument("--snapshot", default=None,
+                        help="Load the data, network and index from this snapshot file (see snapshot.py), "
+                             "falling back to --data-dir if it is missing, invalid or out of date.")
+    parser.add_argument("--metrics-output", default=None,
+                        help="Record per-stage timings and write them to this file on exit "
+                             "(Prometheus text for .prom/.txt, JSON otherwise).")
+    parser.add_argument("--track-memory", action="store_true",
+                        help="With --metrics-output, also record peak memory per stage (slower).")
+    parser.add_argument("--profile", action="store_true",
+                        help="Run the recommendation request under cProfile and print the slowest calls.")
+    args = parser.parse_args(argv)
+    if args.batch and not args.output:
+        parser.error("--batch requires --output")
+    return args
+
+def main(argv=None):
     """
         Drives the career recommendation process by orchestrating data loading, network creation,
         skill matching, and presentation of results.
@@ -214,19 +319,80 @@ def main():
         5. Calculates overall match scores for each occupation based on the user's skills.
         6. Recommends the top careers based on the calculated scores.
         7. Presents the results in a formatted table.
+        With --batch, steps 2-7 are replaced by streaming every profile in a file through
+        run_batch() and writing the recommendations to --output.
         [kdnelso7]
     """
-    data_dir = "data/softskills"
-    data, soft_skills_list = load_and_preprocess_data(data_dir)
+    args = parse_args(argv)
+    if args.metrics_output:
+        instrumentation.enable(track_memory=args.track_memory)
+    try:
+        _run(args)
+    finally:
+        if args.metrics_output:
+            instrumentation.dump(args.metrics_output)
+            instrumentation.disable()
+
+def _run(args):
+    """
+        The body of main() for parsed arguments.
+    """
+    snapshot = cache = None
+    if args.snapshot:
+        # A valid snapshot replaces CSV parsing, graph building and indexing; otherwise fall back to the CSVs.
+        from snapshot import load_snapshot_or_data
+        with instrumentation.stage("load"):
+            snapshot, loaded = load_snapshot_or_data(args.snapshot, args.data_dir)
+        data, soft_skills_list = loaded if snapshot is None else ({}, snapshot.soft_skills_list)
+    else:
+        from data_cache import SkillFileCache
+        from loader import load_skill_directory
+        cache = SkillFileCache(args.cache_dir, rebuild=args.rebuild_cache) if args.cache_dir else None
+        if args.workers:
+            data, soft_skills_list, _ = load_skill_directory(args.data_dir, workers=args.workers, cache=cache)
+        else:
+            data, soft_skills_list = load_and_preprocess_data(args.data_dir, cache=cache)
 
     if data is None:
         print("Failed to load data. Exiting.")
         return
 
-    G = create_career_network(data)
+    if cache is not None:
+        report = cache.report()
+        print(f"Cache: {report['hits']} hits, {report['misses']} misses")
+
+    # Weights name skills by file name, e.g. criticalthinking; a typo would otherwise weigh nothing.
+    unknown_weights = [skill for skill, _ in args.weight if skill not in soft_skills_list]
+    if unknown_weights:
+        print(f"Unknown skill(s) in --weight: {', '.join(unknown_weights)}. "
+              f"Valid skills: {', '.join(soft_skills_list)}")
+        return
+
+    if args.batch:
+        # Batch scoring only needs the score index, not the career network.
+        index = snapshot.index if snapshot is not None else ScoreIndex.from_data(data)
+        stats = run_batch(index, soft_skills_list, args.batch, args.output,
+                          args.num_recommendations, args.chunk_size,
+                          weights=dict(args.weight) or None, job_zones=args.job_zone,
+                          code_prefixes=args.code_prefix)
+        print(f"Wrote recommendations for {stats['profiles']} profiles to {args.output} "
+              f"in {stats['seconds']:.2f}s")
+        return
 
-    print("Number of nodes:", G.number_of_nodes())
-    print("Number of edges:", G.number_of_edges())
+    options = dict(top_k=args.num_recommendations, weights=dict(args.weight) or None,
+                   job_zones=args.job_zone, code_prefixes=args.code_prefix)
+    if snapshot is not None:
+        # The snapshot's index rows are already in network order, so it ranks without building an nx.Graph.
+        network = snapshot.network
+        score = instrumentation.timed("score")(snapshot.index.rank)
+    else:
+        network = G = create_career_network(data)
+        with instrumentation.stage("index"):
+            options["index"] = ScoreIndex.from_data(data, occupations=G.nodes())
+        score = functools.partial(calculate_overall_match, G, data=data)
+
+    print("Number of nodes:", network.number_of_nodes())
+    print("Number of edges:", network.number_of_edges())
 
     # Get user input for skills
     print(f"Enter your soft skills (comma-separated, e.g., {', '.join(soft_skills_list)}):")
@@ -237,15 +403,22 @@ def main():
     valid_skills = soft_skills_list
     user_skills = [skill for skill in user_skills if skill in valid_skills]
 
-    ranked_careers = calculate_overall_match(G, user_skills, data)
+    # Only the careers that will be shown are ranked.
+    num_recommendations = args.num_recommendations
+    if args.profile:
+        ranked_careers, report = profile(score, user_skills, **options)
+        print(report)
+    else:
+        ranked_careers = score(user_skills, **options)
 
     if not ranked_careers:
         print("No matching careers found.")
         return
 
-    recommended_careers = recommend_careers(ranked_careers)
+    recommended_careers = recommend_careers(ranked_careers, num_recommendations)
 
     # Create a PrettyTable object
+    from prettytable import PrettyTable
     table = PrettyTable()
     table.field_names = ["Occupation", "Code", "Avg. Skills Covered"]
 
@@ -0,0 +1,279 @@
+import argparse
+import hashlib
+import json
+import mmap
+import os
+import struct
+import tempfile
+import time
+import zlib
+import numpy as np
+from compact_network import CompactNetwork, Vocabulary
+from score_index import ScoreIndex
+
+# Bump when the layout changes; older snapshots are then rejected and rebuilt from CSV.
+SNAPSHOT_VERSION = 2
+MAGIC = b"CNSNAP\x00\x01"
+# magic, version, header crc32, header length
+PREAMBLE = struct.Struct("<8sIIQ")
+ALIGNMENT = 64
+
+
+class SnapshotError(Exception):
+    """
+        Raised when a snapshot file is missing, corrupt, from another version or out of date.
+    """
+
+
+def source_fingerprint(data_dir):
+    """
+        Returns {filename: [size, mtime_ns]} for the CSV files in data_dir, to detect stale snapshots.
+    """
+    fingerprint = {}
+    for filename in sorted(os.listdir(data_dir)):
+        if filename.endswith(".csv"):
+            stat = os.stat(os.path.join(data_dir, filename))
+            fingerprint[filename] = [stat.st_size, stat.st_mtime_ns]
+    return fingerprint
+
+
+def _align(offset):
+    return -(-offset // ALIGNMENT) * ALIGNMENT
+
+
+def write_snapshot(path, data, data_dir=None):
+    """
+        Serializes everything needed to serve recommendations into one versioned binary file.
+
+        The file starts with a fixed preamble (magic, version, header checksum and length) and a
+        JSON header holding the vocabulary, the layout of every array and a sha256 of the array
+        payload. The arrays follow, each 64-byte aligned, so load_snapshot() can map them in place.
+        Args:
+            path (str): The file to write; it is replaced atomically.
+            data (dict): The skill DataFrames returned by load_and_preprocess_data.
+            data_dir (str, optional): The directory 'data' came from; its file sizes and mtimes are
+                        recorded so a stale snapshot can be detected on load.
+        Returns:
+            dict: The header that was written.
+    """
+    vocab = Vocabulary.from_data(data)
+    network = CompactNetwork.from_data(data, vocab)
+    index = ScoreIndex.from_data(data, occupations=vocab.occupations)
+    arrays = {
+        "scores": index.scores,
+        "code_ids": index.code_ids,
+        "code": index.code,
+        "job_zone": index.job_zone,
+        "occupation_code": network.occupation_code,
+        "skill_bits": network.skill_bits,
+        "indptr": network.indptr,
+        "indices": network.indices,
+    }
+
+    layout = {}
+    offset = 0
+    for name, array in arrays.items():
+        offset = _align(offset)
+        layout[name] = {"dtype": array.dtype.str, "shape": list(array.shape), "offset": offset}
+        offset += array.nbytes
+    payload = bytearray(offset)
+    for name, array in arrays.items():
+        start = layout[name]["offset"]
+        payload[start:start + array.nbytes] = np.ascontiguousarray(array).tobytes()
+
+    header = {
+        "version": SNAPSHOT_VERSION,
+        "created": time.time(),
+        "occupations": vocab.occupations,
+        "codes": vocab.codes,
+        "skills": vocab.skills,
+        "index_codes": index.codes,
+        "arrays": layout,
+        "payload_bytes": len(payload),
+        "payload_sha256": hashlib.sha256(payload).hexdigest(),
+        "sources": source_fingerprint(data_dir) if data_dir else None,
+    }
+    header_bytes = json.dumps(header).encode()
+    payload_start = _align(PREAMBLE.size + len(header_bytes))
+
+    # A unique temporary file next to path, so concurrent writers never share one.
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or ".", prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(PREAMBLE.pack(MAGIC, SNAPSHOT_VERSION, zlib.crc32(header_bytes), len(header_bytes)))
+            f.write(header_bytes)
+            f.write(b"\0" * (payload_start - PREAMBLE.size - len(header_bytes)))
+            f.write(payload)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+    return header
+
+
+class Snapshot:
+    """
+        A loaded snapshot: the ScoreIndex and CompactNetwork backed by read-only views of one
+        memory-mapped file. Processes that map the same file share its pages through the OS page
+        cache, so extra workers cost almost no memory and no parsing.
+        Attributes:
+            header (dict): The snapshot header (vocabulary, layout, checksums, sources).
+            vocab (Vocabulary): Occupation, code and skill names.
+            index (ScoreIndex): The score index, rows in vocab.occupations order.
+            network (CompactNetwork): The career network.
+    """
+
+    def __init__(self, header, buffer, arrays):
+        self.header = header
+        self._buffer = buffer
+        self.vocab = Vocabulary(header["occupations"], header["codes"], header["skills"])
+        self.index = ScoreIndex(self.vocab.occupations, self.vocab.skills, arrays["scores"], arrays["code_ids"],
+                                header["index_codes"], code=arrays["code"], job_zone=arrays["job_zone"])
+        self.network = CompactNetwork(self.vocab, arrays["occupation_code"], arrays["skill_bits"],
+                                      arrays["indptr"], arrays["indices"])
+
+    @property
+    def soft_skills_list(self):
+        return list(self.vocab.skills)
+
+    def close(self):
+        """
+            Unmaps the file. The index and network must not be used afterwards.
+        """
+        self.index = self.network = None
+        try:
+            self._buffer.close()
+        except BufferError:
+            # Arrays taken from the index or network are still alive; the mapping goes with them.
+            pass
+
+
+def read_header(path):
+    """
+        Reads and checks a snapshot's preamble and header without mapping the arrays.
+        Returns:
+            tuple: The header dictionary and the offset where the array payload starts.
+    """
+    try:
+        with open(path, "rb") as f:
+            preamble = f.read(PREAMBLE.size)
+            if len(preamble) < PREAMBLE.size:
+                raise SnapshotError(f"{path} is too short to be a snapshot")
+            magic, version, crc, length = PREAMBLE.unpack(preamble)
+            if magic != MAGIC:
+                raise SnapshotError(f"{path} is not a snapshot file")
+            if version != SNAPSHOT_VERSION:
+                raise SnapshotError(f"{path} is snapshot version {version}, expected {SNAPSHOT_VERSION}")
+            header_bytes = f.read(length)
+    except OSError as e:
+        raise SnapshotError(f"Cannot read snapshot {path}: {e}") from e
+    if len(header_bytes) != length or zlib.crc32(header_bytes) != crc:
+        raise SnapshotError(f"{path} has a corrupt header")
+    return json.loads(header_bytes), _align(PREAMBLE.size + length)
+
+
+def load_snapshot(path, verify=False, data_dir=None):
+    """
+        Memory-maps a snapshot written by write_snapshot().
+
+        The preamble, header checksum and file size are always checked. With verify=True the
+        sha256 of the whole payload is checked too, which reads every page of the file. With
+        data_dir the recorded source files are compared with the directory, so edited CSV files
+        are noticed.
+        Args:
+            path (str): The snapshot file.
+            verify (bool): Check the payload checksum.
+            data_dir (str, optional): The CSV directory the snapshot must still match. Skipped if the
+                        snapshot recorded no sources or the directory does not exist.
+        Returns:
+            Snapshot: The mapped snapshot.
+        Raises:
+            SnapshotError: If any check fails.
+    """
+    header, payload_start = read_header(path)
+    # Snapshots built without a CSV directory (e.g. from the O*NET workbooks) have no sources to compare.
+    sources = header.get("sources")
+    if data_dir is not None and sources is not None and os.path.isdir(data_dir) \
+            and sources != source_fingerprint(data_dir):
+        raise SnapshotError(f"{path} is out of date with {data_dir}")
+
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size != payload_start + header["payload_bytes"]:
+            raise SnapshotError(f"{path} is truncated or has trailing data")
+        buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    payload = memoryview(buffer)[payload_start:]
+    if verify and hashlib.sha256(payload).hexdigest() != header["payload_sha256"]:
+        payload.release()
+        buffer.close()
+        raise SnapshotError(f"{path} failed its payload checksum")
+
+    arrays = {}
+    for name, spec in header["arrays"].items():
+        dtype = np.dtype(spec["dtype"])
+        count = int(np.prod(spec["shape"], dtype=np.int64))
+        arrays[name] = np.frombuffer(payload, dtype=dtype, count=count, offset=spec["offset"]).reshape(spec["shape"])
+    return Snapshot(header, buffer, arrays)
+
+
+def load_snapshot_or_data(path, data_dir, verify=False, check_sources=True):
+    """
+        Loads the snapshot at path, or falls back to the CSV files in data_dir if it is missing or
+        fails any check (the reason is printed).
+        Returns:
+            tuple: (snapshot, None) on success, or (None, (data, soft_skills_list)) from
+                load_and_preprocess_data on fallback.
+    """
+    try:
+        return load_snapshot(path, verify=verify, data_dir=data_dir if check_sources else None), None
+    except SnapshotError as e:
+        print(f"Snapshot unavailable ({e}); loading CSV files from {data_dir}")
+    from skills import load_and_preprocess_data
+    return None, load_and_preprocess_data(data_dir)
+
+
+def main(argv=None):
+    """
+        Builds a snapshot from the CSV files, or loads one and reports what it holds.
+    """
+    parser = argparse.ArgumentParser(description="Build or inspect a career data snapshot.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    build = commands.add_parser("build", help="Parse the CSV files and write a snapshot.")
+    build.add_argument("--data-dir", default="data/softskills", help="Directory containing the soft skill CSV files.")
+    build.add_argument("--output", default="careers.snapshot", help="The snapshot file to write.")
+    load = commands.add_parser("load", help="Map a snapshot, check it and print its contents.")
+    load.add_argument("snapshot", help="The snapshot file.")
+    load.add_argument("--verify", action="store_true", help="Also check the payload checksum.")
+    load.add_argument("--data-dir", default=None, help="Also check the snapshot is up to date with this directory.")
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        from skills import load_and_preprocess_data
+        start = time.perf_counter()
+        data, _ = load_and_preprocess_data(args.data_dir)
+        if data is None:
+            print("Failed to load data. Exiting.")
+            return 1
+        header = write_snapshot(args.output, data, args.data_dir)
+        print(f"Wrote {args.output}: {len(header['occupations'])} occupations, {len(header['skills'])} skills, "
+              f"{os.path.getsize(args.output)} bytes in {time.perf_counter() - start:.2f}s")
+        return 0
+
+    start = time.perf_counter()
+    try:
+        snapshot = load_snapshot(args.snapshot, verify=args.verify, data_dir=args.data_dir)
+    except SnapshotError as e:
+        print(e)
+        return 1
+    elapsed = time.perf_counter() - start
+    print(f"Loaded {args.snapshot} (version {snapshot.header['version']}) in {elapsed * 1000:.1f} ms: "
+          f"{snapshot.network.number_of_nodes()} occupations, {snapshot.network.number_of_edges()} edges, "
+          f"{len(snapshot.vocab.skills)} skills")
+    snapshot.close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,76 @@
+import contextlib
+import csv
+import io
+import json
+import os
+import shutil
+import tempfile
+import unittest
+import pandas as pd
+from batch import read_profiles, run_batch
+from score_index import ScoreIndex
+from skills import parse_args
+
+class TestRunBatch(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        mock_data = {
+            "skill1": pd.DataFrame({"Occupation": ["Occ1", "Occ2"], "Code": ["1", "2"], "Skills Covered": [0.5, 0.9]}),
+            "skill2": pd.DataFrame({"Occupation": ["Occ2", "Occ3"], "Code": ["2", "3"], "Skills Covered": [0.7, 0.8]})
+        }
+        self.index = ScoreIndex.from_data(mock_data)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def path(self, filename):
+        return os.path.join(self.tmp_dir, filename)
+
+    def test_read_profiles_csv_and_jsonl(self):
+        with open(self.path("users.csv"), "w") as f:
+            f.write('user_id,skills\nu1,"skill1, skill2"\n,skill2\n')
+        with open(self.path("users.jsonl"), "w") as f:
+            f.write(json.dumps({"user_id": "u1", "skills": ["skill1"]}) + "\n\n" + json.dumps({"skills": "skill2, x"}) + "\n")
+
+        self.assertEqual(list(read_profiles(self.path("users.csv"))), [("u1", ["skill1", "skill2"]), ("2", ["skill2"])])
+        self.assertEqual(list(read_profiles(self.path("users.jsonl"))), [("u1", ["skill1"]), ("2", ["skill2", "x"])])
+
+    def test_jsonl_to_csv_in_chunks(self):
+        with open(self.path("users.jsonl"), "w") as f:
+            for i, skills in enumerate([["skill1"], ["skill2", "bogus"], ["skill1", "skill2"]]):
+                f.write(json.dumps({"user_id": f"u{i}", "skills": skills}) + "\n")
+
+        progress = io.StringIO()
+        stats = run_batch(self.index, ["skill1", "skill2"], self.path("users.jsonl"), self.path("out.csv"),
+                          num_recommendations=1, chunk_size=2, progress=progress)
+
+        self.assertEqual(stats["profiles"], 3)
+        self.assertEqual(len(progress.getvalue().splitlines()), 2)
+        with open(self.path("out.csv")) as f:
+            rows = list(csv.DictReader(f))
+        self.assertEqual([(row["user_id"], row["occupation"], row["score"]) for row in rows],
+                         [("u0", "Occ2", "0.9000"), ("u1", "Occ3", "0.8000"), ("u2", "Occ2", "0.8000")])
+
+    def test_csv_to_jsonl(self):
+        with open(self.path("users.csv"), "w") as f:
+            f.write('user_id,skills\nu1,"skill2, bogus"\n')
+
+        run_batch(self.index, ["skill1", "skill2"], self.path("users.csv"), self.path("out.jsonl"),
+                  num_recommendations=2, progress=None)
+
+        with open(self.path("out.jsonl")) as f:
+            result = json.loads(f.readline())
+        self.assertEqual(result["skills"], ["skill2"])
+        self.assertEqual(result["ignored"], ["bogus"])
+        self.assertEqual([r["occupation"] for r in result["recommendations"]], ["Occ3", "Occ2"])
+
+    def test_counts_must_be_positive(self):
+        self.assertEqual(parse_args(["--batch", "in.csv", "--output", "out.csv", "--chunk-size", "64"]).chunk_size, 64)
+        for option in ("--chunk-size", "--num-recommendations"):
+            for value in ("0", "-3", "two"):
+                with self.assertRaises(SystemExit), contextlib.redirect_stderr(io.StringIO()):
+                    parse_args([option, value])
+
+if __name__ == '__main__':
+    unittest.main()
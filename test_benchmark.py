@@ -0,0 +1,43 @@
+import tempfile
+import unittest
+from benchmark import generate_dataset, measure_startup, parse_size, run_scenario
+from skills import load_and_preprocess_data
+
+class TestBenchmark(unittest.TestCase):
+
+    def test_parse_size(self):
+        self.assertEqual(parse_size("1kx14"), (1000, 14))
+        self.assertEqual(parse_size("1mx500"), (1000000, 500))
+        self.assertEqual(parse_size("250x3"), (250, 3))
+
+    def test_generated_dataset_loads(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            skills = generate_dataset(tmp_dir, 50, 3, coverage=0.4, occupations_per_code=5)
+            data, soft_skills_list = load_and_preprocess_data(tmp_dir)
+
+        self.assertEqual(sorted(soft_skills_list), skills)
+        self.assertEqual(len(data["skill000"]), 20)
+        self.assertTrue(data["skill000"]["Skills Covered"].between(0, 1).all())
+
+    def test_run_scenario_reports_every_stage(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            generate_dataset(tmp_dir, 40, 4, coverage=1.0, occupations_per_code=4)
+            result = run_scenario("tiny", tmp_dir, num_queries=3, track_memory=False)
+
+        self.assertEqual(set(result["stages"]), {"load", "graph", "compact_graph", "index", "snapshot_build", "snapshot_load",
+                                                  "score", "recommend", "batch"})
+        self.assertEqual(result["occupations"], 40)
+        self.assertGreater(result["edges"], 0)
+
+    def test_startup_without_heavy_imports(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            generate_dataset(tmp_dir, 20, 3, coverage=1.0)
+            result = measure_startup(tmp_dir, repeats=1)
+
+        self.assertEqual(result["import_skills"]["modules"], [])
+        self.assertEqual(result["cold_start_snapshot"]["modules"], [])
+        self.assertEqual(result["import_skills_eager"]["modules"], ["pandas", "networkx", "prettytable"])
+        self.assertEqual(result["cold_start_csv"]["modules"], ["pandas", "networkx"])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,4 +1,7 @@
 import unittest
+import pandas as pd
+import networkx as nx
+from score_index import ScoreIndex
 from skills import calculate_overall_match  # Import the function
 
 class TestCalculateOverallMatch(unittest.TestCase):
@@ -71,6 +74,86 @@ class TestCalculateOverallMatch(unittest.TestCase):
         self.assertIsInstance(ranked_careers, list)
         self.assertEqual(len(ranked_careers), 2) #All occupations, but 0 scores
 
+    def test_calculate_overall_match_scores_and_codes(self):
+        # Occ2 is listed by both skills with different codes, the first user skill wins
+        G = nx.Graph()
+        G.add_node("Occ1")
+        G.add_node("Occ2")
+        G.add_node("Occ3")
+
+        mock_data = {
+            "skill1": pd.DataFrame({"Occupation": ["Occ1", "Occ2"], "Code": ["1", "2a"], "Skills Covered": [0.5, 0.4]}),
+            "skill2": pd.DataFrame({"Occupation": ["Occ2", "Occ2"], "Code": ["2b", "2c"], "Skills Covered": [0.8, 0.1]})
+        }
+
+        ranked_careers = calculate_overall_match(G, ["skill2", "skill1"], mock_data)
+
+        self.assertEqual(ranked_careers[0], ("Occ2", (0.6000000000000001, "2b")))
+        self.assertEqual(ranked_careers[1], ("Occ1", (0.25, "1")))
+        self.assertEqual(ranked_careers[2], ("Occ3", (0.0, None)))
+
+    def test_calculate_overall_match_top_k(self):
+        # Ties at the cut-off must be broken the same way as in the full ranking
+        G = nx.Graph()
+        for occupation in ["Occ1", "Occ2", "Occ3", "Occ4", "Occ5"]:
+            G.add_node(occupation)
+
+        mock_data = {
+            "skill1": pd.DataFrame({"Occupation": ["Occ1", "Occ2", "Occ3", "Occ4", "Occ5"],
+                                    "Code": ["1", "2", "3", "4", "5"],
+                                    "Skills Covered": [0.2, 0.5, 0.9, 0.5, 0.5]})
+        }
+
+        full = calculate_overall_match(G, ["skill1"], mock_data)
+        for top_k in range(0, 7):
+            self.assertEqual(calculate_overall_match(G, ["skill1"], mock_data, top_k=top_k), full[:top_k])
+
+    def test_calculate_overall_match_weights_and_filters(self):
+        G = nx.Graph()
+        for occupation in ["Occ1", "Occ2", "Occ3"]:
+            G.add_node(occupation)
+
+        mock_data = {
+            "skill1": pd.DataFrame({"Occupation": ["Occ1", "Occ2", "Occ3"], "Code": ["29-1", "29-2", "47-1"],
+                                    "Job Zone": [4, 2, 3], "Skills Covered": [0.2, 0.9, 0.6]}),
+            "skill2": pd.DataFrame({"Occupation": ["Occ1", "Occ3"], "Code": ["29-1", "47-1"],
+                                    "Job Zone": [4, 3], "Skills Covered": [1.0, 0.0]})
+        }
+
+        weighted = calculate_overall_match(G, ["skill1", "skill2"], mock_data, weights={"skill2": 3})
+        self.assertEqual([career for career, _ in weighted], ["Occ1", "Occ2", "Occ3"])
+        self.assertAlmostEqual(weighted[0][1][0], 0.8)
+        # The index built from the user's skills alone still accepts weights for other known skills.
+        self.assertEqual(calculate_overall_match(G, ["skill1"], mock_data, weights={"skill2": 2}),
+                         calculate_overall_match(G, ["skill1"], mock_data))
+        with self.assertRaisesRegex(ValueError, "Unknown skill"):
+            calculate_overall_match(G, ["skill1"], mock_data, weights={"skill9": 2})
+
+        self.assertEqual(calculate_overall_match(G, ["skill1"], mock_data, job_zones=(3, 4)),
+                         [("Occ3", (0.6, "47-1")), ("Occ1", (0.2, "29-1"))])
+        self.assertEqual(calculate_overall_match(G, ["skill1"], mock_data, code_prefixes="29-", top_k=1),
+                         [("Occ2", (0.9, "29-2"))])
+        self.assertEqual(calculate_overall_match(G, ["skill1"], mock_data, job_zones=2, code_prefixes="47-"), [])
+
+    def test_calculate_overall_match_filters_use_every_skill(self):
+        # OccC's Job Zone and code only come from skill2, which the user did not pick.
+        G = nx.Graph()
+        for occupation in ["OccA", "OccB", "OccC"]:
+            G.add_node(occupation)
+
+        mock_data = {
+            "skill1": pd.DataFrame({"Occupation": ["OccA", "OccB"], "Code": ["29-1", "47-1"],
+                                    "Job Zone": [3, 2], "Skills Covered": [0.5, 0.4]}),
+            "skill2": pd.DataFrame({"Occupation": ["OccC"], "Code": ["29-2"], "Job Zone": [3], "Skills Covered": [0.9]})
+        }
+        index = ScoreIndex.from_data(mock_data, occupations=G.nodes())
+
+        for filters in ({"job_zones": 3}, {"code_prefixes": "29-"}, {"job_zones": (2, 3), "code_prefixes": "47-"}):
+            self.assertEqual(calculate_overall_match(G, ["skill1"], mock_data, **filters),
+                             calculate_overall_match(G, ["skill1"], mock_data, index=index, **filters))
+        self.assertEqual(calculate_overall_match(G, ["skill1"], mock_data, job_zones=3),
+                         [("OccA", (0.5, "29-1")), ("OccC", (0.0, None))])
+
 if __name__ == '__main__':
     import networkx as nx #This is a MUST, it has to import networkx
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,79 @@
+import unittest
+import networkx as nx
+import numpy as np
+import pandas as pd
+from career_paths import CareerPaths, scores_from_ranked
+from compact_network import CompactNetwork
+from skills import create_career_network
+
+class TestCareerPaths(unittest.TestCase):
+
+    def setUp(self):
+        # A chain Occ1 - Occ2 - Occ3 - Occ4 plus a shortcut Occ1 - Occ5 - Occ4, and an isolated Occ6.
+        self.mock_data = {
+            "skill1": pd.DataFrame({"Occupation": ["Occ1", "Occ2", "Occ3", "Occ4", "Occ6"], "Code": ["a", "a", "b", "b", "z"],
+                                    "Skills Covered": [0.1, 0.2, 0.3, 0.4, 0.5]}),
+            "skill2": pd.DataFrame({"Occupation": ["Occ2", "Occ3", "Occ1", "Occ5", "Occ4"], "Code": ["c", "c", "d", "d", "e"],
+                                    "Skills Covered": [0.1, 0.2, 0.3, 0.4, 0.5]}),
+            "skill3": pd.DataFrame({"Occupation": ["Occ5", "Occ4"], "Code": ["f", "f"], "Skills Covered": [0.1, 0.2]}),
+        }
+        self.paths = CareerPaths(CompactNetwork.from_data(self.mock_data))
+
+    def test_adjacent(self):
+        self.assertEqual(sorted(self.paths.adjacent("Occ1")), ["Occ2", "Occ5"])
+        self.assertEqual(self.paths.adjacent("Occ6"), [])
+        with self.assertRaises(KeyError):
+            self.paths.adjacent("Missing")
+
+    def test_neighborhood_and_cache(self):
+        self.assertEqual(self.paths.neighborhood("Occ1", k=1), [("Occ2", 1), ("Occ5", 1)])
+        self.assertEqual(dict(self.paths.neighborhood("Occ1", k=2)), {"Occ2": 1, "Occ5": 1, "Occ3": 2, "Occ4": 2})
+        # Searches are bounded by k, so each k is its own cache entry.
+        self.assertEqual(self.paths.neighborhood("Occ1", k=1), [("Occ2", 1), ("Occ5", 1)])
+        self.assertEqual(self.paths.stats()["hits"], 1)
+        self.assertEqual(dict(self.paths.neighborhood(["Occ3", "Occ5"], k=1)), {"Occ2": 1, "Occ4": 1, "Occ1": 1})
+
+    def test_shortest_path_matches_networkx(self):
+        G = create_career_network(self.mock_data)
+        path = self.paths.shortest_path("Occ2", "Occ5")
+        self.assertEqual(len(path), nx.shortest_path_length(G, "Occ2", "Occ5") + 1)
+        self.assertTrue(all(G.has_edge(a, b) for a, b in zip(path, path[1:])))
+        self.assertIsNone(self.paths.shortest_path("Occ1", "Occ6"))
+        self.assertEqual(self.paths.shortest_path("Occ1", "Occ1"), ["Occ1"])
+
+    def test_searches_stop_early_and_cache_is_bounded(self):
+        paths = CareerPaths(self.paths.network, cache_nodes=4)
+        occ1 = paths.network.vocab.occupation_ids["Occ1"]
+        ids, distance, _ = paths.search([occ1], max_hops=1)
+        self.assertEqual(sorted(distance.tolist()), [0, 1, 1])
+        ids, distance, _ = paths.search([occ1], target=paths.network.vocab.occupation_ids["Occ2"])
+        self.assertEqual(distance.max(), 1)
+        self.assertEqual(paths.shortest_path("Occ1", "Occ4"), ["Occ1", "Occ5", "Occ4"])
+
+        # Each result fits on its own, but together they exceed cache_nodes and the oldest are evicted.
+        self.assertLessEqual(paths.stats()["nodes"], 4)
+        self.assertEqual(paths.stats()["size"], 1)
+
+    def test_bfs_distances_match_networkx(self):
+        G = create_career_network(self.mock_data)
+        distance, _ = self.paths.bfs([self.paths.network.vocab.occupation_ids["Occ3"]])
+        expected = nx.single_source_shortest_path_length(G, "Occ3")
+        for occupation, i in self.paths.network.vocab.occupation_ids.items():
+            self.assertEqual(distance[i], expected.get(occupation, -1))
+
+    def test_rank_paths_weighs_score_gaps(self):
+        # Occ1 -> Occ4 is two hops either way; the route through Occ5 has the smaller climb.
+        scores = {"Occ1": 0.1, "Occ2": 0.9, "Occ3": 0.9, "Occ4": 1.0, "Occ5": 0.5}
+        ranked = self.paths.rank_paths(["Occ1"], scores, targets=["Occ4"])
+        self.assertEqual(ranked[0][1], ["Occ1", "Occ5", "Occ4"])
+        self.assertAlmostEqual(ranked[0][2], 2 + 0.9)
+
+        ranked = self.paths.rank_paths(["Occ1"], scores, gap_weight=0.0, max_hops=1)
+        self.assertEqual({target for target, _, _ in ranked}, {"Occ2", "Occ5"})
+        self.assertTrue(np.allclose([cost for _, _, cost in ranked], 1.0))
+
+    def test_scores_from_ranked(self):
+        self.assertEqual(scores_from_ranked([("Occ1", (0.5, "a"))]), {"Occ1": 0.5})
+
+if __name__ == '__main__':
+    unittest.main()
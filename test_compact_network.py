@@ -0,0 +1,54 @@
+import unittest
+import pandas as pd
+from compact_network import CompactNetwork, Vocabulary, memory_report
+from skills import create_career_network
+
+class TestCompactNetwork(unittest.TestCase):
+
+    def setUp(self):
+        self.mock_data = {
+            "skill1": pd.DataFrame({"Occupation": ["Occ1", "Occ2", "Occ3"], "Code": ["1", "1", "2"], "Skills Covered": [0.5, 0.6, 0.7]}),
+            "skill2": pd.DataFrame({"Occupation": ["Occ2", "Occ3", "Occ4"], "Code": ["1", "2", "2"], "Skills Covered": [0.7, 0.8, 0.9]})
+        }
+
+    def test_vocabulary_ids(self):
+        vocab = Vocabulary.from_data(self.mock_data)
+
+        self.assertEqual(vocab.occupations, ["Occ1", "Occ2", "Occ3", "Occ4"])
+        self.assertEqual(vocab.codes, ["1", "2"])
+        self.assertEqual(vocab.skill_ids, {"skill1": 0, "skill2": 1})
+
+    def test_csr_and_membership(self):
+        network = CompactNetwork.from_data(self.mock_data)
+
+        self.assertEqual(network.number_of_nodes(), 4)
+        self.assertEqual(network.number_of_edges(), 2)
+        self.assertEqual(network.indptr.tolist(), [0, 1, 2, 3, 4])
+        self.assertEqual(network.neighbors("Occ3"), ["Occ4"])
+        self.assertEqual(network.skills_of("Occ2"), ["skill1", "skill2"])
+        self.assertEqual(network.occupation_code.tolist(), [0, 0, 1, 1])
+
+    def test_to_networkx_matches_create_career_network(self):
+        expected = create_career_network(self.mock_data)
+        G = CompactNetwork.from_data(self.mock_data).to_networkx()
+
+        self.assertEqual(set(G.nodes()), set(expected.nodes()))
+        self.assertEqual(set(map(frozenset, G.edges())), set(map(frozenset, expected.edges())))
+        for occupation in expected.nodes():
+            self.assertEqual(G.nodes[occupation]['skills'], expected.nodes[occupation]['skills'])
+
+    def test_empty_data(self):
+        network = CompactNetwork.from_data({})
+
+        self.assertEqual(network.number_of_nodes(), 0)
+        self.assertEqual(network.number_of_edges(), 0)
+        self.assertEqual(network.to_networkx().number_of_nodes(), 0)
+
+    def test_memory_report(self):
+        report = memory_report(create_career_network(self.mock_data), CompactNetwork.from_data(self.mock_data))
+
+        self.assertEqual(report["edges"], 2)
+        self.assertGreater(report["networkx_bytes"], report["compact_bytes"])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -92,6 +92,20 @@ class TestCreateCareerNetwork(unittest.TestCase):
         self.assertEqual(set(G.nodes["Occ3"]['skills']), {"skill1"})
         self.assertEqual(set(G.nodes["Occ4"]['skills']), {"skill1"})
 
+    def test_create_career_network_duplicate_edges_and_missing_codes(self):
+        # The same pair sharing a code in two skills gives one edge; rows without a code give none
+        mock_data = {
+            "skill1": pd.DataFrame({"Occupation": ["Occ1", "Occ2", "Occ3", "Occ4"], "Code": ["1", "1", "2", None], "Skills Covered": [0.5, 0.6, 0.7, 0.8]}),
+            "skill2": pd.DataFrame({"Occupation": ["Occ2", "Occ1", "Occ3", "Occ4"], "Code": ["1", "1", "2", None], "Skills Covered": [0.5, 0.6, 0.7, 0.8]}),
+            "skill3": pd.DataFrame({"Occupation": ["Occ3", "Occ4"], "Code": ["3", "3"], "Skills Covered": [0.5, 0.6]})
+        }
+
+        G = create_career_network(mock_data)
+
+        self.assertEqual(G.number_of_nodes(), 4)
+        self.assertEqual(set(map(frozenset, G.edges())), {frozenset({"Occ1", "Occ2"}), frozenset({"Occ3", "Occ4"})})
+        self.assertEqual(G.nodes["Occ4"]['skills'], ["skill1", "skill2", "skill3"])
+
 if __name__ == '__main__':
     import networkx as nx
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,88 @@
+import os
+import shutil
+import tempfile
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+import pandas as pd
+from data_cache import SkillFileCache
+from skills import load_and_preprocess_data
+
+def _rebuild_loads(data_dir, cache_dir, loads):
+    # Loads data_dir 'loads' times through a rebuilding cache; returns how many loads failed.
+    failures = 0
+    for _ in range(loads):
+        data, _ = load_and_preprocess_data(data_dir, cache=SkillFileCache(cache_dir, rebuild=True))
+        failures += data is None
+    return failures
+
+class TestSkillFileCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.data_dir = os.path.join(self.tmp_dir, "softskills")
+        self.cache_dir = os.path.join(self.tmp_dir, "cache")
+        os.makedirs(self.data_dir)
+        for skill, rows in {"skill1": "50,1,3,1,Occ1\n25,1,2,2,\"Occ2, Senior\"\n",
+                            "skill2": "75,1,4,1,Occ1\n"}.items():
+            with open(os.path.join(self.data_dir, skill + ".csv"), "w") as f:
+                f.write("Skills Covered,My Matches,Job Zone,Code,Occupation\n" + rows)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_warm_load_matches_cold_load(self):
+        cold = SkillFileCache(self.cache_dir)
+        data, soft_skills_list = load_and_preprocess_data(self.data_dir, cache=cold)
+        self.assertEqual(cold.report()["misses"], 2)
+
+        warm = SkillFileCache(self.cache_dir)
+        cached, cached_skills = load_and_preprocess_data(self.data_dir, cache=warm)
+        self.assertEqual(warm.report()["hits"], 2)
+        self.assertEqual(warm.report()["misses"], 0)
+
+        self.assertEqual(sorted(cached_skills), sorted(soft_skills_list))
+        for skill in soft_skills_list:
+            pd.testing.assert_frame_equal(cached[skill], data[skill])
+
+    def test_changed_file_is_reparsed(self):
+        load_and_preprocess_data(self.data_dir, cache=SkillFileCache(self.cache_dir))
+        with open(os.path.join(self.data_dir, "skill2.csv"), "a") as f:
+            f.write("10,1,1,3,Occ3\n")
+
+        cache = SkillFileCache(self.cache_dir)
+        data, _ = load_and_preprocess_data(self.data_dir, cache=cache)
+
+        self.assertEqual(cache.report()["missed_files"], ["skill2.csv"])
+        self.assertEqual(data["skill2"]["Skills Covered"].tolist(), [0.75, 0.1])
+
+    def test_touched_file_is_a_hit(self):
+        load_and_preprocess_data(self.data_dir, cache=SkillFileCache(self.cache_dir))
+        path = os.path.join(self.data_dir, "skill1.csv")
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+        cache = SkillFileCache(self.cache_dir)
+        load_and_preprocess_data(self.data_dir, cache=cache)
+        self.assertEqual(cache.report()["misses"], 0)
+
+    def test_rebuild_ignores_cache(self):
+        load_and_preprocess_data(self.data_dir, cache=SkillFileCache(self.cache_dir))
+
+        cache = SkillFileCache(self.cache_dir, rebuild=True)
+        load_and_preprocess_data(self.data_dir, cache=cache)
+        self.assertEqual(cache.report()["hits"], 0)
+        self.assertEqual(cache.report()["misses"], 2)
+
+    def test_processes_share_one_cache(self):
+        with ProcessPoolExecutor(max_workers=6) as pool:
+            failures = list(pool.map(_rebuild_loads, [self.data_dir] * 6, [self.cache_dir] * 6, [5] * 6))
+        self.assertEqual(failures, [0] * 6)
+
+        # No update was lost: every file is a hit afterwards and no temporary files are left behind.
+        cache = SkillFileCache(self.cache_dir)
+        load_and_preprocess_data(self.data_dir, cache=cache)
+        self.assertEqual(cache.report()["hits"], 2)
+        self.assertFalse([name for name in os.listdir(self.cache_dir) if name.startswith(".tmp-")])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,118 @@
+import os
+import shutil
+import tempfile
+import unittest
+import pandas as pd
+from incremental import DirectoryWatcher, IncrementalNetwork
+from score_index import ScoreIndex
+from skills import calculate_overall_match, create_career_network
+
+class TestIncrementalNetwork(unittest.TestCase):
+
+    def setUp(self):
+        self.mock_data = {
+            "skill1": pd.DataFrame({"Occupation": ["Occ1", "Occ2", "Occ3"], "Code": ["1", "1", "2"], "Skills Covered": [0.5, 0.6, 0.7]}),
+            "skill2": pd.DataFrame({"Occupation": ["Occ2", "Occ3", "Occ4"], "Code": ["1", "2", "2"], "Skills Covered": [0.7, 0.8, 0.9]})
+        }
+
+    def assertMatchesRebuild(self, network):
+        expected = create_career_network(network.data)
+        self.assertEqual(set(network.G.nodes()), set(expected.nodes()))
+        self.assertEqual(set(map(frozenset, network.G.edges())), set(map(frozenset, expected.edges())))
+        for occupation in expected.nodes():
+            self.assertEqual(network.G.nodes[occupation]['skills'], expected.nodes[occupation]['skills'])
+
+        skills = list(network.data)
+        got = dict(calculate_overall_match(network.G, skills, network.data, index=network.index))
+        want = dict(calculate_overall_match(expected, skills, network.data,
+                                            index=ScoreIndex.from_data(network.data)))
+        self.assertEqual(got, want)
+
+    def test_initial_build(self):
+        network = IncrementalNetwork(self.mock_data)
+        self.assertMatchesRebuild(network)
+        self.assertEqual(network.generation, 2)
+
+    def test_add_replace_and_remove(self):
+        network = IncrementalNetwork(self.mock_data)
+        network.set_skill("skill3", pd.DataFrame({"Occupation": ["Occ4", "Occ5"], "Code": ["3", "3"], "Skills Covered": [0.1, 0.2]}))
+        self.assertMatchesRebuild(network)
+        self.assertTrue(network.G.has_edge("Occ4", "Occ5"))
+
+        network.set_skill("skill1", pd.DataFrame({"Occupation": ["Occ2", "Occ3"], "Code": ["1", "2"], "Skills Covered": [0.4, 0.3]}))
+        self.assertMatchesRebuild(network)
+        self.assertNotIn("Occ1", network.G)
+        self.assertNotIn("Occ1", network.index.occupation_rows)
+
+        network.remove_skill("skill3")
+        self.assertMatchesRebuild(network)
+        self.assertNotIn("Occ5", network.G)
+
+    def test_shared_edge_survives_removal(self):
+        data = {
+            "skill1": pd.DataFrame({"Occupation": ["Occ1", "Occ2"], "Code": ["1", "1"], "Skills Covered": [0.5, 0.6]}),
+            "skill2": pd.DataFrame({"Occupation": ["Occ1", "Occ2"], "Code": ["1", "1"], "Skills Covered": [0.7, 0.8]}),
+        }
+        network = IncrementalNetwork(data)
+        network.remove_skill("skill1")
+        self.assertTrue(network.G.has_edge("Occ1", "Occ2"))
+        self.assertMatchesRebuild(network)
+
+        network.remove_skill("skill2")
+        self.assertEqual(network.G.number_of_nodes(), 0)
+        self.assertEqual(network.index.scores.shape, (0, 0))
+
+    def test_duplicate_rows_keep_self_loop(self):
+        data = {"skill1": pd.DataFrame({"Occupation": ["Occ1", "Occ1", "Occ2"], "Code": ["1", "1", "2"],
+                                        "Skills Covered": [0.5, 0.5, 0.3]})}
+        network = IncrementalNetwork(data)
+        self.assertTrue(network.G.has_edge("Occ1", "Occ1"))
+        self.assertMatchesRebuild(network)
+
+        network.remove_skill("skill1")
+        self.assertEqual(network.G.number_of_edges(), 0)
+
+    def test_replaced_job_zones_match_rebuild(self):
+        network = IncrementalNetwork({"s1": pd.DataFrame({"Occupation": ["A", "B"], "Code": ["1", "2"], "Job Zone": [2, 3],
+                                                          "Skills Covered": [0.5, 0.6]})})
+        network.set_skill("s1", pd.DataFrame({"Occupation": ["A", "B"], "Code": ["1", "2"], "Job Zone": [4, 3],
+                                              "Skills Covered": [0.5, 0.6]}))
+        network.set_skill("s2", pd.DataFrame({"Occupation": ["B"], "Code": ["2"], "Job Zone": [5], "Skills Covered": [0.1]}))
+
+        rebuilt = ScoreIndex.from_data(network.data)
+        self.assertEqual(network.index.rank(["s1"], job_zones=4), [("A", (0.5, "1"))])
+        for zones in (2, 3, 4, 5):
+            self.assertEqual(network.index.rank(["s1"], job_zones=zones), rebuilt.rank(["s1"], job_zones=zones))
+
+        network.remove_skill("s1")
+        self.assertEqual(network.index.rank(["s2"], job_zones=5), [("B", (0.1, "2"))])
+
+    def test_remove_unknown_skill(self):
+        with self.assertRaises(KeyError):
+            IncrementalNetwork(self.mock_data).remove_skill("missing")
+
+
+class TestDirectoryWatcher(unittest.TestCase):
+
+    def setUp(self):
+        self.data_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.data_dir)
+
+    def write(self, name, occupations, code="1"):
+        pd.DataFrame({"Occupation": occupations, "Code": [code] * len(occupations),
+                      "Skills Covered": [0.5] * len(occupations)}).to_csv(os.path.join(self.data_dir, name), index=False)
+
+    def test_poll_applies_changes(self):
+        network = IncrementalNetwork()
+        watcher = DirectoryWatcher(self.data_dir, network)
+        self.write("skill1.csv", ["Occ1", "Occ2"])
+        self.assertEqual(watcher.poll(), ["skill1"])
+        self.assertTrue(network.G.has_edge("Occ1", "Occ2"))
+        self.assertEqual(watcher.poll(), [])
+
+        os.remove(os.path.join(self.data_dir, "skill1.csv"))
+        self.assertEqual(watcher.poll(), ["skill1"])
+        self.assertEqual(network.soft_skills_list, [])
+
+if __name__ == '__main__':
+    unittest.main()
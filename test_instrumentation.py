@@ -0,0 +1,85 @@
+import os
+import tempfile
+import unittest
+import pandas as pd
+from instrumentation import Instrumentation, instrumentation, profile
+from skills import calculate_overall_match, create_career_network
+
+class TestInstrumentation(unittest.TestCase):
+
+    def test_disabled_records_nothing(self):
+        metrics = Instrumentation()
+        with metrics.stage("load"):
+            pass
+        metrics.timed("score")(lambda: None)()
+        self.assertEqual(metrics.snapshot(), {})
+
+    def test_stage_and_timed(self):
+        metrics = Instrumentation()
+        metrics.enable()
+        for _ in range(3):
+            with metrics.stage("load"):
+                pass
+
+        @metrics.timed("score")
+        def score(x):
+            if x < 0:
+                raise ValueError(x)
+            return x * 2
+
+        self.assertEqual(score(2), 4)
+        with self.assertRaises(ValueError):
+            score(-1)
+
+        snapshot = metrics.snapshot()
+        self.assertEqual(snapshot["load"]["calls"], 3)
+        self.assertEqual(snapshot["score"]["calls"], 2)
+        self.assertEqual(snapshot["score"]["errors"], 1)
+        self.assertIn("p99_ms", snapshot["load"])
+        self.assertIsNone(snapshot["load"]["peak_memory_bytes"])
+
+    def test_memory_includes_nested_stages(self):
+        metrics = Instrumentation()
+        metrics.enable(track_memory=True)
+        try:
+            with metrics.stage("outer"):
+                with metrics.stage("inner"):
+                    block = bytearray(4 << 20)
+                del block
+        finally:
+            metrics.disable()
+
+        snapshot = metrics.snapshot()
+        self.assertGreaterEqual(snapshot["inner"]["peak_memory_bytes"], 4 << 20)
+        self.assertGreaterEqual(snapshot["outer"]["peak_memory_bytes"], 4 << 20)
+
+    def test_prometheus_and_dump(self):
+        metrics = Instrumentation()
+        metrics.enable()
+        metrics.record("score", 0.002)
+        text = metrics.to_prometheus()
+        self.assertIn('career_navigator_stage_seconds{stage="score",quantile="0.95"} 0.002', text)
+        self.assertIn('career_navigator_stage_seconds_count{stage="score"} 1', text)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            metrics.dump(os.path.join(tmp, "stages.prom"))
+            metrics.dump(os.path.join(tmp, "stages.json"))
+            with open(os.path.join(tmp, "stages.prom")) as f:
+                self.assertEqual(f.read(), text)
+            with open(os.path.join(tmp, "stages.json")) as f:
+                self.assertIn('"score"', f.read())
+
+    def test_skills_stages_and_profile(self):
+        data = {"skill1": pd.DataFrame({"Occupation": ["Occ1", "Occ2"], "Code": ["1", "1"], "Skills Covered": [0.5, 0.6]})}
+        instrumentation.enable()
+        self.addCleanup(instrumentation.reset)
+        self.addCleanup(instrumentation.disable)
+        G = create_career_network(data)
+        ranked, report = profile(calculate_overall_match, G, ["skill1"], data)
+
+        self.assertEqual(ranked[0][0], "Occ2")
+        self.assertIn("calculate_overall_match", report)
+        self.assertEqual(set(instrumentation.snapshot()), {"graph", "score"})
+
+if __name__ == '__main__':
+    unittest.main()
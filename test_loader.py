@@ -0,0 +1,104 @@
+import os
+import shutil
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+import networkx as nx
+from data_cache import SkillFileCache
+from loader import LazySkillData, load_skill_directory
+from skills import calculate_overall_match, load_and_preprocess_data
+
+class TestLoadSkillDirectory(unittest.TestCase):
+
+    def setUp(self):
+        self.data_dir = tempfile.mkdtemp()
+        files = {"skill1": "50,1,3,1,Occ1\n25%,1,2,2,\"Occ2, Senior\"\n",
+                 "skill2": "75,1,4,1,Occ1\n",
+                 "skill3": "100,1,4,3,Occ3\n"}
+        for skill, rows in files.items():
+            with open(os.path.join(self.data_dir, skill + ".csv"), "w") as f:
+                f.write("Skills Covered,My Matches,Job Zone,Code,Occupation\n" + rows)
+
+    def tearDown(self):
+        shutil.rmtree(self.data_dir)
+
+    def write_bad_file(self):
+        with open(os.path.join(self.data_dir, "broken.csv"), "w") as f:
+            f.write("Occupation\nOcc9\n")
+
+    def test_parallel_load_compact_columns(self):
+        data, soft_skills_list, errors = load_skill_directory(self.data_dir, workers=2)
+
+        self.assertEqual(sorted(soft_skills_list), ["skill1", "skill2", "skill3"])
+        self.assertEqual(errors, {})
+        df = data["skill1"]
+        self.assertEqual(list(df.columns), ["Skills Covered", "Job Zone", "Code", "Occupation"])
+        self.assertEqual(df["Skills Covered"].dtype, np.float32)
+        self.assertEqual(df["Job Zone"].dtype, np.int8)
+        self.assertEqual(df["Occupation"].dtype, "category")
+        np.testing.assert_allclose(df["Skills Covered"], [0.5, 0.25])
+
+    def test_bad_file_does_not_fail_the_load(self):
+        self.write_bad_file()
+
+        data, soft_skills_list, errors = load_skill_directory(self.data_dir, workers=2)
+
+        self.assertEqual(sorted(soft_skills_list), ["skill1", "skill2", "skill3"])
+        self.assertEqual(list(errors), ["broken"])
+
+    def test_job_zone_is_optional(self):
+        with open(os.path.join(self.data_dir, "skill4.csv"), "w") as f:
+            f.write("Skills Covered,Code,Occupation\n40,4,Occ4\n")
+
+        data, soft_skills_list, errors = load_skill_directory(self.data_dir, workers=2)
+
+        self.assertEqual(errors, {})
+        self.assertIn("skill4", soft_skills_list)
+        self.assertEqual(list(data["skill4"].columns), ["Skills Covered", "Code", "Occupation"])
+
+    def test_lazy_load_parses_on_first_use(self):
+        self.write_bad_file()
+
+        data, soft_skills_list, errors = load_skill_directory(self.data_dir, lazy=True)
+
+        self.assertIsInstance(data, LazySkillData)
+        self.assertEqual(data.loaded(), [])
+        self.assertIn("broken", data)
+
+        G = nx.Graph()
+        G.add_nodes_from(["Occ1", "Occ2, Senior", "Occ3"])
+        ranked_careers = calculate_overall_match(G, ["skill2", "broken"], data)
+
+        self.assertEqual(data.loaded(), ["skill2"])
+        self.assertEqual(list(errors), ["broken"])
+        self.assertNotIn("broken", data)
+        self.assertEqual(ranked_careers[0][0], "Occ1")
+
+    def test_matches_eager_loader(self):
+        data, _ = load_and_preprocess_data(self.data_dir)
+        with tempfile.TemporaryDirectory() as cache_dir:
+            load_skill_directory(self.data_dir, workers=2, compact=False, cache=SkillFileCache(cache_dir))
+            cache = SkillFileCache(cache_dir)
+            parallel, _, _ = load_skill_directory(self.data_dir, workers=2, compact=False, cache=cache)
+
+        self.assertEqual(cache.report()["hits"], 3)
+        for skill, df in data.items():
+            pd.testing.assert_frame_equal(parallel[skill], df[["Skills Covered", "Job Zone", "Code", "Occupation"]])
+
+    def test_compact_loader_ranks_like_eager_loader(self):
+        # Percentages such as 11 and 7 are inexact in float32; the index must not rank on that error.
+        for skill, rows in {"skill1": "11,1,3,11-1011.00,Occ1\n7,1,2,11-2011.00,Occ2\n29,1,2,47-2011.00,Occ4\n",
+                            "skill2": "11,1,4,11-2011.00,Occ2\n11,1,4,29-1011.00,Occ3\n"}.items():
+            with open(os.path.join(self.data_dir, skill + ".csv"), "w") as f:
+                f.write("Skills Covered,My Matches,Job Zone,Code,Occupation\n" + rows)
+        data, _ = load_and_preprocess_data(self.data_dir)
+        compact, _, _ = load_skill_directory(self.data_dir, workers=2)
+        G = nx.Graph()
+        G.add_nodes_from(["Occ1", "Occ2", "Occ3", "Occ4"])
+
+        for user_skills in (["skill1"], ["skill2"], ["skill1", "skill2"], ["skill2", "skill1", "skill2"]):
+            self.assertEqual(calculate_overall_match(G, user_skills, compact), calculate_overall_match(G, user_skills, data))
+
+if __name__ == '__main__':
+    unittest.main()
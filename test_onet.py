@@ -0,0 +1,103 @@
+import os
+import shutil
+import tempfile
+import unittest
+import zipfile
+from xml.sax.saxutils import escape
+from data_cache import SkillFileCache
+from onet import iter_xlsx_rows, ingest_onet, read_xlsx
+
+def write_xlsx(path, rows, sheet="Sheet1"):
+    # A minimal workbook: strings in the shared table, numbers inline, None cells left out.
+    strings = []
+    sheet_rows = []
+    for r, row in enumerate(rows, start=1):
+        cells = []
+        for c, value in enumerate(row):
+            ref = f"{chr(65 + c)}{r}"
+            if value is None:
+                continue
+            if isinstance(value, str):
+                if value not in strings:
+                    strings.append(value)
+                cells.append(f'<c r="{ref}" t="s"><v>{strings.index(value)}</v></c>')
+            else:
+                cells.append(f'<c r="{ref}"><v>{value}</v></c>')
+        sheet_rows.append(f'<row r="{r}">{"".join(cells)}</row>')
+    main = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+    rel = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+    with zipfile.ZipFile(path, "w") as archive:
+        archive.writestr("xl/workbook.xml", f'<workbook xmlns="{main}" xmlns:r="{rel}"><sheets>'
+                                            f'<sheet name="{sheet}" sheetId="1" r:id="rId1"/></sheets></workbook>')
+        archive.writestr("xl/_rels/workbook.xml.rels",
+                         '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+                         '<Relationship Id="rId1" Target="worksheets/sheet1.xml"/></Relationships>')
+        archive.writestr("xl/sharedStrings.xml", f'<sst xmlns="{main}">'
+                         + "".join(f"<si><t>{escape(s)}</t></si>" for s in strings) + "</sst>")
+        archive.writestr("xl/worksheets/sheet1.xml", f'<worksheet xmlns="{main}"><sheetData>{"".join(sheet_rows)}</sheetData></worksheet>')
+
+class TestOnetIngest(unittest.TestCase):
+
+    def setUp(self):
+        self.docs_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.docs_dir)
+        write_xlsx(os.path.join(self.docs_dir, "OccupationData.xlsx"), [
+            ["O*NET-SOC Code", "Title", "Description"],
+            ["11-1011.00", "Chief Executives", "Plan & direct."],
+            ["47-2031.01", "Construction Carpenters", "Build things."],
+        ])
+        write_xlsx(os.path.join(self.docs_dir, "Skills.xlsx"), [
+            ["O*NET-SOC Code", "Title", "Element ID", "Element Name", "Scale ID", "Data Value"],
+            ["11-1011.00", "Chief Executives", "2.A.1.a", "Reading Comprehension", "IM", 5],
+            ["11-1011.00", "Chief Executives", "2.A.1.a", "Reading Comprehension", "LV", 3.5],
+            ["47-2031.01", "Construction Carpenters", "2.A.1.a", "Reading Comprehension", "IM", 2],
+            ["47-2031.01", "Construction Carpenters", "2.B.1.a", "Social Perceptiveness", "IM", 3],
+        ], sheet="Skills")
+        write_xlsx(os.path.join(self.docs_dir, "TechnologySkills.xlsx"), [
+            ["O*NET-SOC Code", "Title", "Example", "Commodity Code", "Commodity Title"],
+            ["11-1011.00", "Chief Executives", "Adobe Acrobat", 43232202, "Document management software"],
+            ["11-1011.00", "Chief Executives", "Microsoft SharePoint", 43232202, "Document management software"],
+            ["47-2031.01", "Construction Carpenters", "AutoCAD", 43232614, "CAD software"],
+        ])
+        self.skills_list = os.path.join(self.docs_dir, "skills-list.csv")
+        with open(self.skills_list, "w") as f:
+            f.write("Element ID,Element Name\n2.A.1.a,Reading Comprehension\n2.B.1.a,Social Perceptiveness\n")
+
+    def test_streaming_reader(self):
+        path = os.path.join(self.docs_dir, "Gaps.xlsx")
+        write_xlsx(path, [["a", "b", "c"], [1, None, "x"]])
+        self.assertEqual(list(iter_xlsx_rows(path)), [["a", "b", "c"], [1.0, None, "x"]])
+        self.assertEqual(read_xlsx(path, columns=("c",)).to_dict("list"), {"c": ["x"]})
+        with self.assertRaises(KeyError):
+            read_xlsx(path, columns=("missing",))
+        with self.assertRaises(KeyError):
+            list(iter_xlsx_rows(path, sheet="Nope"))
+
+    def test_ingest(self):
+        data, names = ingest_onet(self.docs_dir, self.skills_list, use_processes=False)
+
+        self.assertEqual(set(data), {"2.A.1.a", "2.B.1.a", "43232202", "43232614"})
+        self.assertEqual(names["2.B.1.a"], "Social Perceptiveness")
+        self.assertEqual(names["43232614"], "CAD software")
+        reading = data["2.A.1.a"]
+        self.assertEqual(reading["Occupation"].tolist(), ["Chief Executives", "Construction Carpenters"])
+        self.assertEqual(reading["Code"].tolist(), ["11-1011.00", "47-2031.01"])
+        self.assertEqual(reading["Skills Covered"].tolist(), [1.0, 0.25])
+        self.assertEqual(data["43232202"]["Skills Covered"].tolist(), [1.0])
+
+        level, _ = ingest_onet(self.docs_dir, self.skills_list, use_processes=False, scale="LV", technology=False)
+        self.assertEqual(set(level), {"2.A.1.a"})
+        self.assertEqual(level["2.A.1.a"]["Skills Covered"].tolist(), [0.5])
+
+    def test_cache_and_processes(self):
+        cache_dir = os.path.join(self.docs_dir, "cache")
+        first, _ = ingest_onet(self.docs_dir, self.skills_list, cache=SkillFileCache(cache_dir), workers=2)
+        cache = SkillFileCache(cache_dir)
+        second, _ = ingest_onet(self.docs_dir, self.skills_list, cache=cache, use_processes=False)
+
+        self.assertEqual(cache.report()["hits"], 3)
+        for skill in first:
+            self.assertEqual(first[skill].to_dict("list"), second[skill].to_dict("list"))
+
+if __name__ == '__main__':
+    unittest.main()
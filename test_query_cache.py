@@ -0,0 +1,65 @@
+import unittest
+import pandas as pd
+from query_cache import QueryCache, normalize_skills
+from server import RecommendationService
+
+class TestQueryCache(unittest.TestCase):
+
+    def setUp(self):
+        self.calls = []
+        self.generation = 0
+
+        def compute(skills, num_recommendations):
+            self.calls.append((skills, num_recommendations))
+            return list(skills)[:num_recommendations]
+
+        self.cache = QueryCache(compute, maxsize=2, generation=lambda: self.generation)
+
+    def test_normalize_skills(self):
+        self.assertEqual(normalize_skills(["b", "a", "b"]), ("a", "b", "b"))
+        self.assertEqual(normalize_skills(["b", "a", "c"], valid_skills=["a", "c"]), ("a", "c"))
+
+    def test_order_insensitive_hits(self):
+        self.cache.get(["social", "listening"], 10)
+        self.cache.get(["listening", "social"], 10)
+        self.cache.get(["listening", "social"], 5)
+
+        self.assertEqual(self.calls, [(("listening", "social"), 10), (("listening", "social"), 5)])
+        self.assertEqual(self.cache.stats()["hits"], 1)
+        self.assertEqual(self.cache.stats()["misses"], 2)
+
+    def test_lru_eviction(self):
+        self.cache.get(["a"])
+        self.cache.get(["b"])
+        self.cache.get(["a"])
+        self.cache.get(["c"])
+        self.cache.get(["a"])
+        self.cache.get(["b"])
+
+        self.assertEqual([skills for skills, _ in self.calls], [("a",), ("b",), ("c",), ("b",)])
+        self.assertEqual(self.cache.stats()["evictions"], 2)
+
+    def test_generation_change_invalidates(self):
+        self.cache.get(["a"])
+        self.generation += 1
+        self.cache.get(["a"])
+
+        self.assertEqual(len(self.calls), 2)
+
+    def test_warm(self):
+        self.cache.maxsize = 100
+        self.assertEqual(self.cache.warm(["a", "b", "c"], 2), 6)
+        self.cache.get(["c", "a"])
+        self.assertEqual(self.cache.stats()["hits"], 1)
+
+    def test_service_reload_invalidates(self):
+        data = {"skill1": pd.DataFrame({"Occupation": ["Occ1", "Occ2"], "Code": ["1", "2"], "Skills Covered": [0.5, 0.9]})}
+        service = RecommendationService(data, ["skill1"])
+        self.assertEqual(service.recommend(["skill1"])["recommendations"][0]["occupation"], "Occ2")
+
+        reloaded = {"skill1": pd.DataFrame({"Occupation": ["Occ1", "Occ2"], "Code": ["1", "2"], "Skills Covered": [0.9, 0.5]})}
+        service.reload(reloaded, ["skill1"])
+        self.assertEqual(service.recommend(["skill1"])["recommendations"][0]["occupation"], "Occ1")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,104 @@
+import unittest
+import numpy as np
+import pandas as pd
+from score_index import ScoreIndex, top_k_rows
+
+class TestScoreIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.mock_data = {
+            "skill1": pd.DataFrame({"Occupation": ["Occ1", "Occ2"], "Code": ["1", "2"], "Skills Covered": [0.5, 0.6]}),
+            "skill2": pd.DataFrame({"Occupation": ["Occ2", "Occ3"], "Code": ["2", "3"], "Skills Covered": [0.7, 0.8]})
+        }
+
+    def test_from_data_builds_dense_matrix(self):
+        index = ScoreIndex.from_data(self.mock_data)
+
+        self.assertEqual(index.occupations, ["Occ1", "Occ2", "Occ3"])
+        self.assertEqual(index.skills, ["skill1", "skill2"])
+        np.testing.assert_array_equal(index.scores, [[0.5, 0.0], [0.6, 0.7], [0.0, 0.8]])
+        self.assertEqual([index.code_value(code_id) for code_id in index.code], ["1", "2", "3"])
+
+    def test_match_unknown_rows_and_skills(self):
+        index = ScoreIndex.from_data(self.mock_data)
+
+        scores, code_ids = index.match(["skill2", "unknown"], index.rows_for(["Occ3", "Missing"]))
+
+        np.testing.assert_array_equal(scores, [0.8, 0.0])
+        self.assertEqual([index.code_value(code_id) for code_id in code_ids], ["3", None])
+
+    def test_top_k_batch_skill_lists(self):
+        index = ScoreIndex.from_data(self.mock_data)
+
+        results = index.top_k_batch([["skill1"], ["skill2", "skill1"], ["unknown"]], k=2, chunk_size=2)
+
+        self.assertEqual(results[0], [("Occ2", 0.6, "2"), ("Occ1", 0.5, "1")])
+        self.assertEqual([(occupation, code) for occupation, _, code in results[1]], [("Occ2", "2"), ("Occ3", "3")])
+        self.assertAlmostEqual(results[1][0][1], 0.65)
+        self.assertEqual(results[2], [("Occ1", 0.0, None), ("Occ2", 0.0, None)])
+
+    def test_top_k_batch_matrix_matches_skill_lists(self):
+        index = ScoreIndex.from_data(self.mock_data)
+        matrix = np.array([[1, 0], [1, 1], [0, 1]])
+
+        results = index.top_k_batch(matrix, k=3)
+
+        self.assertEqual(results, index.top_k_batch([["skill1"], ["skill1", "skill2"], ["skill2"]], k=3))
+
+    def test_match_weights(self):
+        index = ScoreIndex.from_data(self.mock_data)
+
+        scores, _ = index.match(["skill1", "skill2"], weights={"skill2": 3})
+        np.testing.assert_allclose(scores, [0.125, 0.675, 0.6])
+        zero, _ = index.match(["skill1", "skill2"], weights={"skill2": 0})
+        np.testing.assert_array_equal(zero, index.match(["skill1"])[0])
+        with self.assertRaises(ValueError):
+            index.match(["skill1"], weights={"skill1": -1})
+        with self.assertRaisesRegex(ValueError, "Unknown skill"):
+            index.match(["skill1"], weights={"Skill 1": 2})
+        with self.assertRaisesRegex(ValueError, "Unknown skill"):
+            index.top_k_batch([["skill1"]], weights={"Skill 1": 2})
+
+    def test_filter_rows(self):
+        data = {
+            "skill1": pd.DataFrame({"Occupation": ["Occ1", "Occ2", "Occ3", "Occ4"],
+                                    "Code": ["29-1141.00", "29-2061.00", "47-2031.00", None],
+                                    "Job Zone": [4, 3, 2, 5], "Skills Covered": [0.2, 0.4, 0.6, 0.8]})
+        }
+        index = ScoreIndex.from_data(data)
+
+        self.assertEqual(index.job_zone.tolist(), [4, 3, 2, 5])
+        self.assertEqual(index.filter_rows().tolist(), [0, 1, 2, 3])
+        self.assertEqual(index.filter_rows(job_zones=3).tolist(), [1])
+        self.assertEqual(index.filter_rows(job_zones=(3, 5)).tolist(), [0, 1, 3])
+        self.assertEqual(index.filter_rows(code_prefixes="29-").tolist(), [0, 1])
+        self.assertEqual(index.filter_rows(code_prefixes=["29-11", "47"]).tolist(), [0, 2])
+        self.assertEqual(index.filter_rows(job_zones=(2, 3), code_prefixes="29-").tolist(), [1])
+        self.assertEqual(index.filter_rows(job_zones=1).tolist(), [])
+
+    def test_top_k_batch_rows_and_weights(self):
+        index = ScoreIndex.from_data(self.mock_data)
+
+        results = index.top_k_batch([["skill1", "skill2"]], k=3, rows=np.array([0, 2]))
+        self.assertEqual(results[0], [("Occ3", 0.4, "3"), ("Occ1", 0.25, "1")])
+        weighted = index.top_k_batch([["skill1", "skill2"]], k=3, weights={"skill2": 3})
+        self.assertEqual([occupation for occupation, _, _ in weighted[0]], ["Occ2", "Occ3", "Occ1"])
+        self.assertAlmostEqual(weighted[0][0][1], 0.675)
+
+    def test_rank_with_occupation_order_and_filters(self):
+        index = ScoreIndex.from_data(self.mock_data)
+
+        self.assertEqual(index.rank(["skill1"]), [("Occ2", (0.6, "2")), ("Occ1", (0.5, "1")), ("Occ3", (0.0, None))])
+        self.assertEqual(index.rank(["skill2"], ["Missing", "Occ1", "Occ3"], top_k=2),
+                         [("Occ3", (0.8, "3")), ("Missing", (0.0, None))])
+        self.assertEqual(index.rank(["skill1"], code_prefixes=["1", "3"]), [("Occ1", (0.5, "1")), ("Occ3", (0.0, None))])
+
+    def test_top_k_rows_keeps_tie_order(self):
+        scores = np.array([0.5, 0.9, 0.5, 0.9, 0.1, 0.5])
+
+        self.assertEqual(top_k_rows(scores, 3).tolist(), [1, 3, 0])
+        self.assertEqual(top_k_rows(scores, 4).tolist(), [1, 3, 0, 2])
+        self.assertEqual(top_k_rows(scores).tolist(), [1, 3, 0, 2, 5, 4])
+
+if __name__ == '__main__':
+    unittest.main()
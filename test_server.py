@@ -0,0 +1,123 @@
+import asyncio
+import http.client
+import json
+import threading
+import unittest
+import pandas as pd
+import networkx as nx
+from server import LatencyMetrics, RecommendationServer, RecommendationService
+from skills import calculate_overall_match
+
+class TestRecommendationServer(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        mock_data = {
+            "skill1": pd.DataFrame({"Occupation": ["Occ1", "Occ2"], "Code": ["1", "2"], "Skills Covered": [0.5, 0.9]}),
+            "skill2": pd.DataFrame({"Occupation": ["Occ2", "Occ3"], "Code": ["2", "3"], "Skills Covered": [0.7, 0.8]})
+        }
+        cls.server = RecommendationServer(RecommendationService(mock_data, ["skill1", "skill2"]), workers=2)
+        cls.loop = asyncio.new_event_loop()
+        cls.port = cls.loop.run_until_complete(cls.server.start("127.0.0.1", 0))
+        cls.thread = threading.Thread(target=cls.loop.run_forever, daemon=True)
+        cls.thread.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        asyncio.run_coroutine_threadsafe(cls.server.close(), cls.loop).result()
+        cls.loop.call_soon_threadsafe(cls.loop.stop)
+        cls.thread.join()
+
+    def request(self, method, path, body=None):
+        connection = http.client.HTTPConnection("127.0.0.1", self.port, timeout=5)
+        connection.request(method, path, body=json.dumps(body) if body is not None else None)
+        response = connection.getresponse()
+        payload = json.loads(response.read())
+        connection.close()
+        return response.status, payload
+
+    def test_recommend(self):
+        status, payload = self.request("POST", "/recommend", {"skills": ["skill1", "bogus"], "num_recommendations": 2})
+
+        self.assertEqual(status, 200)
+        self.assertEqual(payload["ignored"], ["bogus"])
+        self.assertEqual(payload["recommendations"], [{"occupation": "Occ2", "code": "2", "score": 0.9},
+                                                      {"occupation": "Occ1", "code": "1", "score": 0.5}])
+
+    def test_health_and_metrics(self):
+        self.request("POST", "/recommend", {"skills": ["skill2"]})
+
+        status, health = self.request("GET", "/health")
+        self.assertEqual(status, 200)
+        self.assertEqual(health["occupations"], 3)
+
+        status, metrics = self.request("GET", "/metrics")
+        self.assertEqual(status, 200)
+        self.assertGreaterEqual(metrics["requests"], 1)
+        self.assertIn("p95", metrics["latency_ms"])
+
+    def test_bad_requests(self):
+        self.assertEqual(self.request("POST", "/recommend", {"no_skills": []})[0], 400)
+        self.assertEqual(self.request("POST", "/recommend", {"skills": 5})[0], 400)
+        self.assertEqual(self.request("POST", "/recommend", {"skills": [["skill1"]]})[0], 400)
+        self.assertEqual(self.request("POST", "/recommend", {"skills": ["skill1"], "num_recommendations": -1})[0], 400)
+        self.assertEqual(self.request("POST", "/recommend", {"skills": ["skill1"], "num_recommendations": 0})[0], 400)
+        self.assertEqual(self.request("GET", "/recommend")[0], 405)
+        self.assertEqual(self.request("GET", "/missing")[0], 404)
+
+class TestRecommendationService(unittest.TestCase):
+
+    def test_repeated_skills_score_like_calculate_overall_match(self):
+        data = {"skill1": pd.DataFrame({"Occupation": ["Occ1", "Occ2"], "Code": ["1", "2"], "Skills Covered": [0.5, 0.9]}),
+                "skill2": pd.DataFrame({"Occupation": ["Occ2", "Occ3"], "Code": ["2", "3"], "Skills Covered": [0.7, 0.8]})}
+        service = RecommendationService(data, ["skill1", "skill2"])
+        G = nx.Graph()
+        G.add_nodes_from(["Occ1", "Occ2", "Occ3"])
+
+        service.recommend(["skill1", "skill2"], 3)
+        recommendations = service.recommend(["skill2", "skill1", "skill2"], 3)["recommendations"]
+        expected = calculate_overall_match(G, ["skill2", "skill1", "skill2"], data)
+        self.assertEqual([(item["occupation"], item["score"]) for item in recommendations],
+                         [(career, score) for career, (score, _) in expected])
+
+    def test_reload_never_mixes_versions(self):
+        # Two versions with disjoint occupations: a request pairing one version's graph with the
+        # other's index would return occupations scored 0.
+        versions = [{"skill1": pd.DataFrame({"Occupation": [f"{prefix}{i}" for i in range(50)], "Code": ["1"] * 50,
+                                             "Skills Covered": [0.5] * 50})} for prefix in ("Old", "New")]
+        service = RecommendationService(versions[0], ["skill1"], cache_size=0)
+        results = []
+        stop = threading.Event()
+
+        def query():
+            while not stop.is_set():
+                results.append(service.recommend(["skill1"], 50)["recommendations"])
+
+        thread = threading.Thread(target=query)
+        thread.start()
+        try:
+            for i in range(20):
+                service.reload(versions[(i + 1) % 2], ["skill1"])
+        finally:
+            stop.set()
+            thread.join()
+
+        self.assertEqual(service.generation, 21)
+        for recommendations in results:
+            self.assertEqual(len({item["occupation"][:3] for item in recommendations}), 1)
+            self.assertTrue(all(item["score"] == 0.5 for item in recommendations))
+
+class TestLatencyMetrics(unittest.TestCase):
+
+    def test_rejected_requests_add_no_latency(self):
+        metrics = LatencyMetrics()
+        metrics.record(0.010)
+        metrics.record(error=True)
+
+        snapshot = metrics.snapshot()
+        self.assertEqual((snapshot["requests"], snapshot["errors"]), (2, 1))
+        self.assertEqual(snapshot["latency_ms"]["window"], 1)
+        self.assertAlmostEqual(snapshot["latency_ms"]["p50"], 10.0)
+
+if __name__ == '__main__':
+    unittest.main()
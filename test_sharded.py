@@ -0,0 +1,30 @@
+import unittest
+import networkx as nx
+import pandas as pd
+from score_index import ScoreIndex
+from sharded import ShardedScorer
+from skills import calculate_overall_match
+
+class TestShardedScorer(unittest.TestCase):
+
+    def setUp(self):
+        occupations = [f"Occ{i}" for i in range(23)]
+        self.mock_data = {
+            "skill1": pd.DataFrame({"Occupation": occupations, "Code": [str(i) for i in range(23)],
+                                    "Skills Covered": [(i % 4) / 4 for i in range(23)]}),
+            "skill2": pd.DataFrame({"Occupation": occupations[::2], "Code": [str(i) for i in range(0, 23, 2)],
+                                    "Skills Covered": [(i % 3) / 3 for i in range(0, 23, 2)]})
+        }
+        self.G = nx.Graph()
+        self.G.add_nodes_from(occupations)
+        self.index = ScoreIndex.from_data(self.mock_data, occupations=self.G.nodes())
+
+    def test_matches_serial_path(self):
+        with ShardedScorer(self.index, workers=2, shards=5) as scorer:
+            for user_skills in (["skill1"], ["skill2", "skill1"], ["unknown"], []):
+                for top_k in (None, 0, 1, 4, 30):
+                    expected = calculate_overall_match(self.G, user_skills, self.mock_data, index=self.index, top_k=top_k)
+                    self.assertEqual(scorer.rank(user_skills, top_k), expected)
+
+if __name__ == '__main__':
+    unittest.main()
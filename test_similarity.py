@@ -0,0 +1,65 @@
+import unittest
+import numpy as np
+import pandas as pd
+from score_index import ScoreIndex
+from similarity import SimilarityIndex
+
+class TestSimilarityIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.mock_data = {
+            "skill1": pd.DataFrame({"Occupation": ["Occ1", "Occ2", "Occ3"], "Code": ["1", "2", "3"], "Skills Covered": [0.9, 0.8, 0.0]}),
+            "skill2": pd.DataFrame({"Occupation": ["Occ1", "Occ2", "Occ3"], "Code": ["1", "2", "3"], "Skills Covered": [0.1, 0.2, 0.9]}),
+        }
+        self.index = ScoreIndex.from_data(self.mock_data)
+
+    def test_cosine(self):
+        similarity = SimilarityIndex.from_score_index(self.index)
+        ranked = similarity.similar_to_user(["skill1"], k=3)
+        self.assertEqual([occupation for occupation, _ in ranked], ["Occ1", "Occ2", "Occ3"])
+        self.assertAlmostEqual(ranked[0][1], 0.9 / np.hypot(0.9, 0.1), places=5)
+        self.assertAlmostEqual(ranked[2][1], 0.0, places=5)
+
+        self.assertEqual(similarity.similar_to_occupation("Occ1", k=1)[0][0], "Occ2")
+
+    def test_l2(self):
+        similarity = SimilarityIndex.from_score_index(self.index, metric="l2")
+        ranked = similarity.similar_to_occupation("Occ3", k=2)
+        self.assertEqual([occupation for occupation, _ in ranked], ["Occ2", "Occ1"])
+        self.assertAlmostEqual(ranked[0][1], np.hypot(0.8, 0.7), places=5)
+
+    def test_cosine_zero_vectors(self):
+        index = SimilarityIndex(["Zero", "Low", "Orth"], ["a", "b", "c"],
+                                np.array([[0, 0, 0], [0.1, 1, 1], [0, 1, 0]]))
+
+        results = index.similar_to_user(["a"])
+        self.assertEqual([occupation for occupation, _ in results], ["Low", "Orth"])
+        self.assertAlmostEqual(results[0][1], 0.1 / np.sqrt(2.01), places=5)
+        self.assertAlmostEqual(results[1][1], 0.0)
+        self.assertEqual(index.similar_to_user(["unknown"]), [])
+        self.assertEqual(index.similar_to_occupation("Zero"), [])
+
+    def test_unknown_metric(self):
+        with self.assertRaises(ValueError):
+            SimilarityIndex.from_score_index(self.index, metric="dot")
+
+    def test_partitioned_search(self):
+        rng = np.random.default_rng(1)
+        centers = rng.random((20, 16))
+        vectors = np.repeat(centers, 50, axis=0) + rng.normal(scale=0.01, size=(1000, 16))
+        occupations = [f"Occ{i}" for i in range(1000)]
+        for metric in ("cosine", "l2"):
+            similarity = SimilarityIndex(occupations, [f"skill{j}" for j in range(16)], vectors, metric)
+            similarity.build_partitions(n_lists=20)
+            queries = vectors[rng.choice(1000, 10)]
+
+            exact_rows, exact_scores = similarity.search(queries[0], k=5)
+            rows, scores = similarity.search(queries[0], k=5, n_probe=20)
+            self.assertEqual(rows.tolist(), exact_rows.tolist())
+            np.testing.assert_allclose(scores, exact_scores, rtol=1e-5)
+
+            self.assertGreaterEqual(similarity.recall(queries, k=5, n_probe=2), similarity.recall(queries, k=5, n_probe=1))
+            self.assertGreater(similarity.recall(queries, k=5, n_probe=2), 0.9)
+
+if __name__ == '__main__':
+    unittest.main()
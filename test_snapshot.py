@@ -0,0 +1,111 @@
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+import numpy as np
+import pandas as pd
+from compact_network import CompactNetwork
+from score_index import ScoreIndex
+from snapshot import PREAMBLE, SnapshotError, load_snapshot, load_snapshot_or_data, write_snapshot
+from skills import calculate_overall_match, create_career_network
+
+class TestSnapshot(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp)
+        self.data_dir = os.path.join(self.tmp, "data")
+        os.makedirs(self.data_dir)
+        self.mock_data = {
+            "skill1": pd.DataFrame({"Occupation": ["Occ1", "Occ2", "Occ3"], "Code": ["1", "1", "2"], "Skills Covered": [0.5, 0.6, 0.7]}),
+            "skill2": pd.DataFrame({"Occupation": ["Occ2", "Occ3", "Occ4"], "Code": ["1", "2", "2"], "Skills Covered": [0.7, 0.8, 0.9]})
+        }
+        for skill, skill_df in self.mock_data.items():
+            skill_df.to_csv(os.path.join(self.data_dir, skill + ".csv"), index=False)
+        self.path = os.path.join(self.tmp, "careers.snapshot")
+        write_snapshot(self.path, self.mock_data, self.data_dir)
+
+    def corrupt(self, offset, value=b"\xff"):
+        with open(self.path, "r+b") as f:
+            f.seek(offset)
+            f.write(value)
+
+    def test_round_trip(self):
+        snapshot = load_snapshot(self.path, verify=True, data_dir=self.data_dir)
+        self.addCleanup(snapshot.close)
+        expected = ScoreIndex.from_data(self.mock_data)
+
+        self.assertEqual(snapshot.soft_skills_list, ["skill1", "skill2"])
+        self.assertEqual(snapshot.index.occupations, expected.occupations)
+        np.testing.assert_array_equal(snapshot.index.scores, expected.scores)
+        np.testing.assert_array_equal(snapshot.index.code, expected.code)
+        np.testing.assert_array_equal(snapshot.index.job_zone, expected.job_zone)
+        self.assertFalse(snapshot.index.scores.flags.writeable)
+
+        G = create_career_network(self.mock_data)
+        self.assertEqual(calculate_overall_match(G, ["skill1", "skill2"], {}, index=snapshot.index),
+                         calculate_overall_match(G, ["skill1", "skill2"], self.mock_data, index=expected))
+
+        network = CompactNetwork.from_data(self.mock_data)
+        np.testing.assert_array_equal(snapshot.network.indices, network.indices)
+        self.assertEqual(snapshot.network.skills_of("Occ2"), ["skill1", "skill2"])
+
+    def test_concurrent_writers(self):
+        errors = []
+
+        def write():
+            try:
+                write_snapshot(self.path, self.mock_data, self.data_dir)
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=write) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        self.assertEqual(sorted(os.listdir(self.tmp)), ["careers.snapshot", "data"])
+        load_snapshot(self.path, verify=True, data_dir=self.data_dir).close()
+
+    def test_rejects_bad_files(self):
+        self.corrupt(0, b"X")
+        with self.assertRaisesRegex(SnapshotError, "not a snapshot"):
+            load_snapshot(self.path)
+
+        write_snapshot(self.path, self.mock_data)
+        self.corrupt(8, b"\x63")
+        with self.assertRaisesRegex(SnapshotError, "version"):
+            load_snapshot(self.path)
+
+        write_snapshot(self.path, self.mock_data)
+        self.corrupt(PREAMBLE.size + 2)
+        with self.assertRaisesRegex(SnapshotError, "corrupt header"):
+            load_snapshot(self.path)
+
+        write_snapshot(self.path, self.mock_data)
+        with open(self.path, "ab") as f:
+            f.write(b"\0")
+        with self.assertRaisesRegex(SnapshotError, "truncated"):
+            load_snapshot(self.path)
+
+        write_snapshot(self.path, self.mock_data)
+        self.corrupt(os.path.getsize(self.path) - 1)
+        load_snapshot(self.path).close()
+        with self.assertRaisesRegex(SnapshotError, "checksum"):
+            load_snapshot(self.path, verify=True)
+
+    def test_stale_snapshot_falls_back_to_csv(self):
+        pd.DataFrame({"Occupation": ["Occ9"], "Code": ["9"], "Skills Covered": ["50%"]}).to_csv(
+            os.path.join(self.data_dir, "skill3.csv"), index=False)
+        with self.assertRaisesRegex(SnapshotError, "out of date"):
+            load_snapshot(self.path, data_dir=self.data_dir)
+
+        snapshot, (data, soft_skills_list) = load_snapshot_or_data(self.path, self.data_dir)
+        self.assertIsNone(snapshot)
+        self.assertEqual(sorted(soft_skills_list), ["skill1", "skill2", "skill3"])
+
+if __name__ == '__main__':
+    unittest.main()